@@ -10,14 +10,10 @@ class JobSessionFactory(SessionFactory):
         self.engine = create_engine(
             f"mysql+pymysql://{config.database.db_user}:{config.database.db_password}@"
             f"{config.database.db_host}/{config.database.db_name}", pool_pre_ping=True)
+        self._session_maker = sessionmaker(bind=self.engine, expire_on_commit=False)
 
     def create_session(self) -> Session:
-        session_maker = self._create_session_maker()
-        return session_maker()
+        return self._session_maker()
 
     def create_scoped_session(self) -> Session:
-        session_maker = self._create_session_maker()
-        return scoped_session(session_maker)()
-
-    def _create_session_maker(self) -> sessionmaker:
-        return sessionmaker(bind=self.engine, expire_on_commit=False)
+        return scoped_session(self._session_maker)()
@@ -0,0 +1,52 @@
+import logging
+import traceback
+from typing import ClassVar
+
+from bookprices.job.job.base import JobBase, JobResult, JobExitStatus
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.config.config import Config
+from bookprices.shared.repository.bookprice_archive import BookPriceArchive
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+class BackfillPriceIntervalsJob(JobBase):
+    """
+    Recalculates the price intervals (BookPriceInterval) used for the price charts from the full price history of all
+    books. The price update job keeps them current, so this is only needed to fill them initially or to repair them.
+    With a price archive, archived prices are included, otherwise the intervals from archived prices are kept.
+    The job was named BackfillDailyPricesJob. Rename it in the job API with bookprices/tool/rename_job.py.
+    """
+
+    book_ids_batch_size: ClassVar[int] = 200
+
+    name: ClassVar[str] = "BackfillPriceIntervalsJob"
+
+    def __init__(
+            self,
+            config: Config,
+            unit_of_work: UnitOfWork,
+            cache_key_remover: BookPriceKeyRemover,
+            archive: BookPriceArchive | None = None) -> None:
+        super().__init__(config)
+        self._unit_of_work = unit_of_work
+        self._cache_key_remover = cache_key_remover
+        self._archive = archive
+        self._logger = logging.getLogger(self.name)
+
+    def start(self, **kwargs) -> JobResult:
+        try:
+            book_count = 0
+            for book_ids in self._unit_of_work.iter_book_id_batches(size=self.book_ids_batch_size):
+                with self._unit_of_work as uow:
+                    uow.bookprice_interval_repository.refresh_for_books(book_ids, self._archive)
+
+                self._cache_key_remover.remove_keys_for_books(book_ids)
+
+                book_count += len(book_ids)
+                self._logger.info(f"Price intervals backfilled for {book_count} books")
+
+            return JobResult(JobExitStatus.SUCCESS)
+        except Exception as ex:
+            self._logger.error(f"Unexpected error: {ex}")
+            self._logger.error(traceback.format_exc())
+            return JobResult(JobExitStatus.FAILURE, error=ex)
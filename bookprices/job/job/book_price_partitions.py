@@ -0,0 +1,54 @@
+import logging
+import traceback
+from datetime import date
+from typing import ClassVar
+
+from bookprices.job.job.base import JobBase, JobResult, JobExitStatus
+from bookprices.shared.config.config import Config
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+class ManageBookPricePartitionsJob(JobBase):
+    """
+    Keeps BookPrice partitioned by month by adding partitions for the coming months ahead of time, so new prices
+    never end up in the catch-all future partition. Old partitions are archived with bookprices/tool/archive_prices.py.
+    """
+
+    months_ahead: ClassVar[int] = 3
+
+    name: ClassVar[str] = "ManageBookPricePartitionsJob"
+
+    def __init__(self, config: Config, unit_of_work: UnitOfWork) -> None:
+        super().__init__(config)
+        self._unit_of_work = unit_of_work
+        self._logger = logging.getLogger(self.name)
+
+    def start(self, **kwargs) -> JobResult:
+        try:
+            with self._unit_of_work as uow:
+                partitions = uow.bookprice_repository.get_partitions()
+            if not partitions:
+                self._logger.warning("BookPrice isn't partitioned. Run sql/book_price_partitioning.sql first")
+                return JobResult(JobExitStatus.SUCCESS)
+
+            if not (months := self.get_missing_months(max(p.less_than for p in partitions if p.less_than))):
+                self._logger.info("BookPrice partitions are up to date")
+                return JobResult(JobExitStatus.SUCCESS)
+
+            self._logger.info(f"Adding BookPrice partitions for {', '.join(f'{m:%Y-%m}' for m in months)}")
+            with self._unit_of_work as uow:
+                uow.bookprice_repository.add_monthly_partitions(months)
+
+            return JobResult(JobExitStatus.SUCCESS)
+        except Exception as ex:
+            self._logger.error(f"Unexpected error: {ex}")
+            self._logger.error(traceback.format_exc())
+            return JobResult(JobExitStatus.FAILURE, error=ex)
+
+    def get_missing_months(self, partitioned_until: date, today: date | None = None) -> list[date]:
+        """ Returns the first day of each month from partitioned_until until months_ahead months from today. """
+        today = today or date.today()
+        last_month_index = today.year * 12 + today.month - 1 + self.months_ahead
+        month_index = partitioned_until.year * 12 + partitioned_until.month - 1
+
+        return [date(index // 12, index % 12 + 1, 1) for index in range(month_index, last_month_index + 1)]
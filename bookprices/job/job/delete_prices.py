@@ -7,18 +7,29 @@ from bookprices.job.job.base import JobBase, JobResult, JobExitStatus
 from bookprices.shared.cache.key_remover import BookPriceKeyRemover
 from bookprices.shared.config.config import Config
 from bookprices.shared.db.database import Database
+from bookprices.shared.repository.unit_of_work import UnitOfWork
 
 
 class DeletePricesJob(JobBase):
-    """ Deletes price updates for books that are older than a certain number of days. """
+    """
+    Deletes price updates for books that are older than a certain number of days, except the latest price of each book
+    in each book store, and the price history in the charts from before that date. It isn't scheduled. When run, it
+    takes precedence over the 24 months kept by bookprices/tool/archive_prices.py, which then has nothing to archive.
+    """
 
     price_max_age_days: ClassVar[int] = 365
 
     name: ClassVar[str] = "DeletePricesJob"
 
-    def __init__(self, config: Config, db: Database, cache_key_remover: BookPriceKeyRemover) -> None:
+    def __init__(
+            self,
+            config: Config,
+            db: Database,
+            unit_of_work: UnitOfWork,
+            cache_key_remover: BookPriceKeyRemover) -> None:
         super().__init__(config)
         self._db = db
+        self._unit_of_work = unit_of_work
         self._cache_key_remover = cache_key_remover
         self._logger = logging.getLogger(self.name)
 
@@ -36,7 +47,10 @@ class DeletePricesJob(JobBase):
                 return JobResult(JobExitStatus.SUCCESS)
 
             self._logger.info("Deleting prices from the database...")
-            self._db.bookprice_db.delete_prices(ids_to_delete)
+            with self._unit_of_work as uow:
+                uow.bookprice_repository.delete_prices(ids_to_delete)
+                uow.bookstore_latest_price_repository.refresh_for_books(ids.book_id for ids in bookprice_ids)
+                uow.bookprice_interval_repository.delete_older_than(earliest_date)
 
             self._logger.info("Removing cache keys for affected books and bookstores...")
             for ids in bookprice_ids:
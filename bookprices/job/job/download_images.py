@@ -29,12 +29,11 @@ class DownloadAllMissingImagesForBooksJob(JobBase):
 
     def start(self, **kwargs) -> JobResult:
         try:
-            book_ids_offset, book_id_page = 0, 1
-            while book_ids := self._db.book_db.get_book_ids_with_no_image(book_ids_offset, self.books_batch_size):
+            last_book_id = 0
+            while book_ids := self._db.book_db.get_book_ids_with_no_image(last_book_id, self.books_batch_size):
                 self._logger.info(f"Found {len(book_ids)} books with no image")
                 self._image_download_service.download_images_for_books(book_ids)
-                book_id_page += 1
-                book_ids_offset = (book_id_page - 1) * self.books_batch_size
+                last_book_id = book_ids[-1]
 
             self._logger.info("Done!")
             return JobResult(JobExitStatus.SUCCESS)
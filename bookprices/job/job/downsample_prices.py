@@ -0,0 +1,39 @@
+import logging
+import traceback
+from typing import ClassVar
+
+from bookprices.job.job.base import JobBase, JobResult, JobExitStatus
+from bookprices.job.service.price_retention_service import PriceRetentionService
+from bookprices.shared.config.config import Config
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+class DownsamplePricesJob(JobBase):
+    """
+    Coarsens old price history according to the retention tiers, e.g. one price per week for prices older than 90
+    days and one per month for prices older than two years. Keeps BookPrice small as the history grows.
+    """
+
+    book_ids_batch_size: ClassVar[int] = 100
+
+    name: ClassVar[str] = "DownsamplePricesJob"
+
+    def __init__(self, config: Config, unit_of_work: UnitOfWork, price_retention_service: PriceRetentionService) -> None:
+        super().__init__(config)
+        self._unit_of_work = unit_of_work
+        self._price_retention_service = price_retention_service
+        self._logger = logging.getLogger(self.name)
+
+    def start(self, **kwargs) -> JobResult:
+        try:
+            prices_deleted = 0
+            for book_ids in self._unit_of_work.iter_book_id_batches(size=self.book_ids_batch_size):
+                prices_deleted += self._price_retention_service.downsample_prices(book_ids)
+                self._logger.debug(f"Downsampled prices for book ids {book_ids[0]}-{book_ids[-1]}")
+
+            self._logger.info(f"Deleted {prices_deleted} prices when downsampling price history")
+            return JobResult(JobExitStatus.SUCCESS)
+        except Exception as ex:
+            self._logger.error(f"Unexpected error: {ex}")
+            self._logger.error(traceback.format_exc())
+            return JobResult(JobExitStatus.FAILURE, error=ex)
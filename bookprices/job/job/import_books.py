@@ -20,6 +20,7 @@ from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.shared.validation import isbn as isbn_validator
 from bookprices.shared.webscraping.content import HtmlContent
 from bookprices.shared.webscraping.http import RateLimiter, HttpClient
+from bookprices.shared.webscraping.parse_pool import parse_pool
 
 
 class NewBook(NamedTuple):
@@ -27,18 +28,55 @@ class NewBook(NamedTuple):
     url: str
 
 
+class WilliamDamBookParser:
+    """ Reads title, author, ISBN and format from a WilliamDam.dk book page. The page is only parsed once. """
+
+    _title_css: ClassVar[str] = "h1"
+    _title_subtitle_css: ClassVar[str] = "span"
+    _author_css: ClassVar[str] = "a.manufacturer-link"
+    _book_details_list_css: ClassVar[str] = "ul.list li"
+    _detail_value_css: ClassVar[str] = "span.detail-value"
+    _isbn_label: ClassVar[str] = "ISBN-13"
+    _format_label: ClassVar[str] = "Format"
+
+    valid_book_formats: ClassVar[frozenset[str]] = frozenset({
+        "Paperback", "Hardback", "Indbundet", "Hæftet", "Haeftet", "Bog", "Bog med hæftet ryg"})
+
+    def parse(self, data: str) -> Book:
+        html_content = HtmlContent(data)
+        isbn, format_ = (None, None)
+
+        title = html_content.find_element_text_without_child_by_css(self._title_css, self._title_subtitle_css)
+        author = html_content.find_element_text_by_css(self._author_css)
+        for detail_text, value in html_content.find_elements_by_css_and_get_child_texts(
+                self._book_details_list_css, self._detail_value_css):
+            if not (value := value.strip() if value else None):
+                continue
+            if self._isbn_label in detail_text:
+                isbn = value
+            elif self._format_label in detail_text and value in self.valid_book_formats:
+                format_ = value
+
+        return Book(isbn=isbn,
+                    title=title.strip() if title else None,
+                    author=author.strip() if author else None,
+                    format=format_,
+                    created=datetime.datetime.now())
+
+
 class WilliamDamBookImportJob(JobBase):
     """ Imports books from WilliamDam.dk """
 
     name: ClassVar[str] = "WilliamDamBookImportJob"
     _book_url_css: ClassVar[str] = "a.product-name"
-    _book_details_list_css: ClassVar[str] = "ul.list li"
-    _title_css: ClassVar[str] = "h1"
-    _author_css: ClassVar[str] = "a.manufacturer-link"
     _bookstore_id: ClassVar[int] = 2
+    _book_list_url: ClassVar[str] = \
+        "https://www.williamdam.dk/boeger/skoenlitteratur/romaner/--type_bog,sprog_dansk?p={page}"
+    _book_list_page_count: ClassVar[int] = 500
 
     _period_seconds: ClassVar[int] = 1
     _request_count: ClassVar[int] = 1
+    save_chunk_size: ClassVar[int] = 500
 
 
     def __init__(
@@ -56,23 +94,14 @@ class WilliamDamBookImportJob(JobBase):
         self._found_books = []
         self._added_book_ids = []
         self._rate_limiter = RateLimiter(self._request_count, self._period_seconds)
+        self._http_client = HttpClient()
+        self._book_parser = WilliamDamBookParser()
         self._logger = logging.getLogger(self.__class__.__name__)
 
-        self._valid_book_formats = {
-            "Paperback", "Hardback", "Indbundet", "Hæftet", "Haeftet", "Bog", "Bog med hæftet ryg"}
-
     def start(self, **kwargs) -> JobResult:
         try:
             self._logger.info("Getting book urls...")
-            self._enqueue_urls_for_book_list_pages(
-                "https://www.williamdam.dk/boeger/skoenlitteratur/romaner/--type_bog,sprog_dansk?p={page}",
-                500)
-
-            if self._book_list_url_queue.empty():
-                self._logger.info("No book list urls found!")
-                return JobResult(JobExitStatus.SUCCESS)
-
-            self._get_book_urls()
+            self._enqueue_book_urls()
             if self._book_url_queue.empty():
                 self._logger.info("No book urls found!")
                 return JobResult(JobExitStatus.SUCCESS)
@@ -102,6 +131,14 @@ class WilliamDamBookImportJob(JobBase):
             self._book_url_queue = queue.Queue()
             self._book_list_url_queue = queue.Queue()
 
+    def _enqueue_book_urls(self) -> None:
+        self._enqueue_urls_for_book_list_pages(self._book_list_url, self._book_list_page_count)
+        if self._book_list_url_queue.empty():
+            self._logger.info("No book list urls found!")
+            return
+
+        self._get_book_urls()
+
     def _get_book_urls(self) -> None:
         self._logger.info(
             f"Getting book urls from {self._book_list_url_queue.qsize()} pages using {self._thread_count} threads...")
@@ -128,15 +165,17 @@ class WilliamDamBookImportJob(JobBase):
         [t.join() for t in threads]
         logging.debug(f"{len(self._found_books)} books found!")
 
+    def _get_book_urls_from_list(self, book_list_url: str) -> list[str]:
+        self._rate_limiter.wait_if_needed()
+        book_list_response = self._http_client.get(book_list_url)
+        book_list_content_bs = HtmlContent(book_list_response.text)
+        return book_list_content_bs.find_elements_by_css_and_get_attribute_values(self._book_url_css, "href")
+
     def _get_next_book_urls_from_list(self) -> None:
         while not self._book_list_url_queue.empty():
             try:
                 book_list_url = self._book_list_url_queue.get()
-                with HttpClient() as http_client:
-                    self._rate_limiter.wait_if_needed()
-                    book_list_response = http_client.get(book_list_url)
-                book_list_content_bs = HtmlContent(book_list_response.text)
-                for url in book_list_content_bs.find_elements_by_css_and_get_attribute_values(self._book_url_css, "href"):
+                for url in self._get_book_urls_from_list(book_list_url):
                     self._book_url_queue.put(url)
             except RequestException as ex:
                 self._logger.error(ex)
@@ -145,10 +184,9 @@ class WilliamDamBookImportJob(JobBase):
         while not self._book_url_queue.empty():
             try:
                 book_url = self._book_url_queue.get()
-                with HttpClient() as http_client:
-                    self._rate_limiter.wait_if_needed()
-                    book_response = http_client.get(book_url)
-                book = self._parse_book(book_response.text)
+                self._rate_limiter.wait_if_needed()
+                book_response = self._http_client.get(book_url)
+                book = parse_pool.run(self._book_parser.parse, book_response.text)
                 if self._is_book_valid(book):
                     logging.debug(f"Found valid book: {book.title} ({book.format}) by {book.author} (ISBN-13: {book.isbn})")
                     self._found_books.append(NewBook(book=book, url=urlparse(book_url).path))
@@ -156,83 +194,93 @@ class WilliamDamBookImportJob(JobBase):
                 self._logger.error(ex)
 
     def _create_or_update_books(self) -> None:
+        """
+        Saves the found books in chunks. Each chunk is upserted and linked to the bookstore in a single transaction,
+        and the cache keys for the chunk are removed in one call. If a chunk fails, its books are saved one at a time,
+        so a single bad book doesn't keep the rest of the chunk from being saved.
+        """
+        urls_by_isbn = {book.isbn: url for book, url in self._found_books}
+        books = list({book.isbn: book for book, _ in self._found_books}.values())
         updated_count = 0
-        with self._unit_of_work as uow:
-            existing_books_isbn = uow.book_repository.list_books_by_isbn()
-        for book, url in self._found_books:
+        for chunk_start in range(0, len(books), self.save_chunk_size):
+            chunk = books[chunk_start:chunk_start + self.save_chunk_size]
             try:
-                if existing_book := existing_books_isbn.get(book.isbn):
-                    self._logger.debug(f"Updating book with ISBN {book.isbn}")
-                    book_id = existing_book.id
-                    updated_book = Book(id=book_id,
-                                        isbn=existing_book.isbn,
-                                        title=book.title,
-                                        author=book.author,
-                                        format=book.format,
-                                        image_url=existing_book.image_url,
-                                        created=existing_book.created)
-
-                    if not self.book_needs_update(existing_book, updated_book):
-                        self._logger.debug(f"No update needed for book with ISBN {book.isbn} (id {book_id})")
-                        continue
-
-                    with self._unit_of_work as uow:
-                        uow.book_repository.update(updated_book)
-                    self._cache_key_remover.remove_keys_for_book(updated_book.id)
-                    self._cache_key_remover.remove_key_for_authors()
-                    updated_count += 1
-                else:
-                    self._logger.debug(f"Saving book with ISBN {book.isbn}")
-                    with self._unit_of_work as uow:
-                        book_id = uow.book_repository.create(book)
-                    self._cache_key_remover.remove_key_for_authors()
-                    self._cache_key_remover.remove_keys_for_book_and_bookstore(book_id, self._bookstore_id)
-                    self._added_book_ids.append(book_id)
-                with self._unit_of_work as uow:
-                    uow.bookstore_repository.add_book_to_bookstore_if_not_exists(book_id, self._bookstore_id, url)
+                updated_count += self._save_books(chunk, urls_by_isbn)
             except Exception as ex:
-                self._logger.error(f"Error while inserting book: {book.title}, {book.author}, {book.isbn}: {ex}")
-                self._logger.error(traceback.format_exc())
+                self._logger.warning(f"Error while saving {len(chunk)} books (ISBN {chunk[0].isbn} - "
+                                     f"{chunk[-1].isbn}): {ex}. Saving them one at a time...")
+                for book in chunk:
+                    try:
+                        updated_count += self._save_books([book], urls_by_isbn)
+                    except Exception as book_ex:
+                        self._logger.error(f"Error while saving book with ISBN {book.isbn}: {book_ex}")
+
+        if self._added_book_ids or updated_count:
+            self._cache_key_remover.remove_key_for_authors()
 
         logging.info(f"{len(self._added_book_ids)} new book(s) saved!")
         logging.info(f"{updated_count} book(s) updated!")
 
-    def _parse_book(self, data: str) -> Book:
-        html_content = HtmlContent(data)
-        title, author, isbn, format_ = (None, None, None, None)
-
-        title = self._parse_title(html_content)
-        if author := html_content.find_element_text_by_css(self._author_css):
-            author = author.strip()
-
-        for element in html_content.find_elements_by_css(self._book_details_list_css):
-            if "ISBN-13" in element:
-                if isbn := HtmlContent(element).find_element_text_by_css("span.detail-value").strip():
-                    isbn = isbn.strip()
-            if "Format" in element:
-                if format_text := HtmlContent(element).find_element_text_by_css("span.detail-value").strip():
-                    if format_text in self._valid_book_formats:
-                        format_ = format_text
+    def _save_books(self, books: list[Book], urls_by_isbn: dict[str, str]) -> int:
+        """ Returns the number of updated books. """
+        with self._unit_of_work as uow:
+            result = uow.book_repository.upsert_books(books)
+            uow.bookstore_repository.add_books_to_bookstores_if_not_exist([
+                (book_id, self._bookstore_id, urls_by_isbn[isbn])
+                for isbn, book_id in result.book_ids_by_isbn.items()
+            ])
+
+        self._cache_key_remover.remove_keys_for_books(result.updated_book_ids)
+        self._cache_key_remover.remove_keys_for_books_and_bookstores(
+            (book_id, self._bookstore_id) for book_id in result.created_book_ids)
+        self._added_book_ids.extend(result.created_book_ids)
+        return len(result.updated_book_ids)
 
-        return Book(isbn=isbn, title=title, author=author, format=format_, created=datetime.datetime.now())
+    def _is_book_valid(self, book: Book) -> bool:
+        self._logger.debug(f"Validating book: {book.title} ({book.format}) by {book.author} (ISBN-13: {book.isbn})...")
+        return book.author and book.title and isbn_validator.check_isbn13(book.isbn) and book.format
 
-    def _parse_title(self, content: HtmlContent) -> str | None:
-        if not (title_element := content.find_element_by_css(self._title_css)):
-            return None
 
-        title_content = HtmlContent(title_element)
-        title_text = content.find_element_text_by_css(self._title_css)
-        if span_text := title_content.find_element_text_by_css("span"):
-            title_text = title_text.replace(span_text, "")
+class WilliamDamIncrementalBookImportJob(WilliamDamBookImportJob):
+    """
+    Imports new books from WilliamDam.dk. Book list pages are read newest first, and only books with URLs not
+    already in the bookstore are fetched. Stops after a number of pages in a row without new books, which is the usual
+    case when the job runs regularly. A warning is logged if a run finds no new books at all, since that is also what
+    happens if the list is no longer sorted newest first.
+    """
 
-        return title_text.strip() if title_text else None
+    name: ClassVar[str] = "WilliamDamIncrementalBookImportJob"
+    _book_list_url: ClassVar[str] = \
+        "https://www.williamdam.dk/boeger/skoenlitteratur/romaner/--type_bog,sprog_dansk?sort=newest&p={page}"
+    max_pages_without_new_books: ClassVar[int] = 3
 
-    def _is_book_valid(self, book: Book) -> bool:
-        self._logger.debug(f"Validating book: {book.title} ({book.format}) by {book.author} (ISBN-13: {book.isbn})...")
-        return book.author and book.title and isbn_validator.check_isbn13(book.isbn) and book.format
+    def _enqueue_book_urls(self) -> None:
+        with self._unit_of_work as uow:
+            known_urls = uow.bookstore_repository.list_book_urls(self._bookstore_id)
 
-    @staticmethod
-    def book_needs_update(existing_book: Book, new_book: Book) -> bool:
-        return (existing_book.title != new_book.title or
-                existing_book.author != new_book.author or
-                existing_book.format != new_book.format)
+        new_book_count, pages_without_new_books = 0, 0
+        for page_number in range(1, self._book_list_page_count + 1):
+            try:
+                book_urls = self._get_book_urls_from_list(self._book_list_url.format(page=page_number))
+            except RequestException as ex:
+                self._logger.error(ex)
+                continue
+            if not book_urls:
+                self._logger.info(f"No books on page {page_number}. Stopping.")
+                break
+
+            new_book_urls = [url for url in book_urls if urlparse(url).path not in known_urls]
+            for url in new_book_urls:
+                self._book_url_queue.put(url)
+                known_urls.add(urlparse(url).path)
+            new_book_count += len(new_book_urls)
+
+            pages_without_new_books = 0 if new_book_urls else pages_without_new_books + 1
+            if pages_without_new_books >= self.max_pages_without_new_books:
+                self._logger.info(
+                    f"No new books on the last {pages_without_new_books} pages. Stopping at page {page_number}.")
+                break
+
+        if not new_book_count:
+            self._logger.warning("Stopped without finding any new books. Check that the book list is still sorted "
+                                 "newest first.")
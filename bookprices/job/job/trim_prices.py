@@ -4,7 +4,7 @@ from logging import getLogger
 
 from bookprices.job.job.base import JobBase, JobResult, JobExitStatus
 from bookprices.job.service.argument_service import JobRunArgumentName, JobRunArgumentService
-from bookprices.job.service.trim_prices_service import TrimPricesService
+from bookprices.job.service.trim_prices_service import TrimPricesService, TrimResult
 from bookprices.job.shared.error_message import FAILED_TO_PARSE_ARGUMENTS
 from bookprices.shared.cache.key_remover import BookPriceKeyRemover
 from bookprices.shared.config.config import Config
@@ -14,12 +14,13 @@ from bookprices.shared.repository.unit_of_work import UnitOfWork
 class TrimAllPricesJob(JobBase):
     """
     Trims prices for all books in the database.
-    It removes duplicate prices for saving disk space and improving performance.
+    It removes duplicate prices for saving disk space and improving performance. The price update only saves prices
+    that have changed, so this mostly cleans up duplicates saved before that or added by other means. Duplicates are
+    found with one query per batch of books rather than per book.
     """
 
     book_ids_batch_size: ClassVar[int] = 500
 
-
     name: ClassVar[str] = "TrimAllPricesJob"
 
     def __init__(
@@ -36,23 +37,22 @@ class TrimAllPricesJob(JobBase):
 
     def start(self, **kwargs) -> JobResult:
         try:
-            book_ids_offset, book_id_page = 0, 1
-            while book_ids := self._list_book_ids(book_ids_offset, self.book_ids_batch_size):
-                for book_id in book_ids:
-                    self._trim_prices_service.trim_prices_for_book(book_id)
-
-                book_id_page += 1
-                book_ids_offset = (book_id_page - 1) * self.book_ids_batch_size
-
+            prices_deleted, seconds = 0, 0.0
+            for book_ids in self._unit_of_work.iter_book_id_batches(size=self.book_ids_batch_size):
+                result = self._trim_prices_service.trim_duplicate_prices(book_ids)
+                prices_deleted += result.prices_deleted
+                seconds += result.seconds
+                self._logger.info(f"Deleted {result.prices_deleted} duplicate prices for book ids "
+                                  f"{book_ids[0]}-{book_ids[-1]} ({result.prices_deleted_per_second:.0f} rows/s)")
+
+            total = TrimResult(prices_deleted, seconds)
+            self._logger.info(f"Deleted {total.prices_deleted} duplicate prices in {total.seconds:.1f} seconds "
+                              f"({total.prices_deleted_per_second:.0f} rows/s)")
             return JobResult(JobExitStatus.SUCCESS)
         except Exception as ex:
             self._logger.exception(f"Unexpected error: {ex}")
             return JobResult(JobExitStatus.FAILURE, error=ex)
 
-    def _list_book_ids(self, offset: int, limit: int) -> list[int]:
-        with self._unit_of_work as uow:
-            return uow.book_repository.list_book_ids(offset, limit)
-
 
 class TrimSelectedPricesJob(JobBase):
     """
@@ -34,16 +34,17 @@ class AllBookPricesUpdateJob(JobBase):
 
     def start(self, **kwargs) -> JobResult:
         try:
-            page, offset = 1, 0
-            while book_ids := self._get_next_book_ids(offset, self.batch_size):
-                book_id_count = len(book_ids)
-
-                self._logger.info(f"Updating prices for {book_id_count} books (page {page})...")
-                self._price_update_service.update_prices_for_books(book_ids)
-                self._logger.info(f"Finished updating prices for {book_id_count} books (page {page})!")
-
-                page += 1
-                offset = (page - 1) * self.batch_size
+            self._price_update_service.start_run()
+            try:
+                for page, book_ids in enumerate(
+                        self._unit_of_work.iter_book_id_batches(size=self.batch_size), start=1):
+                    book_id_count = len(book_ids)
+
+                    self._logger.info(f"Updating prices for {book_id_count} books (page {page})...")
+                    self._price_update_service.update_prices_for_books(book_ids)
+                    self._logger.info(f"Finished updating prices for {book_id_count} books (page {page})!")
+            finally:
+                self._price_update_service.finish_run()
 
             self._event_manager.trigger_event(str(BookPricesEvents.BOOK_PRICES_UPDATED))
 
@@ -53,10 +54,6 @@ class AllBookPricesUpdateJob(JobBase):
             self._logger.error(traceback.format_exc())
             return JobResult(JobExitStatus.FAILURE, error=ex)
 
-    def _get_next_book_ids(self, offset: int, limit: int) -> list[int]:
-        with self._unit_of_work as uow:
-            return uow.book_repository.list_book_ids(offset, limit)
-
 
 class  SelectedBookPricesUpdateJob(JobBase):
     """ Updates prices for selected books """
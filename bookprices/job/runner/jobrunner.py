@@ -6,6 +6,7 @@ from collections import Counter
 from bookprices.job.job.base import JobExitStatus, JobBase
 from bookprices.job.runner.service import RunnerJobService, JobRun
 from bookprices.shared.config.config import Config
+from bookprices.shared.db.pool import ConnectionPool
 from bookprices.shared.service.job_service import (
     UpdateFailedError, JobRunStatus, FailedToGetJobRunsError, JobSourceUnavailableError)
 
@@ -14,9 +15,15 @@ class JobRunner:
     sleep_time_seconds: ClassVar[int] = 10
     job_run_lookup_max_retries: ClassVar[int] = 3
 
-    def __init__(self, config: Config, jobs: Sequence[JobBase], job_service: RunnerJobService) -> None:
+    def __init__(
+            self,
+            config: Config,
+            jobs: Sequence[JobBase],
+            job_service: RunnerJobService,
+            connection_pool: ConnectionPool | None = None) -> None:
         self._config = config
         self._job_service = job_service
+        self._connection_pool = connection_pool
         self._logger = getLogger(__name__)
         self._jobs = {job.name: job for job in jobs}
         self._job_lookup_errors = Counter()
@@ -62,6 +69,7 @@ class JobRunner:
             execution_time = (time.time() - start_time) / 60
             self._logger.info(
                 f"Job {job_run.job_name} finished with status {result.exit_status}. Took {execution_time:2f} mins.")
+            self._log_connection_pool_statistics()
 
             if result.exit_status == JobExitStatus.SUCCESS:
                 self._try_set_job_run_status(job_run, status=JobRunStatus.COMPLETED.value)
@@ -73,6 +81,17 @@ class JobRunner:
             if not self._try_set_job_run_status(job_run, status=JobRunStatus.FAILED.value, error_message=str(e)[:500]):
                 raise
 
+    def _log_connection_pool_statistics(self) -> None:
+        if not self._connection_pool:
+            return
+        statistics = self._connection_pool.get_statistics()
+        self._logger.info(
+            f"Database connection pool since start: {statistics.acquisitions} acquisitions "
+            f"(average wait {statistics.average_wait_seconds * 1000:.1f} ms, "
+            f"max wait {statistics.max_wait_seconds * 1000:.1f} ms, {statistics.timeouts} timeouts), "
+            f"{statistics.connections_created} connections created, {statistics.connections_recycled} recycled, "
+            f"{statistics.open_connections} open ({statistics.idle_connections} idle) of {statistics.pool_size}.")
+
     def _increment_error_counter_and_update_status(self, job_run: JobRun) -> None:
         self._job_lookup_errors[job_run.id] += 1
         if self._job_lookup_errors[job_run.id] > self.job_run_lookup_max_retries:
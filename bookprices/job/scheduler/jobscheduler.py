@@ -6,11 +6,13 @@ from typing import ClassVar
 
 import schedule
 
+from bookprices.job.job.book_price_partitions import ManageBookPricePartitionsJob
 from bookprices.job.job.book_search import SearchAllMissingBooksInBookStoresJob
 from bookprices.job.job.delete_images import DeleteUnusedBookImagesJob
 from bookprices.job.job.delete_unavailable_books import DeleteUnavailableBooksJob
+from bookprices.job.job.downsample_prices import DownsamplePricesJob
 from bookprices.job.job.download_images import DownloadAllMissingImagesForBooksJob
-from bookprices.job.job.import_books import WilliamDamBookImportJob
+from bookprices.job.job.import_books import WilliamDamBookImportJob, WilliamDamIncrementalBookImportJob
 from bookprices.job.job.update_currencies import UpdateCurrenciesJob
 from bookprices.job.job.update_prices import AllBookPricesUpdateJob
 from bookprices.shared.service.job_service import (
@@ -55,6 +57,8 @@ class JobScheduler:
         schedule.every().day.at("02:00", self.time_zone).do(
             self._send_start_job_request, DeleteUnavailableBooksJob.name)
         schedule.every().day.at("05:00", self.time_zone).do(
+            self._send_start_job_request, WilliamDamIncrementalBookImportJob.name)
+        schedule.every().sunday.at("03:00", self.time_zone).do(
             self._send_start_job_request, WilliamDamBookImportJob.name)
         schedule.every().monday.at("06:00", self.time_zone).do(
             self._send_start_job_request, SearchAllMissingBooksInBookStoresJob.name)
@@ -64,6 +68,10 @@ class JobScheduler:
             self._send_start_job_request, DownloadAllMissingImagesForBooksJob.name)
         schedule.every().day.at("09:00", self.time_zone).do(
             self._send_start_job_request, UpdateCurrenciesJob.name)
+        schedule.every().monday.at("09:15", self.time_zone).do(
+            self._send_start_job_request, ManageBookPricePartitionsJob.name)
+        schedule.every().monday.at("09:30", self.time_zone).do(
+            self._send_start_job_request, DownsamplePricesJob.name)
         schedule.every().monday.at("10:00", self.time_zone).do(
             self._send_start_job_request, TrimAllPricesJob.name)
         schedule.every().day.at("10:15", self.time_zone).do(
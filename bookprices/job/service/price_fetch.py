@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, ClassVar, Sequence
+from urllib.parse import urljoin
+
+from bookprices.shared.db.tables import BookStoreBook
+from bookprices.shared.webscraping.bookstore import BookStoreScraper
+
+
+@dataclass(frozen=True)
+class BookStoreBudget:
+    """ How many requests may be in flight for a bookstore and, optionally, how many may start per period. """
+    concurrency: int
+    max_requests: int | None = None
+    period_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class PriceFetchResult:
+    book_in_store: BookStoreBook
+    price: float | None = None
+    error: Exception | None = None
+
+
+def get_price_url(book_in_store: BookStoreBook) -> str:
+    return urljoin(book_in_store.book_store.url, book_in_store.url)
+
+
+class AsyncRateLimiter:
+    """ Sliding window rate limiter for coroutines. Waiting doesn't block the event loop or any worker thread. """
+
+    def __init__(self, max_requests: int, period_seconds: float) -> None:
+        self._max_requests = max_requests
+        self._period_seconds = period_seconds
+        self._request_timestamps: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def wait_if_needed(self) -> None:
+        async with self._lock:
+            while True:
+                now = monotonic()
+                while self._request_timestamps and now - self._request_timestamps[0] >= self._period_seconds:
+                    self._request_timestamps.popleft()
+                if len(self._request_timestamps) < self._max_requests:
+                    self._request_timestamps.append(now)
+                    return
+
+                await asyncio.sleep(self._period_seconds - (now - self._request_timestamps[0]))
+
+
+class PriceFetchEngine:
+    """
+    Fetches prices for many bookstores at once. Each bookstore gets its own queue and budget, so waiting for a slow
+    or rate-limited bookstore never holds up requests to the others. The scrapers are blocking, so requests run
+    in a thread pool sized to the sum of the bookstore budgets. Results are handled in a thread of their own, so
+    a slow result handler holds up the requests once result_queue_size results wait, but never the event loop.
+    """
+    default_concurrency: ClassVar[int] = 4
+    result_queue_size: ClassVar[int] = 100
+
+    def __init__(self, concurrency_per_bookstore: int | None = None) -> None:
+        self._concurrency_per_bookstore = concurrency_per_bookstore or self.default_concurrency
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def fetch_prices(
+            self,
+            book_stores_by_bookstore_id: dict[int, Sequence[BookStoreBook]],
+            scrapers_by_bookstore_id: dict[int, BookStoreScraper]) -> list[PriceFetchResult]:
+        results = []
+        self.stream_prices(book_stores_by_bookstore_id, scrapers_by_bookstore_id, results.append)
+
+        return results
+
+    def stream_prices(
+            self,
+            book_stores_by_bookstore_id: dict[int, Sequence[BookStoreBook]],
+            scrapers_by_bookstore_id: dict[int, BookStoreScraper],
+            on_result: Callable[[PriceFetchResult], None]) -> None:
+        """
+        Calls on_result for each price as soon as it has been fetched instead of collecting the results. on_result
+        is called from a single worker thread, one result at a time.
+        """
+        budgets = {
+            bookstore_id: self.get_budget(scraper) for bookstore_id, scraper in scrapers_by_bookstore_id.items()
+            if bookstore_id in book_stores_by_bookstore_id
+        }
+        if not budgets:
+            return
+
+        max_workers = sum(budget.concurrency for budget in budgets.values())
+        with (ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="PriceFetch") as executor,
+              ThreadPoolExecutor(max_workers=1, thread_name_prefix="PriceFetchResult") as result_executor):
+            asyncio.run(self._fetch_all(
+                book_stores_by_bookstore_id, scrapers_by_bookstore_id, budgets, executor, result_executor, on_result))
+
+    def get_budget(self, scraper: BookStoreScraper) -> BookStoreBudget:
+        if not (rate_limiter := scraper.get_price_rate_limiter()):
+            return BookStoreBudget(concurrency=self._concurrency_per_bookstore)
+
+        # Adaptive rate limiters may let more requests through than configured. They enforce their own rate.
+        return BookStoreBudget(
+            concurrency=min(rate_limiter.max_request_count, self._concurrency_per_bookstore),
+            max_requests=rate_limiter.max_request_count,
+            period_seconds=rate_limiter.seconds)
+
+    async def _fetch_all(
+            self,
+            book_stores_by_bookstore_id: dict[int, Sequence[BookStoreBook]],
+            scrapers_by_bookstore_id: dict[int, BookStoreScraper],
+            budgets: dict[int, BookStoreBudget],
+            executor: ThreadPoolExecutor,
+            result_executor: ThreadPoolExecutor,
+            on_result: Callable[[PriceFetchResult], None]) -> None:
+        results: asyncio.Queue[PriceFetchResult | None] = asyncio.Queue(maxsize=self.result_queue_size)
+
+        async def _fetch_and_finish() -> None:
+            await asyncio.gather(*(
+                self._fetch_for_bookstore(
+                    deque(book_stores_by_bookstore_id[bookstore_id]),
+                    scrapers_by_bookstore_id[bookstore_id],
+                    budget,
+                    executor,
+                    results)
+                for bookstore_id, budget in budgets.items()
+            ))
+            await results.put(None)
+
+        await asyncio.gather(_fetch_and_finish(), self._handle_results(results, result_executor, on_result))
+
+    @staticmethod
+    async def _handle_results(
+            results: asyncio.Queue[PriceFetchResult | None],
+            result_executor: ThreadPoolExecutor,
+            on_result: Callable[[PriceFetchResult], None]) -> None:
+        loop = asyncio.get_running_loop()
+        while (result := await results.get()) is not None:
+            await loop.run_in_executor(result_executor, on_result, result)
+
+    async def _fetch_for_bookstore(
+            self,
+            books_in_store: deque[BookStoreBook],
+            scraper: BookStoreScraper,
+            budget: BookStoreBudget,
+            executor: ThreadPoolExecutor,
+            results: asyncio.Queue[PriceFetchResult | None]) -> None:
+        rate_limiter = AsyncRateLimiter(budget.max_requests, budget.period_seconds) if budget.max_requests else None
+        started = monotonic()
+        book_count = len(books_in_store)
+
+        async def _worker() -> None:
+            loop = asyncio.get_running_loop()
+            while books_in_store:
+                book_in_store = books_in_store.popleft()
+                if rate_limiter:
+                    await rate_limiter.wait_if_needed()
+                full_url = get_price_url(book_in_store)
+                self._logger.debug("Getting price for book ID %s at book store ID %s (URL %s)",
+                                   book_in_store.book_id, book_in_store.book_store_id, full_url)
+                try:
+                    price = await loop.run_in_executor(executor, scraper.get_price, full_url)
+                    result = PriceFetchResult(book_in_store, price=price)
+                except Exception as ex:
+                    result = PriceFetchResult(book_in_store, error=ex)
+                await results.put(result)
+
+        await asyncio.gather(*(_worker() for _ in range(min(budget.concurrency, book_count))))
+        self._logger.debug(f"Fetched {book_count} prices from {scraper.get_name()} "
+                           f"in {monotonic() - started:.1f} seconds")
@@ -0,0 +1,127 @@
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from enum import StrEnum
+from typing import ClassVar, Sequence
+
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+class PriceResolution(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    def get_period_start(self, created: datetime) -> date:
+        day = created.date()
+        match self:
+            case PriceResolution.WEEK:
+                return day - timedelta(days=day.weekday())
+            case PriceResolution.MONTH:
+                return day.replace(day=1)
+            case _:
+                return day
+
+
+@dataclass(frozen=True)
+class PriceRetentionTier:
+    resolution: PriceResolution
+    max_age_days: int | None = None
+
+
+class PriceRetentionPolicy:
+    """
+    Retention tiers ordered by age, written as e.g. "day:90,week:730,month": one price per day for prices up to 90
+    days old, one per week up to two years and one per month after that.
+    """
+    default_tiers: ClassVar[str] = "day:90,week:730,month"
+
+    def __init__(self, tiers: Sequence[PriceRetentionTier]) -> None:
+        if not tiers:
+            raise ValueError("At least one retention tier is required")
+        max_ages = [tier.max_age_days for tier in tiers[:-1]]
+        if any(max_age is None or max_age <= 0 for max_age in max_ages) or max_ages != sorted(set(max_ages)):
+            raise ValueError("Only the last retention tier may be without a max age, and max ages must increase")
+        self.tiers = list(tiers)
+
+    @classmethod
+    def parse(cls, tiers: str) -> "PriceRetentionPolicy":
+        parsed_tiers = []
+        for tier in tiers.split(","):
+            resolution, _, max_age_days = tier.strip().partition(":")
+            try:
+                parsed_tiers.append(
+                    PriceRetentionTier(PriceResolution(resolution), int(max_age_days) if max_age_days else None))
+            except ValueError as ex:
+                raise ValueError(f"Invalid retention tier '{tier}': {ex}") from ex
+
+        return cls(parsed_tiers)
+
+    def get_resolution(self, created: datetime, today: date) -> PriceResolution:
+        age_days = (today - created.date()).days
+        for tier in self.tiers:
+            if tier.max_age_days is None or age_days < tier.max_age_days:
+                return tier.resolution
+
+        return self.tiers[-1].resolution
+
+
+class PriceRetentionService:
+    """ Downsamples old prices according to the retention policy by keeping only the last price in each period. """
+
+    delete_chunk_size: ClassVar[int] = 1000
+
+    def __init__(
+            self,
+            unit_of_work: UnitOfWork,
+            cache_key_remover: BookPriceKeyRemover,
+            retention_policy: PriceRetentionPolicy) -> None:
+        self._unit_of_work = unit_of_work
+        self._cache_key_remover = cache_key_remover
+        self._retention_policy = retention_policy
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def downsample_prices(self, book_ids: Sequence[int], today: date | None = None) -> int:
+        """
+        Downsamples the prices before today for the books in the id range of book_ids and returns the number of
+        prices deleted. The last price of each book in each book store is always kept, so latest prices don't change.
+        """
+        today = today or date.today()
+        with self._unit_of_work as uow:
+            prices = uow.bookprice_repository.get_prices_created_before(
+                min(book_ids), max(book_ids), datetime.combine(today, time.min))
+        if not (prices_to_remove := self.get_prices_to_remove(prices, today)):
+            return 0
+
+        for offset in range(0, len(prices_to_remove), self.delete_chunk_size):
+            with self._unit_of_work as uow:
+                uow.bookprice_repository.delete_prices(
+                    [price_id for price_id, _, _, _ in prices_to_remove[offset:offset + self.delete_chunk_size]])
+
+        updated_book_ids = {book_id for _, book_id, _, _ in prices_to_remove}
+        with self._unit_of_work as uow:
+            uow.bookprice_interval_repository.refresh_for_books(updated_book_ids)
+
+        self._cache_key_remover.remove_keys_for_books(updated_book_ids)
+        self._cache_key_remover.remove_keys_for_books_and_bookstores(
+            {(book_id, bookstore_id) for _, book_id, bookstore_id, _ in prices_to_remove})
+
+        return len(prices_to_remove)
+
+    def get_prices_to_remove(
+            self,
+            prices: Sequence[tuple[int, int, int, datetime]],
+            today: date) -> list[tuple[int, int, int, datetime]]:
+        """ Takes (id, book id, bookstore id, created) ordered by id and returns all but the last price per period. """
+        last_price_by_period = {}
+        prices_to_remove = []
+        for price in prices:
+            _, book_id, bookstore_id, created = price
+            resolution = self._retention_policy.get_resolution(created, today)
+            period = (book_id, bookstore_id, resolution, resolution.get_period_start(created))
+            if (previous_price := last_price_by_period.get(period)) is not None:
+                prices_to_remove.append(previous_price)
+            last_price_by_period[period] = price
+
+        return prices_to_remove
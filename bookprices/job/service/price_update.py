@@ -1,10 +1,10 @@
 import logging
+from collections import defaultdict, Counter
 from datetime import datetime
-from queue import Queue, Empty
-from threading import Thread, Lock
-from typing import Sequence, ClassVar
-from urllib.parse import urljoin
+from typing import Iterable, Sequence, ClassVar
 
+from bookprices.job.service.price_fetch import PriceFetchEngine, PriceFetchResult, get_price_url
+from bookprices.job.service.price_writer import PriceWriter, UnchangedPrice
 from bookprices.shared.cache.key_remover import BookPriceKeyRemover
 from bookprices.shared.db.tables import BookStoreBook
 import bookprices.shared.db.tables as tables
@@ -13,13 +13,20 @@ from bookprices.shared.model.error import FailedUpdateReason
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.shared.service.scraper_service import BookStoreScraperService
 from bookprices.shared.webscraping.bookstore import BookStoreScraper
+from bookprices.shared.webscraping.http import session_pool
 from bookprices.shared.webscraping.price import (
-    PriceSelectorError, PriceFormatError, PriceNotFoundException, PriceFinderConnectionError)
+    PriceSelectorError, PriceFormatError, PriceNotFoundException, PriceFinderConnectionError,
+    PriceNotModifiedException)
 
 
 class PriceUpdateService:
     """ Price update service using different scrapers, unit of work and  repository classes."""
-    min_updates_per_thread: ClassVar[int] = 5
+    _failed_update_reasons: ClassVar[dict[type[Exception], FailedUpdateReason]] = {
+        PriceSelectorError: FailedUpdateReason.PRICE_SELECT_ERROR,
+        PriceFormatError: FailedUpdateReason.INVALID_PRICE_FORMAT,
+        PriceNotFoundException: FailedUpdateReason.PAGE_NOT_FOUND,
+        PriceFinderConnectionError: FailedUpdateReason.CONNECTION_ERROR,
+    }
 
     def __init__(
             self,
@@ -28,89 +35,143 @@ class PriceUpdateService:
             scraper_service: BookStoreScraperService,
             thread_count: int) -> None:
         self._cache_key_remover = cache_key_remover
-        self._thread_count = thread_count
-        self._book_stores_queue = Queue()
         self._unit_of_work = unit_of_work
         self._scraper_service = scraper_service
-        self._updated_book_prices: list[tables.BookPrice] = []
+        self._price_fetch_engine = PriceFetchEngine(concurrency_per_bookstore=thread_count)
         self._scrapers_by_bookstore_id = {}
-        self._unit_of_work_lock = Lock()
+        self._updated_bookstore_ids = set()
+        self._run_started = False
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    def update_prices_for_books(self, book_ids: Sequence[int]) -> None:
+    def start_run(self) -> None:
+        """
+        Starts a run of price updates. The scrapers, and with them the adaptive rate limiters, are kept for the whole
+        run, so the request rates adapt across all its batches of books and are saved once by finish_run().
+        """
         self._scrapers_by_bookstore_id = self._load_scrapers_for_bookstores()
+        self._updated_bookstore_ids = set()
+        self._run_started = True
+
+    def finish_run(self) -> None:
+        """ Saves the request rates learned in the run and logs statistics for it. """
+        try:
+            self._log_http_statistics()
+            self._log_price_source_statistics()
+            self._save_request_rates(self._updated_bookstore_ids)
+        finally:
+            self._scrapers_by_bookstore_id = {}
+            self._updated_bookstore_ids = set()
+            self._run_started = False
+
+    def update_prices_for_books(self, book_ids: Sequence[int]) -> None:
+        """ Updates the prices within the current run, or in a run of their own if no run has been started. """
+        if self._run_started:
+            self._update_prices_for_books(book_ids)
+            return
+
+        self.start_run()
+        try:
+            self._update_prices_for_books(book_ids)
+        finally:
+            self.finish_run()
+
+    def _update_prices_for_books(self, book_ids: Sequence[int]) -> None:
         with self._unit_of_work as uow:
             if not (book_stores_by_book_id := uow.bookstore_repository.get_bookstores_for_books(book_ids)):
                 self._logger.warning("No book stores found for books!")
                 return
+            latest_prices = {
+                (latest_price.book_id, latest_price.book_store_id): latest_price.price
+                for latest_price in uow.bookstore_latest_price_repository.list_for_books(book_ids)
+            }
+
+        book_stores_by_bookstore_id = self._group_by_bookstore(book_stores_by_book_id)
+        self._forget_validators_for_books_without_price(book_stores_by_bookstore_id, latest_prices)
+        request_counts, not_modified_counts = Counter(), Counter()
+
+        def _handle_fetch_result(result: PriceFetchResult) -> None:
+            bookstore_name = result.book_in_store.book_store.name
+            request_counts[bookstore_name] += 1
+            if isinstance(result.error, PriceNotModifiedException):
+                not_modified_counts[bookstore_name] += 1
+            self._handle_fetch_result(result, latest_prices, price_writer)
+
+        # The writer gets its own unit of work, as it saves prices from another thread
+        with PriceWriter(self._unit_of_work.create_new(), self._cache_key_remover) as price_writer:
+            self._price_fetch_engine.stream_prices(
+                book_stores_by_bookstore_id, self._scrapers_by_bookstore_id, _handle_fetch_result)
+
+        self._log_not_modified_rates(request_counts, not_modified_counts)
+        self._updated_bookstore_ids.update(book_stores_by_bookstore_id.keys())
+
+    def _group_by_bookstore(
+            self, book_stores_by_book_id: dict[int, list[BookStoreBook]]) -> dict[int, list[BookStoreBook]]:
+        book_stores_by_bookstore_id = defaultdict(list)
+        for book_stores in book_stores_by_book_id.values():
+            for book_in_store in book_stores:
+                if book_in_store.book_store_id not in self._scrapers_by_bookstore_id:
+                    self._logger.warning(
+                        f"No scraper found for bookstore ID {book_in_store.book_store_id}, skipping price update.")
+                    continue
+                book_stores_by_bookstore_id[book_in_store.book_store_id].append(book_in_store)
 
-        self._fill_queue(book_stores_by_book_id)
-        self._start_price_update()
-        self._save_new_prices_and_clear_cache()
+        self._logger.debug(f"Fetching prices for {len(book_stores_by_book_id)} books "
+                           f"from {len(book_stores_by_bookstore_id)} book stores...")
+        return book_stores_by_bookstore_id
 
-    def _fill_queue(self, book_stores_by_book_id: dict[int, list[BookStoreBook]]) -> None:
-        self._logger.debug(f"Filling {len(book_stores_by_book_id.values())} book stores for book {book_stores_by_book_id.keys()} into queue...")
-        for book_stores in book_stores_by_book_id.values():
-            self._book_stores_queue.put(book_stores)
-
-    def _start_price_update(self) -> None:
-        if self._book_stores_queue.empty():
-            self._logger.info("Price update queue is empty!")
-        elif self._book_stores_queue.qsize() / self._thread_count < self.min_updates_per_thread:
-            self._logger.debug("Updating prices using single thread...")
-            self._get_updated_prices_for_books()
+    def _handle_fetch_result(
+            self,
+            result: PriceFetchResult,
+            latest_prices: dict[tuple[int, int], float],
+            price_writer: PriceWriter) -> None:
+        book_in_store = result.book_in_store
+        latest_price = latest_prices.get((book_in_store.book_id, book_in_store.book_store_id))
+        if result.error is None and not self._is_same_price(result.price, latest_price):
+            price_writer.add_price(
+                tables.BookPrice(
+                    book_id=book_in_store.book_id,
+                    book_store_id=book_in_store.book_store_id,
+                    price=result.price,
+                    created=datetime.now()))
+        elif isinstance(result.error, PriceNotModifiedException) and latest_price is None:
+            self._logger.warning(f"Page for book ID {book_in_store.book_id} at book store ID "
+                                 f"{book_in_store.book_store_id} not modified, but the book has no known price")
+        elif result.error is None or isinstance(result.error, PriceNotModifiedException):
+            price_writer.add_unchanged_price(
+                UnchangedPrice(
+                    book_id=book_in_store.book_id,
+                    book_store_id=book_in_store.book_store_id,
+                    checked=datetime.now()))
+        elif reason := self._failed_update_reasons.get(type(result.error)):
+            self._logger.error(result.error)
+            price_writer.add_failed_update(
+                FailedPriceUpdate(
+                    book_id=book_in_store.book_id,
+                    book_store_id=book_in_store.book_store_id,
+                    reason=str(reason),
+                    created=datetime.now()))
         else:
-            self._logger.debug("Updating prices using %s threads...", self._thread_count)
-            threads = []
-            for _ in range(self._thread_count):
-                t = Thread(target=self._get_updated_prices_for_books)
-                threads.append(t)
-                t.start()
-
-            [t.join() for t in threads]
-
-    def _get_updated_prices_for_books(self) -> None:
-        while (bookstores_for_book := self.get_next_enqueued_bookstores()) is not None:
-            self._get_prices_for_book(bookstores_for_book)
-
-    def _get_prices_for_book(self, book_stores: list[BookStoreBook]) -> None:
-        for book_in_store in book_stores:
-            try:
-                full_url = urljoin(book_in_store.book_store.url, book_in_store.url)
-                bookstore_id = book_in_store.book_store_id
-                book_id = book_in_store.book_id
-                self._logger.debug("Getting price for book ID %s at book store ID %s (URL %s)",
-                              book_id,
-                              bookstore_id,
-                              full_url)
-
-                if not (scraper := self._scrapers_by_bookstore_id.get(bookstore_id)):
-                    self._logger.warning(f"No scraper found for bookstore ID {bookstore_id}, skipping price update.")
-                    continue
+            self._logger.error(f"Unexpected error while getting price for book ID {book_in_store.book_id} "
+                               f"at book store ID {book_in_store.book_store_id}: {result.error!r}")
 
-                price_value = scraper.get_price(full_url)
-                self._updated_book_prices.append(
-                    tables.BookPrice(
-                              book_id=book_id,
-                              book_store_id=bookstore_id,
-                              price=price_value,
-                              created=datetime.now()))
-            except PriceSelectorError as ex:
-                self._logger.error(ex)
-                self._log_failed_price_update_to_db(
-                    book_in_store.book_id, book_in_store.book_store_id, FailedUpdateReason.PRICE_SELECT_ERROR)
-            except PriceFormatError as ex:
-                self._logger.error(ex)
-                self._log_failed_price_update_to_db(
-                    book_in_store.book_id, book_in_store.book_store_id, FailedUpdateReason.INVALID_PRICE_FORMAT)
-            except PriceNotFoundException as ex:
-                self._logger.error(ex)
-                self._log_failed_price_update_to_db(
-                    book_in_store.book_id, book_in_store.book_store_id, FailedUpdateReason.PAGE_NOT_FOUND)
-            except PriceFinderConnectionError as ex:
-                self._logger.error(ex)
-                self._log_failed_price_update_to_db(
-                    book_in_store.book_id, book_in_store.book_store_id, FailedUpdateReason.CONNECTION_ERROR)
+    def _forget_validators_for_books_without_price(
+            self,
+            book_stores_by_bookstore_id: dict[int, list[BookStoreBook]],
+            latest_prices: dict[tuple[int, int], float]) -> None:
+        """
+        A page that hasn't changed is not read, so a book without a known price would never get one while the
+        page keeps answering 304. Its validators are dropped, so the page is downloaded in full.
+        """
+        for bookstore_id, books_in_store in book_stores_by_bookstore_id.items():
+            scraper = self._scrapers_by_bookstore_id[bookstore_id]
+            for book_in_store in books_in_store:
+                if (book_in_store.book_id, bookstore_id) not in latest_prices:
+                    scraper.forget_price_validators(get_price_url(book_in_store))
+
+    @staticmethod
+    def _is_same_price(price: float, latest_price: float | None) -> bool:
+        # Prices are stored with two decimals
+        return latest_price is not None and round(price, 2) == round(latest_price, 2)
 
     def _load_scrapers_for_bookstores(self) -> dict[int, BookStoreScraper]:
         with self._unit_of_work as uow:
@@ -118,38 +179,50 @@ class PriceUpdateService:
 
         return {b.id: scraper for b in bookstores if (scraper := self._scraper_service.get_scraper(b.id)) is not None}
 
-    def _save_new_prices_and_clear_cache(self) -> None:
-        if not self._updated_book_prices:
-            self._logger.info("No new price updates to save!")
+    def _save_request_rates(self, bookstore_ids: Iterable[int]) -> None:
+        """ Saves the rates learned by the adaptive rate limiters, so the next run starts from them. """
+        updated = datetime.now()
+        request_rates = [
+            tables.BookStoreRequestRate(
+                book_store_id=bookstore_id,
+                requests_per_second=request_rate.requests_per_second,
+                configured_requests_per_second=request_rate.configured_requests_per_second,
+                backoffs=request_rate.backoffs,
+                updated=updated)
+            for bookstore_id in bookstore_ids
+            if (request_rate := self._scrapers_by_bookstore_id[bookstore_id].get_request_rate())
+        ]
+        if not request_rates:
             return
 
-        self._logger.debug(f"Saving {len(self._updated_book_prices)} new prices")
         with self._unit_of_work as uow:
-            uow.bookprice_repository.add_prices(self._updated_book_prices)
-        self._logger.info(f"Saved {len(self._updated_book_prices)} new prices")
-
-        self._logger.info("Removing cache keys for affected books and bookstores...")
-        for book_price in self._updated_book_prices:
-            book_id = book_price.book_id
-            bookstore_id = book_price.book_store_id
-            self._cache_key_remover.remove_keys_for_book(book_id)
-            self._cache_key_remover.remove_keys_for_book_and_bookstore(book_id, bookstore_id)
-
-        self._updated_book_prices = []
-
-    def _log_failed_price_update_to_db(self, book_id: int, bookstore_id: int, reason: FailedUpdateReason) -> None:
-        with self._unit_of_work_lock:
-            with self._unit_of_work as uow:
-                failed_price_update = FailedPriceUpdate(
-                    book_id=book_id,
-                    book_store_id=bookstore_id,
-                    reason=str(reason),
-                    created=datetime.now())
-
-                uow.failed_price_update_repository.add(failed_price_update)
-
-    def get_next_enqueued_bookstores(self) -> list[BookStoreBook] | None:
-        try:
-            return self._book_stores_queue.get_nowait()
-        except Empty:
-            return None
+            uow.bookstore_request_rate_repository.save_rates(request_rates)
+        for request_rate in request_rates:
+            bookstore_name = self._scrapers_by_bookstore_id[request_rate.book_store_id].bookstore_name
+            self._logger.info(f"{bookstore_name}: "
+                              f"{request_rate.requests_per_second:.2f} requests per second "
+                              f"(configured {request_rate.configured_requests_per_second:.2f}, "
+                              f"{request_rate.backoffs} backoffs)")
+
+    def _log_not_modified_rates(self, request_counts: Counter, not_modified_counts: Counter) -> None:
+        for bookstore_name, request_count in sorted(request_counts.items()):
+            not_modified_count = not_modified_counts[bookstore_name]
+            self._logger.info(f"{bookstore_name}: {not_modified_count} of {request_count} pages not modified "
+                              f"({not_modified_count / request_count:.0%})")
+
+    def _log_price_source_statistics(self) -> None:
+        for scraper in sorted(self._scrapers_by_bookstore_id.values(), key=lambda s: s.bookstore_name):
+            if not (statistics := scraper.get_price_source_statistics()):
+                continue
+            counts = statistics.get_counts()
+            if not (price_count := sum(counts.values())):
+                continue
+            self._logger.info(f"{scraper.bookstore_name}: " + ", ".join(
+                f"{count} of {price_count} prices from {price_source} ({count / price_count:.0%})"
+                for price_source, count in counts.items()))
+
+    def _log_http_statistics(self) -> None:
+        statistics = session_pool.get_statistics()
+        self._logger.info(f"HTTP sessions: {statistics.requests_sent} requests sent over "
+                          f"{statistics.connections_opened} connections to {statistics.hosts} hosts "
+                          f"({statistics.requests_per_connection:.1f} requests per connection)")
@@ -0,0 +1,248 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from queue import Queue, Empty, Full
+from threading import Thread
+from time import monotonic, sleep
+from typing import ClassVar
+
+import bookprices.shared.db.tables as tables
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.db.tables import FailedPriceUpdate
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+class PriceWriterError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class UnchangedPrice:
+    """ The price is the same as the latest known price, so only the time it was checked is saved. """
+    book_id: int
+    book_store_id: int
+    checked: datetime
+
+
+@dataclass
+class PriceWriterStatistics:
+    prices_saved: int = 0
+    unchanged_prices: int = 0
+    failed_updates_saved: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    failed_cache_removals: int = 0
+    flush_seconds: float = 0.0
+
+
+@dataclass
+class _Batch:
+    prices: list[tables.BookPrice] = field(default_factory=list)
+    unchanged_prices: list[UnchangedPrice] = field(default_factory=list)
+    failed_updates: list[FailedPriceUpdate] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.prices) + len(self.unchanged_prices) + len(self.failed_updates)
+
+
+class PriceWriter:
+    """
+    Saves changed prices, the time unchanged prices were checked and failed price updates from a background thread.
+    Items are put on a bounded queue and written in batches when the batch is full or flush_interval_seconds has
+    passed, so memory use stays flat and saved prices survive if the job stops. Adding items only blocks if the writer
+    falls queue_size items behind. A batch that can't be saved is retried, and closing the writer fails if it never was
+    or if the writer thread stopped. Removing cached prices is best-effort, since the cache expires on its own.
+    """
+    default_batch_size: ClassVar[int] = 200
+    default_flush_interval_seconds: ClassVar[float] = 5.0
+    default_queue_size: ClassVar[int] = 2000
+    flush_attempts: ClassVar[int] = 3
+    flush_retry_delay_seconds: ClassVar[float] = 1.0
+    put_timeout_seconds: ClassVar[float] = 1.0
+    _stop_item: ClassVar[object] = object()
+
+    def __init__(
+            self,
+            unit_of_work: UnitOfWork,
+            cache_key_remover: BookPriceKeyRemover,
+            batch_size: int | None = None,
+            flush_interval_seconds: float | None = None,
+            queue_size: int | None = None) -> None:
+        self._unit_of_work = unit_of_work
+        self._cache_key_remover = cache_key_remover
+        self._batch_size = batch_size or self.default_batch_size
+        self._flush_interval_seconds = flush_interval_seconds or self.default_flush_interval_seconds
+        self._queue = Queue(maxsize=queue_size or self.default_queue_size)
+        self._thread: Thread | None = None
+        self._thread_failed = False
+        self.statistics = PriceWriterStatistics()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def __enter__(self) -> "PriceWriter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type:
+            self._stop()
+        else:
+            self.close()
+
+    def start(self) -> None:
+        self.statistics = PriceWriterStatistics()
+        self._thread_failed = False
+        self._thread = Thread(target=self._write, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Writes the remaining items and stops the writer thread.
+        Raises PriceWriterError if a batch wasn't saved or the writer thread stopped before all items were written.
+        """
+        if not self._thread:
+            return
+        self._stop()
+        if self._thread_failed:
+            raise PriceWriterError("The price writer stopped before all price updates were saved")
+        if self.statistics.failed_flushes:
+            raise PriceWriterError(f"Failed to save {self.statistics.failed_flushes} batches of price updates")
+
+    def _stop(self) -> None:
+        if not self._thread:
+            return
+        if not self._try_put(self._stop_item):
+            self._logger.error(f"The writer thread stopped with {self._queue.qsize()} price updates left unsaved")
+        self._thread.join()
+        self._thread = None
+        self._logger.info(
+            f"Saved {self.statistics.prices_saved} changed prices, {self.statistics.unchanged_prices} unchanged prices "
+            f"and {self.statistics.failed_updates_saved} failed updates "
+            f"in {self.statistics.flushes} batches ({self.statistics.flush_seconds:.1f} seconds writing, "
+            f"{self.statistics.failed_flushes} failed batches, "
+            f"{self.statistics.failed_cache_removals} failed cache removals)")
+
+    def add_price(self, book_price: tables.BookPrice) -> None:
+        self._put(book_price)
+
+    def add_unchanged_price(self, unchanged_price: UnchangedPrice) -> None:
+        self._put(unchanged_price)
+
+    def add_failed_update(self, failed_price_update: FailedPriceUpdate) -> None:
+        self._put(failed_price_update)
+
+    def _put(self, item: object) -> None:
+        if not self._try_put(item):
+            raise PriceWriterError("The price writer has stopped")
+
+    def _try_put(self, item: object) -> bool:
+        """ Waits for room in the queue while the writer thread is alive, so a stopped writer can't block forever. """
+        while self._thread and self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=self.put_timeout_seconds)
+                return True
+            except Full:
+                continue
+
+        return False
+
+    def _write(self) -> None:
+        try:
+            self._write_batches()
+        except Exception as ex:
+            self._thread_failed = True
+            self._logger.exception(f"The price writer stopped: {ex}")
+
+    def _write_batches(self) -> None:
+        batch = _Batch()
+        flush_deadline = monotonic() + self._flush_interval_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(flush_deadline - monotonic(), 0))
+            except Empty:
+                item = None
+
+            try:
+                if item is self._stop_item:
+                    self._flush(batch)
+                    return
+                if isinstance(item, tables.BookPrice):
+                    batch.prices.append(item)
+                elif isinstance(item, UnchangedPrice):
+                    batch.unchanged_prices.append(item)
+                elif isinstance(item, FailedPriceUpdate):
+                    batch.failed_updates.append(item)
+
+                if len(batch) >= self._batch_size or monotonic() >= flush_deadline:
+                    self._flush(batch)
+                    batch = _Batch()
+                    flush_deadline = monotonic() + self._flush_interval_seconds
+            except Exception as ex:
+                self._logger.exception(f"Failed to write batch of {len(batch)} price updates: {ex}")
+                self.statistics.failed_flushes += 1
+                batch = _Batch()
+                flush_deadline = monotonic() + self._flush_interval_seconds
+
+    def _flush(self, batch: _Batch) -> None:
+        if not batch:
+            return
+
+        started = monotonic()
+        saved = self._save_with_retries(batch)
+        self.statistics.flush_seconds += monotonic() - started
+        if not saved:
+            self.statistics.failed_flushes += 1
+            self._logger.error(f"Gave up saving batch of {len(batch)} price updates")
+            return
+
+        self._remove_cache_keys(batch.prices)
+        self.statistics.prices_saved += len(batch.prices)
+        self.statistics.unchanged_prices += len(batch.unchanged_prices)
+        self.statistics.failed_updates_saved += len(batch.failed_updates)
+        self.statistics.flushes += 1
+
+    def _save_with_retries(self, batch: _Batch) -> bool:
+        for attempt in range(1, self.flush_attempts + 1):
+            try:
+                self._save(batch)
+                return True
+            except Exception as ex:
+                self._logger.warning(f"Failed to save batch of {len(batch)} price updates "
+                                     f"(attempt {attempt} of {self.flush_attempts}): {ex}")
+                if attempt < self.flush_attempts:
+                    sleep(self.flush_retry_delay_seconds * attempt)
+
+        return False
+
+    def _save(self, batch: _Batch) -> None:
+        with self._unit_of_work as uow:
+            if prices := batch.prices:
+                uow.bookprice_repository.add_prices(prices)
+                uow.bookprice_interval_repository.add_prices(prices)
+                updated_book_ids = {book_price.book_id for book_price in prices}
+                uow.bookstore_latest_price_repository.refresh_for_books(updated_book_ids)
+            if checked_book_store_ids := self._get_checked_book_store_ids(batch):
+                uow.bookstore_repository.set_last_checked(checked_book_store_ids, self._get_last_checked(batch))
+            for failed_price_update in batch.failed_updates:
+                uow.failed_price_update_repository.add(failed_price_update)
+
+    @staticmethod
+    def _get_checked_book_store_ids(batch: _Batch) -> set[tuple[int, int]]:
+        return ({(book_price.book_id, book_price.book_store_id) for book_price in batch.prices} |
+                {(unchanged_price.book_id, unchanged_price.book_store_id) for unchanged_price in batch.unchanged_prices})
+
+    @staticmethod
+    def _get_last_checked(batch: _Batch) -> datetime:
+        """ One timestamp per batch keeps it to a single update per bookstore. Batches span a few seconds at most. """
+        return max([book_price.created for book_price in batch.prices] +
+                   [unchanged_price.checked for unchanged_price in batch.unchanged_prices])
+
+    def _remove_cache_keys(self, prices: list[tables.BookPrice]) -> None:
+        if not prices:
+            return
+        try:
+            self._cache_key_remover.remove_keys_for_books({book_price.book_id for book_price in prices})
+            self._cache_key_remover.remove_keys_for_books_and_bookstores(
+                {(book_price.book_id, book_price.book_store_id) for book_price in prices})
+        except Exception as ex:
+            self.statistics.failed_cache_removals += 1
+            self._logger.warning(f"Failed to remove cached prices for {len(prices)} saved prices: {ex}")
@@ -1,15 +1,28 @@
 import logging
+from dataclasses import dataclass
 from datetime import datetime
-from typing import ClassVar
+from time import monotonic
+from typing import ClassVar, Sequence
 
 from bookprices.shared.cache.key_remover import BookPriceKeyRemover
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 
 
+@dataclass(frozen=True)
+class TrimResult:
+    prices_deleted: int
+    seconds: float
+
+    @property
+    def prices_deleted_per_second(self) -> float:
+        return self.prices_deleted / self.seconds if self.seconds else 0.0
+
+
 class TrimPricesService:
     """ Service for the trim prices job(s) """
 
     min_prices_to_keep: ClassVar[int] = 10
+    delete_chunk_size: ClassVar[int] = 1000
 
     def __init__(self, unit_of_work: UnitOfWork, cache_key_remover: BookPriceKeyRemover) -> None:
         self._unit_of_work = unit_of_work
@@ -36,10 +49,38 @@ class TrimPricesService:
 
             with self._unit_of_work as uow:
                 uow.bookprice_repository.delete_prices([price[0] for price in prices_to_delete])
+                uow.bookstore_latest_price_repository.refresh_for_books([book_id])
 
             self._cache_key_remover.remove_keys_for_book(book_id)
             self._cache_key_remover.remove_keys_for_book_and_bookstore(book_id, bookstore_id)
 
+    def trim_duplicate_prices(self, book_ids: Sequence[int]) -> TrimResult:
+        """
+        Deletes duplicate prices for all books in the id range of book_ids at once. Only the price changes are kept,
+        so the price history stays the same. Prices are deleted in chunks, each in its own transaction, to keep locks
+        on BookPrice short.
+        """
+        started = monotonic()
+        with self._unit_of_work as uow:
+            duplicate_prices = uow.bookprice_repository.get_duplicate_prices(min(book_ids), max(book_ids))
+        if not duplicate_prices:
+            return TrimResult(0, monotonic() - started)
+
+        for offset in range(0, len(duplicate_prices), self.delete_chunk_size):
+            with self._unit_of_work as uow:
+                uow.bookprice_repository.delete_prices(
+                    [price_id for price_id, _, _ in duplicate_prices[offset:offset + self.delete_chunk_size]])
+
+        book_ids_and_bookstore_ids = {(book_id, bookstore_id) for _, book_id, bookstore_id in duplicate_prices}
+        updated_book_ids = {book_id for book_id, _ in book_ids_and_bookstore_ids}
+        with self._unit_of_work as uow:
+            uow.bookstore_latest_price_repository.refresh_for_books(updated_book_ids)
+
+        self._cache_key_remover.remove_keys_for_books(updated_book_ids)
+        self._cache_key_remover.remove_keys_for_books_and_bookstores(book_ids_and_bookstore_ids)
+
+        return TrimResult(len(duplicate_prices), monotonic() - started)
+
     def get_prices_to_remove(
             self,
             prices: list[tuple[int, int, int, float, datetime]]) -> list[tuple[int, int, int, float, datetime]]:
@@ -1,12 +1,16 @@
 import logging
+from functools import cache
 
+from bookprices.job.job.backfill_price_intervals import BackfillPriceIntervalsJob
 from bookprices.job.job.base import DEFAULT_THREAD_COUNT
+from bookprices.job.job.book_price_partitions import ManageBookPricePartitionsJob
 from bookprices.job.job.book_search import SearchAllMissingBooksInBookStoresJob, SearchSelectedBooksInBookStoresJob
 from bookprices.job.job.delete_images import DeleteUnusedBookImagesJob, DeleteExcludedBookImagesJob
 from bookprices.job.job.delete_prices import DeletePricesJob
 from bookprices.job.job.delete_unavailable_books import DeleteUnavailableBooksJob
+from bookprices.job.job.downsample_prices import DownsamplePricesJob
 from bookprices.job.job.download_images import DownloadAllMissingImagesForBooksJob, DownloadSelectedImagesForBooksJob
-from bookprices.job.job.import_books import WilliamDamBookImportJob
+from bookprices.job.job.import_books import WilliamDamBookImportJob, WilliamDamIncrementalBookImportJob
 from bookprices.job.job.trim_prices import TrimAllPricesJob, TrimSelectedPricesJob
 from bookprices.job.job.update_currencies import UpdateCurrenciesJob
 from bookprices.job.job.update_prices import AllBookPricesUpdateJob, SelectedBookPricesUpdateJob
@@ -15,6 +19,7 @@ from bookprices.job.runner.service import RunnerJobService
 from bookprices.job.service.argument_service import JobRunArgumentService
 from bookprices.job.service.bookstore_search import BookStoreSearchService
 from bookprices.job.service.image_download import ImageDownloadService
+from bookprices.job.service.price_retention_service import PriceRetentionService, PriceRetentionPolicy
 from bookprices.job.service.price_update import PriceUpdateService
 from bookprices.job.db.session import JobSessionFactory
 from bookprices.job.service.trim_prices_service import TrimPricesService
@@ -25,16 +30,23 @@ from bookprices.shared.cache.key_remover import BookPriceKeyRemover
 from bookprices.shared.config import loader
 from bookprices.shared.config.config import Config
 from bookprices.shared.db.database import Database
+from bookprices.shared.db.pool import ConnectionPool
 from bookprices.shared.event.base import EventManager, Event
 from bookprices.shared.event.enum import BookPricesEvents
-from bookprices.shared.event.listener import StartJobListener
+from bookprices.shared.event.listener import StartJobListener, SearchIndexVersionListener
 from bookprices.shared.log import setup_logging
+from bookprices.shared.repository.bookprice_archive import BookPriceArchive
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.shared.service.currency_service import CurrencyService
 from bookprices.shared.service.job_service import JobService
 from bookprices.shared.service.scraper_service import BookStoreScraperService
+from bookprices.shared.webscraping.content import HtmlContent
 from bookprices.shared.webscraping.http import RateLimiter
 from bookprices.shared.webscraping.image import ImageDownloader
+from bookprices.shared.webscraping.parse_pool import parse_pool
+from bookprices.shared.webscraping.rate_limit import (
+    TokenBucketStore, TokenBucketStoreBackend, RedisTokenBucketStore, memory_token_bucket_store)
+from bookprices.shared.webscraping.validator_store import HttpValidatorStore, RedisHttpValidatorStore
 from bookprices.shared.service.book_image_file_service import BookImageFileService
 from bookprices.shared.db.data_session import SessionFactory
 
@@ -50,13 +62,20 @@ PROGRAM_NAME = "JobRunner"
 logger = logging.getLogger(PROGRAM_NAME)
 
 
+@cache
 def create_database_container(config: Config) -> Database:
+    """
+    The jobs share one database container, so the job runner has a single connection pool to report on.
+    Unless configured, the pool has a connection for each job thread.
+    """
+    thread_count = config.job_thread_count or DEFAULT_THREAD_COUNT
     return Database(
         config.database.db_host,
         config.database.db_port,
         config.database.db_user,
         config.database.db_password,
-        config.database.db_name)
+        config.database.db_name,
+        pool_size=config.db_pool_size or max(thread_count, ConnectionPool.default_pool_size))
 
 
 def create_data_session_factory(config: Config) -> SessionFactory:
@@ -71,6 +90,27 @@ def create_cache_key_remover(config: Config) -> BookPriceKeyRemover:
             config.cache.port))
 
 
+def create_http_validator_store(config: Config) -> HttpValidatorStore:
+    redis_client = RedisClient(
+        config.cache.host,
+        config.cache.database,
+        config.cache.port)
+
+    return RedisHttpValidatorStore(redis_client.redis)
+
+
+def create_token_bucket_store(config: Config) -> TokenBucketStore:
+    if config.rate_limiter_backend != TokenBucketStoreBackend.REDIS:
+        return memory_token_bucket_store
+
+    redis_client = RedisClient(
+        config.cache.host,
+        config.cache.database,
+        config.cache.port)
+
+    return RedisTokenBucketStore(redis_client.redis)
+
+
 def create_job_api_client(config: Config) -> JobApiClient:
     api_client = JobApiClient(
         config.job_api.base_url,
@@ -111,6 +151,10 @@ def setup_event_manager(config: Config) -> EventManager:
     book_deleted_event = Event(str(BookPricesEvents.BOOKS_DELETED))
     book_deleted_event.add_listener(StartJobListener(job_service, job_run_argument_service, DeleteUnusedBookImagesJob.name))
 
+    search_index_version_listener = SearchIndexVersionListener(create_cache_key_remover(config))
+    for event in (book_created_event, books_imported_event, book_deleted_event):
+        event.add_listener(search_index_version_listener)
+
     books_found_in_stores = Event(str(BookPricesEvents.BOOKSTORE_SEARCH_COMPLETED))
     books_found_in_stores.add_listener(
         StartJobListener(job_service, job_run_argument_service, DownloadSelectedImagesForBooksJob.name))
@@ -134,7 +178,8 @@ def create_bookstore_search_service(config: Config) -> BookStoreSearchService:
     session_factory = create_data_session_factory(config)
     cache_key_remover = create_cache_key_remover(config)
     unit_of_work = UnitOfWork(session_factory)
-    bookstore_scraper_service = BookStoreScraperService(unit_of_work)
+    bookstore_scraper_service = BookStoreScraperService(
+        unit_of_work, token_bucket_store=create_token_bucket_store(config))
     thread_count = config.job_thread_count or DEFAULT_THREAD_COUNT
 
     bookstore_search_service = BookStoreSearchService(
@@ -233,16 +278,43 @@ def create_delete_excluded_book_images_job(config: Config) -> DeleteExcludedBook
 
 def create_delete_prices_job(config: Config) -> DeletePricesJob:
     db = create_database_container(config)
+    unit_of_work = UnitOfWork(create_data_session_factory(config))
+    cache_key_remover = create_cache_key_remover(config)
+
+    return DeletePricesJob(config, db, unit_of_work, cache_key_remover)
+
+
+def create_backfill_price_intervals_job(config: Config) -> BackfillPriceIntervalsJob:
+    unit_of_work = UnitOfWork(create_data_session_factory(config))
     cache_key_remover = create_cache_key_remover(config)
 
-    return DeletePricesJob(config, db, cache_key_remover)
+    archive = BookPriceArchive(config.price_archive_dir) if config.price_archive_dir else None
+
+    return BackfillPriceIntervalsJob(config, unit_of_work, cache_key_remover, archive)
+
+
+def create_manage_book_price_partitions_job(config: Config) -> ManageBookPricePartitionsJob:
+    unit_of_work = UnitOfWork(create_data_session_factory(config))
+
+    return ManageBookPricePartitionsJob(config, unit_of_work)
+
+
+def create_downsample_prices_job(config: Config) -> DownsamplePricesJob:
+    unit_of_work = UnitOfWork(create_data_session_factory(config))
+    cache_key_remover = create_cache_key_remover(config)
+    retention_policy = PriceRetentionPolicy.parse(
+        config.price_retention_tiers or PriceRetentionPolicy.default_tiers)
+    price_retention_service = PriceRetentionService(unit_of_work, cache_key_remover, retention_policy)
+
+    return DownsamplePricesJob(config, unit_of_work, price_retention_service)
 
 
 def create_all_book_prices_update_job(config: Config, event_manager: EventManager) -> AllBookPricesUpdateJob:
     session_factory = create_data_session_factory(config)
     cache_key_remover = create_cache_key_remover(config)
     unit_of_work = UnitOfWork(session_factory)
-    scraper_service = BookStoreScraperService(unit_of_work)
+    scraper_service = BookStoreScraperService(
+        unit_of_work, create_http_validator_store(config), create_token_bucket_store(config))
     thread_count = config.job_thread_count or DEFAULT_THREAD_COUNT
     price_update_service = PriceUpdateService(cache_key_remover, unit_of_work, scraper_service, thread_count)
 
@@ -254,7 +326,8 @@ def create_selected_book_prices_update_job(config: Config, event_manager: EventM
     session_factory = create_data_session_factory(config)
     cache_key_remover = create_cache_key_remover(config)
     unit_of_work = UnitOfWork(session_factory)
-    scraper_service = BookStoreScraperService(unit_of_work)
+    scraper_service = BookStoreScraperService(
+        unit_of_work, create_http_validator_store(config), create_token_bucket_store(config))
     thread_count = config.job_thread_count or DEFAULT_THREAD_COUNT
     price_update_service = PriceUpdateService(
         cache_key_remover, unit_of_work, scraper_service, thread_count)
@@ -269,6 +342,14 @@ def create_william_dam_book_import_job(config: Config, event_manager: EventManag
     return WilliamDamBookImportJob(config, unit_of_work, cache_key_remover, event_manager)
 
 
+def create_william_dam_incremental_book_import_job(
+        config: Config, event_manager: EventManager) -> WilliamDamIncrementalBookImportJob:
+    unit_of_work = UnitOfWork(create_data_session_factory(config))
+    cache_key_remover = create_cache_key_remover(config)
+
+    return WilliamDamIncrementalBookImportJob(config, unit_of_work, cache_key_remover, event_manager)
+
+
 def create_update_currencies_job(config: Config) -> UpdateCurrenciesJob:
     session_factory = create_data_session_factory(config)
     unit_of_work = UnitOfWork(session_factory)
@@ -282,6 +363,10 @@ def main() -> None:
         config = loader.load_from_env()
         setup_logging(config, PROGRAM_NAME)
         logging.info("Config loaded successfully. Logging setup.")
+        logging.info(f"Parsing HTML with {HtmlContent.set_default_parser_backend(config.html_parser)}")
+        if config.html_parse_processes is not None:
+            # 0 starts one process per CPU core
+            parse_pool.start(config.html_parse_processes or None)
 
         logging.info("Setting up required services and job instances...")
         event_manager = setup_event_manager(config)
@@ -296,14 +381,18 @@ def main() -> None:
             create_delete_unused_book_images_job(config),
             create_delete_excluded_book_images_job(config),
             create_delete_prices_job(config),
+            create_backfill_price_intervals_job(config),
+            create_downsample_prices_job(config),
+            create_manage_book_price_partitions_job(config),
             create_all_book_prices_update_job(config, event_manager),
             create_selected_book_prices_update_job(config, event_manager),
             create_william_dam_book_import_job(config, event_manager),
+            create_william_dam_incremental_book_import_job(config, event_manager),
             create_update_currencies_job(config),
             create_selected_missing_books_search_job(config, event_manager),
             create_all_missing_books_search_job(config, event_manager)
         ]
-        job_runner = JobRunner(config, jobs, service)
+        job_runner = JobRunner(config, jobs, service, create_database_container(config).connection_pool)
         job_runner.start()
     except Exception as ex:
         logger.exception("Unexpected error occurred while running the job runner.")
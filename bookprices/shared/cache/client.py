@@ -8,6 +8,9 @@ class CacheClient:
     def delete_keys(self, keys: list[str]) -> None:
         raise NotImplementedError
 
+    def increment_key(self, key: str) -> None:
+        raise NotImplementedError
+
 
 class RedisClient(CacheClient):
     def __init__(self, host, db: int, port: int):
@@ -18,3 +21,6 @@ class RedisClient(CacheClient):
 
     def delete_keys(self, keys: list[str]) -> None:
         self.redis.delete(*keys)
+
+    def increment_key(self, key: str) -> None:
+        self.redis.incr(key)
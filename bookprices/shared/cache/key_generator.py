@@ -10,6 +10,10 @@ def get_authors_key() -> str:
     return "authors"
 
 
+def get_search_index_version_key() -> str:
+    return "search_index_version"
+
+
 def get_bookstores_key() -> str:
     return "bookstores"
 
@@ -39,8 +43,9 @@ def get_prices_for_book_key(book_id: int) -> str:
 
 
 def get_book_list_key(search_query: SearchQuery) -> str:
-    return md5(f"book_list_{search_query.page}_{search_query.search_phrase}_{search_query.author}_"
-               f"{search_query.sort_in_descending_order}_{search_query.sort_option.name}".encode()).hexdigest()
+    return md5(f"book_list_{search_query.page}_{search_query.page_size}_{search_query.search_phrase}_"
+               f"{search_query.author}_{search_query.sort_in_descending_order}_{search_query.sort_option.name}_"
+               f"{search_query.after}".encode()).hexdigest()
 
 
 def get_user_key(user_id: str) -> str:
@@ -72,6 +77,10 @@ def get_job_run_statistics_key(date_from: datetime) -> str:
     return f"job_run_stats_{date_from_str}"
 
 
+def get_request_rates_key() -> str:
+    return "request_rates"
+
+
 def get_booklists_for_user_key(user_id: str) -> str:
     return f"booklists_{user_id}"
 
@@ -1,4 +1,4 @@
-from typing import ClassVar
+from typing import ClassVar, Iterable
 from bookprices.shared.cache.client import CacheClient
 from bookprices.shared.cache import key_generator
 
@@ -24,9 +24,36 @@ class BookPriceKeyRemover:
         ]
         self._cache.delete_keys(keys)
 
+    def remove_keys_for_books(self, book_ids: Iterable[int]) -> None:
+        """ Removes the keys for many books with a single delete. """
+        keys = [
+            self._add_key_prefix(key)
+            for book_id in book_ids
+            for key in (key_generator.get_book_key(book_id),
+                        key_generator.get_book_latest_prices_key(book_id),
+                        key_generator.get_prices_for_book_key(book_id))
+        ]
+        if keys:
+            self._cache.delete_keys(keys)
+
+    def remove_keys_for_books_and_bookstores(self, book_ids_and_bookstore_ids: Iterable[tuple[int, int]]) -> None:
+        """ Removes the keys for many books in book stores with a single delete. """
+        keys = [
+            self._add_key_prefix(key)
+            for book_id, bookstore_id in book_ids_and_bookstore_ids
+            for key in (key_generator.get_prices_for_book_in_bookstore_key(book_id, bookstore_id),
+                        key_generator.get_book_in_book_store_key(book_id, bookstore_id))
+        ]
+        if keys:
+            self._cache.delete_keys(keys)
+
     def remove_key_for_authors(self) -> None:
         key = self._add_key_prefix(key_generator.get_authors_key())
         self._cache.delete_key(key)
 
+    def increment_search_index_version(self) -> None:
+        key = self._add_key_prefix(key_generator.get_search_index_version_key())
+        self._cache.increment_key(key)
+
     def _add_key_prefix(self, key: str) -> str:
         return f"{self._cache_key_prefix}{key}"
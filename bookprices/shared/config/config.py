@@ -33,3 +33,9 @@ class Config:
     imgdir: str
     loglevel: str
     job_thread_count: int | None = None
+    price_retention_tiers: str | None = None
+    html_parser: str | None = None
+    html_parse_processes: int | None = None
+    rate_limiter_backend: str | None = None
+    price_archive_dir: str | None = None
+    db_pool_size: int | None = None
@@ -28,7 +28,13 @@ def load_from_env() -> Config:
                   os.environ["LOG_DIR"],
                   os.getenv("IMAGE_DIR"),
                   os.getenv("LOG_LEVEL", "INFO"),
-                  int(thread_count) if (thread_count := os.getenv("JOB_THREAD_COUNT")) else None)
+                  int(thread_count) if (thread_count := os.getenv("JOB_THREAD_COUNT")) else None,
+                  os.getenv("PRICE_RETENTION_TIERS"),
+                  os.getenv("HTML_PARSER"),
+                  int(process_count) if (process_count := os.getenv("HTML_PARSE_PROCESSES")) else None,
+                  os.getenv("RATE_LIMITER_BACKEND"),
+                  os.getenv("PRICE_ARCHIVE_DIR"),
+                  int(pool_size) if (pool_size := os.getenv("MYSQL_POOL_SIZE")) else None)
 
 
 def load_from_file(file: str) -> Config:
@@ -50,4 +56,6 @@ def load_from_file(file: str) -> Config:
                          job_api_section.get("api_password", "")),
                   json_content["logdir"],
                   json_content["imgdir"],
-                  json_content["loglevel"])
+                  json_content["loglevel"],
+                  price_archive_dir=json_content.get("price_archive_dir"),
+                  db_pool_size=database_section.get("pool_size"))
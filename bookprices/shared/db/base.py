@@ -1,21 +1,26 @@
-from mysql.connector import connection
+from bookprices.shared.db.pool import ConnectionPool, PooledConnection
 from bookprices.shared.model.bookstore import BookStore
 
 
 class BaseDb:
-    def __init__(self, db_host: str, db_port: str, db_user: str, db_password: str, db_name: str):
+    def __init__(
+            self,
+            db_host: str,
+            db_port: str,
+            db_user: str,
+            db_password: str,
+            db_name: str,
+            connection_pool: ConnectionPool | None = None):
         self.db_host = db_host
-        self.db_port = db_port,
+        self.db_port = db_port
         self.db_user = db_user
         self.db_password = db_password
         self.db_name = db_name
+        self.connection_pool = connection_pool or ConnectionPool.for_mysql(
+            db_host, db_port, db_user, db_password, db_name)
 
-    def get_connection(self) -> connection:
-        con = connection.MySQLConnection(host=self.db_host,
-                                         user=self.db_user,
-                                         password=self.db_password,
-                                         database=self.db_name)
-        return con
+    def get_connection(self) -> PooledConnection:
+        return self.connection_pool.get_connection()
 
     def get_book_store(self, book_store_id: int) -> BookStore:
         with self.get_connection() as con:
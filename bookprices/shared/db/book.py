@@ -1,6 +1,7 @@
+import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional
 from enum import Enum
 from bookprices.shared.db.base import BaseDb
 from bookprices.shared.model.book import Book
@@ -11,6 +12,7 @@ class BookSearchSortOption(Enum):
     Title = "Title"
     Created = "Created"
     PriceUpdated = "PriceUpdated"
+    Relevance = "Relevance"
 
     @staticmethod
     def from_str(value: Optional[str]) -> Optional["BookSearchSortOption"]:
@@ -22,6 +24,16 @@ class BookSearchSortOption(Enum):
             return None
 
 
+@dataclass(frozen=True)
+class SearchCursor:
+    """
+    Position of the last book on a search result page. Used for seeking to the next page instead of skipping rows
+    with OFFSET. sort_value is the value of the sort column for the book (unused when sorting by PriceUpdated).
+    """
+    book_id: int
+    sort_value: str | datetime | None = None
+
+
 @dataclass(frozen=True)
 class SearchQuery:
     search_phrase: str
@@ -30,6 +42,7 @@ class SearchQuery:
     page_size: int
     sort_option: BookSearchSortOption
     sort_in_descending_order: bool
+    after: Optional[SearchCursor] = None
 
     def clone(self,
               search_phrase: Optional[str] = None,
@@ -37,7 +50,8 @@ class SearchQuery:
               page: Optional[int] = None,
               page_size: Optional[int] = None,
               sort_option: Optional[BookSearchSortOption] = None,
-              sort_in_descending_order: Optional[bool] = None):
+              sort_in_descending_order: Optional[bool] = None,
+              after: Optional[SearchCursor] = None):
 
         return SearchQuery(
             search_phrase=search_phrase if search_phrase else self.search_phrase,
@@ -45,10 +59,13 @@ class SearchQuery:
             page=page if page else self.page,
             page_size=page_size if page_size else self.page_size,
             sort_option=sort_option if sort_option else self.sort_option,
-            sort_in_descending_order=sort_in_descending_order if sort_in_descending_order else self.sort_in_descending_order)
+            sort_in_descending_order=sort_in_descending_order if sort_in_descending_order else self.sort_in_descending_order,
+            after=after if after else self.after)
 
 
 class BookDb(BaseDb):
+    full_text_ngram_size: ClassVar[int] = 2
+
     def create_book(self, book: Book) -> int:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
@@ -77,10 +94,24 @@ class BookDb(BaseDb):
     def delete_book(self, book_id: int) -> None:
         with self.get_connection() as con:
             with con.cursor() as cursor:
+                # BookPrice is partitioned and can't cascade deletes from Book
+                cursor.execute("DELETE FROM BookPrice WHERE BookId = %s;", (book_id,))
                 query = "DELETE FROM Book WHERE Id = %s;"
                 cursor.execute(query, (book_id,))
                 con.commit()
 
+    def get_titles_and_authors(self) -> list[tuple[str, str]]:
+        with self.get_connection() as con:
+            with con.cursor(dictionary=True) as cursor:
+                query = ("SELECT DISTINCT Title, Author "
+                         "FROM Book;")
+                cursor.execute(query)
+                titles_and_authors = []
+                for row in cursor:
+                    titles_and_authors.append((row["Title"], row["Author"]))
+
+                return titles_and_authors
+
     def get_books(self) -> list[Book]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
@@ -112,15 +143,15 @@ class BookDb(BaseDb):
 
                 return image_urls
 
-    def get_book_ids_with_no_image(self, offset: int, limit: int) -> list[int]:
+    def get_book_ids_with_no_image(self, after_id: int, limit: int) -> list[int]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
                 query = ("SELECT Id "
                          "FROM Book "
-                         "WHERE ImageUrl IS NULL "
+                         "WHERE ImageUrl IS NULL AND Id > %s "
                          "ORDER BY Id ASC "
-                         "LIMIT %s OFFSET %s;")
-                cursor.execute(query, (limit, offset))
+                         "LIMIT %s;")
+                cursor.execute(query, (after_id, limit))
 
                 return [row["Id"] for row in cursor]
 
@@ -146,41 +177,61 @@ class BookDb(BaseDb):
 
                 return books
 
-    def get_next_book_ids(self, offset: int, limit: int) -> set[int]:
+    def get_next_book_ids(self, after_id: int, limit: int) -> set[int]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
                 query = ("SELECT Id "
                          "FROM Book "
+                         "WHERE Id > %s "
                          "ORDER BY Id "
-                         "LIMIT %s OFFSET %s;")
+                         "LIMIT %s;")
 
-                cursor.execute(query, (limit, offset))
+                cursor.execute(query, (after_id, limit))
                 book_ids = set()
                 for row in cursor:
                     book_ids.add(row["Id"])
 
                 return book_ids
 
-    def search_books(self, search_query: SearchQuery) -> list[Book]:
+    def search_books(self, search_query: SearchQuery, full_text: bool = False) -> list[Book]:
+        """
+        Searches by prefix of title or author or exact ISBN. With full_text, the FULLTEXT (ngram) index on Title
+        and Author is used instead, which matches words anywhere in the title or author and supports sorting
+        by relevance.
+        """
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
-                phrase_with_wildcards = f"{search_query.search_phrase}%"
-                parameters = [phrase_with_wildcards,
-                              phrase_with_wildcards,
-                              search_query.search_phrase]
-                query = ("SELECT Id, Isbn, Title, Author, Format, ImageUrl, Created "
+                search_condition, parameters = self._create_search_condition(search_query, "", full_text)
+                use_relevance = (full_text and search_query.sort_option == BookSearchSortOption.Relevance
+                                 and self._is_full_text_search(search_query.search_phrase)
+                                 and self._create_full_text_query(search_query.search_phrase))
+                score_column = ", MATCH(Title, Author) AGAINST(%s IN BOOLEAN MODE) AS Score" if use_relevance else ""
+                if use_relevance:
+                    parameters.insert(0, self._create_full_text_query(search_query.search_phrase))
+
+                query = ("SELECT Id, Isbn, Title, Author, Format, ImageUrl, Created" + score_column + " "
                          "FROM Book "
-                         "WHERE (Title LIKE %s OR Author LIKE %s OR Isbn = %s) ")
-                if search_query.author:
-                    query += "AND Author = %s "
-                    parameters.append(search_query.author)
-
-                query += f"ORDER BY {search_query.sort_option.name} "
-                query += "DESC " if search_query.sort_in_descending_order else "ASC "
-                query += "LIMIT %s OFFSET %s;"
+                         f"WHERE {search_condition} ")
+
+                if use_relevance:
+                    query += "ORDER BY Score DESC, Id ASC "
+                    query += "LIMIT %s OFFSET %s;"
+                    parameters.extend(
+                        [search_query.page_size, (search_query.page - 1) * search_query.page_size])
+                else:
+                    sort_column = self._get_sort_column(search_query.sort_option)
+                    if search_query.after:
+                        comparison = "<" if search_query.sort_in_descending_order else ">"
+                        query += f"AND ({sort_column} {comparison} %s OR ({sort_column} = %s AND Id {comparison} %s)) "
+                        parameters.extend(
+                            [search_query.after.sort_value, search_query.after.sort_value, search_query.after.book_id])
+
+                    direction = "DESC" if search_query.sort_in_descending_order else "ASC"
+                    query += f"ORDER BY {sort_column} {direction}, Id {direction} "
+                    limit_clause, limit_parameters = self._create_limit_clause(search_query)
+                    query += limit_clause
+                    parameters.extend(limit_parameters)
 
-                parameters.append(search_query.page_size)
-                parameters.append((search_query.page - 1) * search_query.page_size)
                 cursor.execute(query, parameters)
                 books = []
                 for row in cursor:
@@ -195,29 +246,28 @@ class BookDb(BaseDb):
 
                 return books
 
-    def search_books_with_newest_prices(self, search_query: SearchQuery) -> list[Book]:
+    def search_books_with_newest_prices(self, search_query: SearchQuery, full_text: bool = False) -> list[Book]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
-                phrase_with_wildcards = f"{search_query.search_phrase}%"
+                search_condition, parameters = self._create_search_condition(search_query, "b.", full_text)
                 query = ("WITH LatestUpdatedBook AS ( "
-                         "SELECT bp.BookId, MAX(bp.Id) AS NewestPriceId "
-                         "FROM BookPrice bp "
-                         "GROUP BY bp.BookId) "
+                         "SELECT lp.BookId, MAX(lp.BookPriceId) AS NewestPriceId "
+                         "FROM BookStoreLatestPrice lp "
+                         "GROUP BY lp.BookId) "
 
                          "SELECT b.Id, b.Isbn, b.Title, b.Author, b.Format, b.ImageUrl, b.Created "
                          "FROM Book b "
                          "INNER JOIN LatestUpdatedBook lpu ON b.Id = lpu.BookId "
-                         "WHERE (b.Title LIKE %s OR b.Author LIKE %s OR b.Isbn = %s) ")
+                         f"WHERE {search_condition} ")
 
-                parameters = [phrase_with_wildcards, phrase_with_wildcards, search_query.search_phrase]
+                if search_query.after:
+                    query += "AND lpu.NewestPriceId < (SELECT MAX(BookPriceId) FROM BookStoreLatestPrice WHERE BookId = %s) "
+                    parameters.append(search_query.after.book_id)
 
-                if search_query.author:
-                    query += "AND b.Author = %s "
-                    parameters.append(search_query.author)
-
-                query += ("ORDER BY lpu.NewestPriceId DESC "
-                          "LIMIT %s OFFSET %s;")
-                parameters.extend([search_query.page_size, (search_query.page - 1) * search_query.page_size])
+                query += "ORDER BY lpu.NewestPriceId DESC "
+                limit_clause, limit_parameters = self._create_limit_clause(search_query)
+                query += limit_clause
+                parameters.extend(limit_parameters)
 
                 cursor.execute(query, parameters)
                 books = []
@@ -233,6 +283,73 @@ class BookDb(BaseDb):
 
                 return books
 
+    @classmethod
+    def _create_search_condition(
+            cls, search_query: SearchQuery, column_prefix: str, full_text: bool) -> tuple[str, list]:
+        phrase = search_query.search_phrase
+        if not full_text:
+            phrase_with_wildcards = f"{phrase}%"
+            condition = f"({column_prefix}Title LIKE %s OR {column_prefix}Author LIKE %s OR {column_prefix}Isbn = %s)"
+            parameters = [phrase_with_wildcards, phrase_with_wildcards, phrase]
+        elif cls._is_full_text_search(phrase):
+            condition, parameters = cls._create_full_text_condition(
+                phrase, [f"{column_prefix}Title", f"{column_prefix}Author"])
+        elif phrase:
+            condition = f"{column_prefix}Isbn LIKE %s"
+            parameters = [f"{phrase.replace('-', '')}%"]
+        else:
+            condition, parameters = "1 = 1", []
+
+        if search_query.author:
+            condition += f" AND {column_prefix}Author = %s"
+            parameters.append(search_query.author)
+
+        return condition, parameters
+
+    @staticmethod
+    def _is_full_text_search(search_phrase: str) -> bool:
+        """ Searches for ISBNs (digits and dashes only) use the ISBN index instead of the full-text index. """
+        return bool(re.search(r"\w", search_phrase)) and not re.fullmatch(r"[\d\-\s]+", search_phrase)
+
+    @classmethod
+    def _create_full_text_condition(cls, search_phrase: str, columns: list[str]) -> tuple[str, list]:
+        """
+        Requires all words in the phrase in one of the columns. Words shorter than the ngram size aren't in the
+        FULLTEXT index, so they are matched anywhere with LIKE instead.
+        """
+        conditions, parameters = [], []
+        if full_text_query := cls._create_full_text_query(search_phrase):
+            conditions.append(f"MATCH({', '.join(columns)}) AGAINST(%s IN BOOLEAN MODE)")
+            parameters.append(full_text_query)
+        for word in cls._get_words(search_phrase):
+            if len(word) < cls.full_text_ngram_size:
+                escaped_word = word.replace("_", r"\_")
+                conditions.append(f"({' OR '.join(f'{column} LIKE %s' for column in columns)})")
+                parameters.extend([f"%{escaped_word}%"] * len(columns))
+
+        return " AND ".join(conditions), parameters
+
+    @classmethod
+    def _create_full_text_query(cls, search_phrase: str) -> str:
+        """ Requires all words in the phrase. Each word is quoted, so the ngram parser matches it anywhere. """
+        return " ".join(f'+"{word}"' for word in cls._get_words(search_phrase)
+                        if len(word) >= cls.full_text_ngram_size)
+
+    @staticmethod
+    def _get_words(search_phrase: str) -> list[str]:
+        return re.findall(r"\w+", search_phrase)
+
+    @staticmethod
+    def _get_sort_column(sort_option: BookSearchSortOption) -> str:
+        return BookSearchSortOption.Title.name if sort_option == BookSearchSortOption.Relevance else sort_option.name
+
+    @staticmethod
+    def _create_limit_clause(search_query: SearchQuery) -> tuple[str, list[int]]:
+        if search_query.after:
+            return "LIMIT %s;", [search_query.page_size]
+
+        return "LIMIT %s OFFSET %s;", [search_query.page_size, (search_query.page - 1) * search_query.page_size]
+
     def get_book(self, book_id: int) -> Book:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
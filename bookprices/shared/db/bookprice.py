@@ -2,7 +2,7 @@ from collections import defaultdict
 from datetime import date
 from bookprices.shared.db.base import BaseDb
 from bookprices.shared.model.book import Book
-from bookprices.shared.model.bookprice import BookPrice, BookPriceIds
+from bookprices.shared.model.bookprice import BookPrice, BookPriceIds, BookPriceInterval
 from bookprices.shared.model.bookstore import BookStore, BookStoreBookPrice
 from bookprices.shared.model.error import FailedPriceUpdate, FailedUpdateReason, FailedPriceUpdateCount
 
@@ -21,9 +21,14 @@ class BookPriceDb(BaseDb):
     def get_prices_older_than(self, earliest_date: date) -> list[BookPriceIds]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
-                query = ("SELECT Id, BookId, BookStoreId "
-                         "FROM BookPrice "
-                         "WHERE Created < %s")
+                # The newest price of each book in each book store is kept, however old, as an unchanged price
+                # is only saved once. Without it, the book would have no price.
+                query = ("SELECT bp.Id, bp.BookId, bp.BookStoreId "
+                         "FROM BookPrice bp "
+                         "WHERE bp.Created < %s "
+                         "AND EXISTS (SELECT 1 FROM BookPrice newer "
+                         "WHERE newer.BookId = bp.BookId AND newer.BookStoreId = bp.BookStoreId "
+                         "AND newer.Id > bp.Id)")
                 cursor.execute(query, (str(earliest_date),))
                 prices = [BookPriceIds(row["Id"], row["BookId"], row["BookStoreId"]) for row in cursor]
 
@@ -40,23 +45,16 @@ class BookPriceDb(BaseDb):
     def get_latest_prices(self, book_id: int) -> list[BookStoreBookPrice]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
-                query = ("With LatestPrice as ( "
-                         "SELECT MAX(bp.Id) as Id "
-                         "FROM BookPrice bp "
-                         "WHERE bp.BookId = %s "
-                         "GROUP BY bp.BookStoreId ) "
-                         " "
-                         "SELECT bp.Id, bsb.BookStoreId, bs.Name as BookStoreName, CONCAT(bs.Url, bsb.Url) as Url, "
-                         "bp.Price, bp.Created "
+                query = ("SELECT lp.BookPriceId as Id, bsb.BookStoreId, bs.Name as BookStoreName, "
+                         "CONCAT(bs.Url, bsb.Url) as Url, lp.Price, lp.Created "
                          "FROM BookStoreBook bsb "
                          "INNER JOIN BookStore bs ON bs.Id = bsb.BookStoreId "
-                         "LEFT OUTER JOIN BookPrice bp "
-                         "INNER JOIN LatestPrice lp ON bp.Id = lp.Id "
-                         "ON bp.BookId = bsb.BookId AND bp.BookStoreId = bsb.BookStoreId "
+                         "LEFT OUTER JOIN BookStoreLatestPrice lp "
+                         "ON lp.BookId = bsb.BookId AND lp.BookStoreId = bsb.BookStoreId "
                          "WHERE bsb.BookId = %s "
-                         "ORDER BY bp.Price ASC;")
+                         "ORDER BY lp.Price ASC;")
 
-                cursor.execute(query, (book_id, book_id))
+                cursor.execute(query, (book_id,))
 
                 latest_prices_for_book = []
                 for row in cursor:
@@ -71,58 +69,52 @@ class BookPriceDb(BaseDb):
     def get_book_prices_for_store(self, book: Book, book_store: BookStore) -> list[BookPrice]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
-                query = ("With LatestPrices as ( "
-                         "SELECT MAX(Id) as Id "
-                         "FROM BookPrice bp "
-                         "WHERE bp.BookId = %s AND bp.BookStoreId = %s "
-                         "GROUP BY DATE(Created))"
-                         " "
-                         "SELECT bp.Id, bp.Price, DATE(bp.Created) as Created "
-                         "FROM BookPrice bp "
-                         "INNER JOIN LatestPrices lp ON bp.Id = lp.Id "
-                         "ORDER BY Created DESC;")
+                query = ("SELECT i.Id, i.BookStoreId, i.Price, i.ValidFrom, i.ValidTo, bsb.LastChecked "
+                         "FROM BookPriceInterval i "
+                         "LEFT JOIN BookStoreBook bsb ON bsb.BookId = i.BookId AND bsb.BookStoreId = i.BookStoreId "
+                         "WHERE i.BookId = %s AND i.BookStoreId = %s "
+                         "ORDER BY i.ValidFrom DESC;")
 
                 cursor.execute(query, (book.id, book_store.id))
 
                 book_prices_for_store = []
                 for row in cursor:
-                    book_prices_for_store.append(BookPrice(row["Id"],
-                                                           book,
-                                                           book_store,
-                                                           row["Price"],
-                                                           row["Created"]))
+                    interval = self._map_price_interval(row)
+                    book_prices_for_store.extend(
+                        BookPrice(interval.id, book, book_store, price, day)
+                        for day, price in reversed(list(interval.iter_daily_prices(date.today()))))
                 return book_prices_for_store
 
     def get_all_book_prices(self, book: Book) -> dict[BookStore, list[BookPrice]]:
         with self.get_connection() as con:
             with con.cursor(dictionary=True) as cursor:
-                query = ("With LatestPrices as ( "
-                         "SELECT MAX(Id) as Id "
-                         "FROM BookPrice bp "
-                         "WHERE bp.BookId = %s "
-                         "GROUP BY DATE(Created), bp.BookStoreId)"
-                         " "
-                         "SELECT bp.Id, bp.BookStoreId, bp.Price, DATE(bp.Created) as Created "
-                         "FROM BookPrice bp "
-                         "INNER JOIN LatestPrices lp ON bp.Id = lp.Id "
-                         "ORDER BY Created DESC;")
+                query = ("SELECT i.Id, i.BookStoreId, i.Price, i.ValidFrom, i.ValidTo, bsb.LastChecked "
+                         "FROM BookPriceInterval i "
+                         "LEFT JOIN BookStoreBook bsb ON bsb.BookId = i.BookId AND bsb.BookStoreId = i.BookStoreId "
+                         "WHERE i.BookId = %s "
+                         "ORDER BY i.ValidFrom DESC;")
 
                 cursor.execute(query, (book.id,))
-                bookstores = {}
-                prices_by_bookstores: defaultdict[BookStore, list[BookPrice]] = defaultdict(list)
-                for row in cursor:
-                    bookstore_id = row["BookStoreId"]
-                    bookstore = bookstores.get(bookstore_id)
-                    if not bookstore:
-                        bookstore = self.get_book_store(bookstore_id)
-                        bookstores[bookstore_id] = bookstore
-
-                    prices_by_bookstores[bookstore].append(BookPrice(row["Id"],
-                                                                     book,
-                                                                     bookstore,
-                                                                     row["Price"],
-                                                                     row["Created"]))
-                return prices_by_bookstores
+                intervals = [self._map_price_interval(row) for row in cursor]
+
+        # The book stores are loaded after the connection is returned to the pool, so a call never holds two connections
+        bookstores = {}
+        prices_by_bookstores: defaultdict[BookStore, list[BookPrice]] = defaultdict(list)
+        for interval in intervals:
+            bookstore = bookstores.get(interval.book_store_id)
+            if not bookstore:
+                bookstore = self.get_book_store(interval.book_store_id)
+                bookstores[interval.book_store_id] = bookstore
+
+            prices_by_bookstores[bookstore].extend(
+                BookPrice(interval.id, book, bookstore, price, day)
+                for day, price in reversed(list(interval.iter_daily_prices(date.today()))))
+        return prices_by_bookstores
+
+    @staticmethod
+    def _map_price_interval(row: dict) -> BookPriceInterval:
+        return BookPriceInterval(
+            row["Id"], row["BookStoreId"], row["Price"], row["ValidFrom"], row["ValidTo"], row["LastChecked"])
 
     def get_failed_price_update_counts(self, min_count: int) -> list[FailedPriceUpdateCount]:
         with self.get_connection() as con:
@@ -20,8 +20,12 @@ class BookStoreDb(BaseDb):
                 return [self._map_bookstore(row) for row in cursor]
 
     def delete_book_from_bookstore(self, book_id: int, bookstore_id: int):
+        """ Also ends the current price interval, so the price history stops where the book left the book store. """
         with self.get_connection() as con:
             with con.cursor() as cursor:
+                close_interval_query = ("UPDATE BookPriceInterval SET ValidTo = NOW() "
+                                        "WHERE BookId = %s AND BookStoreId = %s AND ValidTo IS NULL")
+                cursor.execute(close_interval_query, (book_id, bookstore_id))
                 query = ("DELETE FROM BookStoreBook "
                          "WHERE BookId = %s AND BookStoreId = %s")
                 cursor.execute(query, (book_id, bookstore_id))
@@ -1,41 +1,62 @@
 from bookprices.shared.db.book import BookDb
 from bookprices.shared.db.bookstore import BookStoreDb
 from bookprices.shared.db.bookprice import BookPriceDb
+from bookprices.shared.db.pool import ConnectionPool
 from bookprices.shared.db.user import UserDb
 
 
 class Database:
-    def __init__(self, db_host: str, db_port: str, db_user: str, db_password: str, db_name: str):
+    def __init__(
+            self,
+            db_host: str,
+            db_port: str,
+            db_user: str,
+            db_password: str,
+            db_name: str,
+            pool_size: int | None = None,
+            pool_max_lifetime_seconds: int | None = None):
         self.db_host = db_host
         self.db_port = db_port
         self.db_user = db_user
         self.db_password = db_password
         self.db_name = db_name
+        self.connection_pool = ConnectionPool.for_mysql(
+            self.db_host,
+            self.db_port,
+            self.db_user,
+            self.db_password,
+            self.db_name,
+            pool_size=pool_size,
+            max_lifetime_seconds=pool_max_lifetime_seconds)
 
         self.book_db = BookDb(
             self.db_host,
             self.db_port,
             self.db_user,
             self.db_password,
-            self.db_name)
+            self.db_name,
+            self.connection_pool)
 
         self.bookstore_db = BookStoreDb(
             self.db_host,
             self.db_port,
             self.db_user,
             self.db_password,
-            self.db_name)
+            self.db_name,
+            self.connection_pool)
 
         self.bookprice_db = BookPriceDb(
             self.db_host,
             self.db_port,
             self.db_user,
             self.db_password,
-            self.db_name)
+            self.db_name,
+            self.connection_pool)
 
         self.user_db = UserDb(
             self.db_host,
             self.db_port,
             self.db_user,
             self.db_password,
-            self.db_name)
\ No newline at end of file
+            self.db_name,
+            self.connection_pool)
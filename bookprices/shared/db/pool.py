@@ -0,0 +1,232 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition
+from time import monotonic
+from typing import Callable, ClassVar, Any
+
+from mysql.connector import connection, Error as MySqlError
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class PoolStatistics:
+    pool_size: int
+    open_connections: int
+    idle_connections: int
+    connections_created: int
+    connections_recycled: int
+    acquisitions: int
+    timeouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+    @property
+    def average_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+
+
+@dataclass
+class _PooledConnectionEntry:
+    connection: Any
+    created: float
+    last_used: float
+
+
+class PooledConnection:
+    """ Connection borrowed from a ConnectionPool. Returned to the pool on close() or when leaving a with-block. """
+
+    def __init__(self, pool: "ConnectionPool", entry: _PooledConnectionEntry) -> None:
+        self._pool = pool
+        self._entry = entry
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry.connection, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._entry)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of MySQL connections.
+    Connections are created lazily, checked before reuse if they have been idle for a while and replaced when
+    they exceed the max lifetime.
+    """
+    default_pool_size: ClassVar[int] = 8
+    default_max_lifetime_seconds: ClassVar[int] = 60 * 30
+    default_health_check_interval_seconds: ClassVar[int] = 30
+    default_acquire_timeout_seconds: ClassVar[int] = 10
+    _slow_acquire_log_threshold_seconds: ClassVar[float] = 0.5
+
+    def __init__(
+            self,
+            connection_factory: Callable[[], Any],
+            pool_size: int | None = None,
+            max_lifetime_seconds: int | None = None,
+            health_check_interval_seconds: int | None = None,
+            acquire_timeout_seconds: int | None = None) -> None:
+        self._connection_factory = connection_factory
+        self._pool_size = pool_size or self.default_pool_size
+        self._max_lifetime_seconds = max_lifetime_seconds or self.default_max_lifetime_seconds
+        self._health_check_interval_seconds = (
+            health_check_interval_seconds if health_check_interval_seconds is not None
+            else self.default_health_check_interval_seconds)
+        self._acquire_timeout_seconds = acquire_timeout_seconds or self.default_acquire_timeout_seconds
+        self._idle_connections: deque[_PooledConnectionEntry] = deque()
+        self._open_connection_count = 0
+        self._condition = Condition()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self._connections_created = 0
+        self._connections_recycled = 0
+        self._acquisitions = 0
+        self._timeouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    @classmethod
+    def for_mysql(
+            cls,
+            db_host: str,
+            db_port: str | int | None,
+            db_user: str,
+            db_password: str,
+            db_name: str,
+            **pool_options) -> "ConnectionPool":
+        connection_arguments = {
+            "host": db_host,
+            "user": db_user,
+            "password": db_password,
+            "database": db_name
+        }
+        if db_port:
+            connection_arguments["port"] = int(db_port)
+
+        return cls(lambda: connection.MySQLConnection(**connection_arguments), **pool_options)
+
+    def get_connection(self) -> PooledConnection:
+        started = monotonic()
+        entry = self._acquire(started)
+        waited = monotonic() - started
+        self._record_wait(waited)
+        if waited >= self._slow_acquire_log_threshold_seconds:
+            self._logger.warning(f"Waited {waited:.3f} seconds for a database connection")
+
+        return PooledConnection(self, entry)
+
+    def release(self, entry: _PooledConnectionEntry) -> None:
+        try:
+            # Ends the implicit transaction, so the next borrower doesn't read from a stale snapshot
+            entry.connection.rollback()
+            entry.last_used = monotonic()
+        except MySqlError as ex:
+            self._logger.warning(f"Discarding connection that failed on release: {ex}")
+            self._discard(entry)
+            return
+
+        with self._condition:
+            self._idle_connections.append(entry)
+            self._condition.notify()
+
+    def close_all(self) -> None:
+        with self._condition:
+            while self._idle_connections:
+                self._close_quietly(self._idle_connections.popleft())
+                self._open_connection_count -= 1
+
+    def get_statistics(self) -> PoolStatistics:
+        with self._condition:
+            return PoolStatistics(
+                pool_size=self._pool_size,
+                open_connections=self._open_connection_count,
+                idle_connections=len(self._idle_connections),
+                connections_created=self._connections_created,
+                connections_recycled=self._connections_recycled,
+                acquisitions=self._acquisitions,
+                timeouts=self._timeouts,
+                total_wait_seconds=self._total_wait_seconds,
+                max_wait_seconds=self._max_wait_seconds)
+
+    def _acquire(self, started: float) -> _PooledConnectionEntry:
+        deadline = started + self._acquire_timeout_seconds
+        while True:
+            with self._condition:
+                entry = None
+                while entry is None:
+                    if self._idle_connections:
+                        entry = self._idle_connections.pop()
+                    elif self._open_connection_count < self._pool_size:
+                        self._open_connection_count += 1
+                        break
+                    elif not self._condition.wait(timeout=deadline - monotonic()):
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available within {self._acquire_timeout_seconds} seconds")
+
+            if entry is None:
+                return self._create_entry()
+            if self._is_usable(entry):
+                return entry
+
+            with self._condition:
+                self._connections_recycled += 1
+            self._discard(entry)
+
+    def _create_entry(self) -> _PooledConnectionEntry:
+        try:
+            new_connection = self._connection_factory()
+        except Exception:
+            with self._condition:
+                self._open_connection_count -= 1
+                self._condition.notify()
+            raise
+
+        now = monotonic()
+        with self._condition:
+            self._connections_created += 1
+
+        return _PooledConnectionEntry(connection=new_connection, created=now, last_used=now)
+
+    def _is_usable(self, entry: _PooledConnectionEntry) -> bool:
+        now = monotonic()
+        if now - entry.created >= self._max_lifetime_seconds:
+            self._logger.debug("Recycling connection that exceeded max lifetime")
+            return False
+        if now - entry.last_used < self._health_check_interval_seconds:
+            return True
+        try:
+            return entry.connection.is_connected()
+        except MySqlError:
+            return False
+
+    def _discard(self, entry: _PooledConnectionEntry) -> None:
+        self._close_quietly(entry)
+        with self._condition:
+            self._open_connection_count -= 1
+            self._condition.notify()
+
+    def _record_wait(self, waited: float) -> None:
+        with self._condition:
+            self._acquisitions += 1
+            self._total_wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def _close_quietly(self, entry: _PooledConnectionEntry) -> None:
+        try:
+            entry.connection.close()
+        except MySqlError as ex:
+            self._logger.debug(f"Failed to close connection: {ex}")
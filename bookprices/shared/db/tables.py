@@ -29,8 +29,32 @@ class Book(BaseModel):
 class BookPrice(BaseModel):
     __tablename__ = 'BookPrice'
     id = Column('Id', Integer, primary_key=True, autoincrement=True)
-    book_id = Column('BookId', Integer, ForeignKey('Book.Id', ondelete='CASCADE'), nullable=True)
-    book_store_id = Column('BookStoreId', Integer, ForeignKey('BookStore.Id', ondelete='CASCADE'), nullable=True)
+    book_id = Column('BookId', Integer, nullable=True)
+    book_store_id = Column('BookStoreId', Integer, nullable=True)
+    price = Column('Price', Float(precision=2), nullable=False)
+    created = Column('Created', DateTime, nullable=False)
+
+
+class BookPriceInterval(BaseModel):
+    """
+    Price history as intervals: the price of a book in a book store from ValidFrom until the next price change.
+    ValidTo is empty for the current price.
+    """
+    __tablename__ = 'BookPriceInterval'
+    id = Column('Id', Integer, primary_key=True, autoincrement=True)
+    book_id = Column('BookId', Integer, ForeignKey('Book.Id', ondelete='CASCADE'), nullable=False)
+    book_store_id = Column('BookStoreId', Integer, ForeignKey('BookStore.Id', ondelete='CASCADE'), nullable=False)
+    price = Column('Price', Float(precision=2), nullable=False)
+    valid_from = Column('ValidFrom', DateTime, nullable=False)
+    valid_to = Column('ValidTo', DateTime, nullable=True)
+
+
+class BookStoreLatestPrice(BaseModel):
+    """ Latest price for each book in each book store. Kept in sync with BookPrice by the jobs writing prices. """
+    __tablename__ = 'BookStoreLatestPrice'
+    book_id = Column('BookId', Integer, ForeignKey('Book.Id', ondelete='CASCADE'), primary_key=True)
+    book_store_id = Column('BookStoreId', Integer, ForeignKey('BookStore.Id', ondelete='CASCADE'), primary_key=True)
+    book_price_id = Column('BookPriceId', Integer, nullable=False, index=True)
     price = Column('Price', Float(precision=2), nullable=False)
     created = Column('Created', DateTime, nullable=False)
 
@@ -49,6 +73,7 @@ class BookStore(BaseModel):
     color_hex = Column('ColorHex', CHAR(6), nullable=True)
     scraper_id = Column('ScraperId', String(255), nullable=True)
     api_key = Column("ApiKey", String(255), nullable=True)
+    use_structured_data = Column("UseStructuredData", Boolean, nullable=False, default=False)
 
 
 class BookStoreBook(BaseModel):
@@ -59,10 +84,22 @@ class BookStoreBook(BaseModel):
         'BookStoreId', Integer, ForeignKey('BookStore.Id', ondelete='CASCADE'), primary_key=True)
     url = Column('Url', String(255), nullable=False)
     created = Column('Created', DateTime, nullable=False, server_default=func.now())
+    last_checked = Column('LastChecked', DateTime, nullable=True)
     book: Mapped[Book] = relationship("Book", uselist=False)
     book_store: Mapped[BookStore] = relationship("BookStore", uselist=False)
 
 
+class BookStoreRequestRate(BaseModel):
+    """ Request rate for each book store learned by the adaptive rate limiting of the price updates. """
+    __tablename__ = 'BookStoreRequestRate'
+    book_store_id = Column(
+        'BookStoreId', Integer, ForeignKey('BookStore.Id', ondelete='CASCADE'), primary_key=True)
+    requests_per_second = Column('RequestsPerSecond', Float, nullable=False)
+    configured_requests_per_second = Column('ConfiguredRequestsPerSecond', Float, nullable=False)
+    backoffs = Column('Backoffs', Integer, nullable=False, default=0)
+    updated = Column('Updated', DateTime, nullable=False)
+
+
 class BookList(BaseModel):
     __tablename__ = 'BookList'
     id = Column('Id', Integer, primary_key=True, autoincrement=True)
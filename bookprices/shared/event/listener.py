@@ -1,6 +1,7 @@
 import logging
 
 from bookprices.job.service.argument_service import JobRunArgumentService, JobRunArgumentName
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
 from bookprices.shared.event.base import Listener
 from bookprices.shared.service.job_service import (JobService, JobRunPriority, CreationFailedError,
     JobSourceUnavailableError)
@@ -30,3 +31,17 @@ class StartJobListener(Listener):
             self._job_service.create_job_run(job_id=job["id"], priority=JobRunPriority.HIGH.value, arguments=arguments)
         except (CreationFailedError, JobSourceUnavailableError) as ex:
             self._logger.exception(f"Error while creating job run for {self._job_name}: {ex}")
+
+
+class SearchIndexVersionListener(Listener):
+    """ Signals the web workers to rebuild their in-memory search indexes when books have changed. """
+
+    def __init__(self, cache_key_remover: BookPriceKeyRemover) -> None:
+        self._cache_key_remover = cache_key_remover
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def notify(self, *args, **kwargs) -> None:
+        try:
+            self._cache_key_remover.increment_search_index_version()
+        except Exception as ex:
+            self._logger.exception(f"Error while incrementing search index version: {ex}")
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from typing import Iterator
 from bookprices.shared.model.book import Book
 from bookprices.shared.model.bookstore import BookStore
 
@@ -18,3 +19,30 @@ class BookPriceIds:
     id: int
     book_id: int
     bookstore_id: int
+
+
+@dataclass(frozen=True)
+class BookPriceInterval:
+    id: int
+    book_store_id: int
+    price: float
+    valid_from: datetime
+    valid_to: datetime | None
+    last_checked: datetime | None = None
+
+    def iter_daily_prices(self, until: date) -> Iterator[tuple[date, float]]:
+        """
+        Yields the price for each day of the interval up to and including until. The day of ValidTo belongs to the
+        next interval, so the last price of a day is used, and an interval replaced on the day it started yields nothing.
+        The current interval ends on the day the price was last checked, as the price isn't known after that.
+        """
+        if self.valid_to:
+            end = min(self.valid_to.date() - timedelta(days=1), until)
+        elif self.last_checked:
+            end = min(max(self.last_checked.date(), self.valid_from.date()), until)
+        else:
+            end = min(self.valid_from.date(), until)
+        day = self.valid_from.date()
+        while day <= end:
+            yield day, self.price
+            day += timedelta(days=1)
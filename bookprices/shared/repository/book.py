@@ -1,12 +1,21 @@
+from dataclasses import dataclass, field
 from typing import Sequence
 
 from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
 from sqlalchemy.orm import Session
 
 from bookprices.shared.db.tables import Book
 from bookprices.shared.repository.base import RepositoryBase
 
 
+@dataclass
+class BookUpsertResult:
+    book_ids_by_isbn: dict[str, int] = field(default_factory=dict)
+    created_book_ids: list[int] = field(default_factory=list)
+    updated_book_ids: list[int] = field(default_factory=list)
+
+
 class BookRepository(RepositoryBase[Book]):
     def __init__(self, session: Session) -> None:
         super().__init__(session)
@@ -51,6 +60,17 @@ class BookRepository(RepositoryBase[Book]):
 
         return list(book_ids)
 
+    def list_book_ids_after(self, after_id: int, limit: int) -> list[int]:
+        book_ids = (self._session.execute(
+            select(Book.id)
+            .where(Book.id > after_id)
+            .order_by(Book.id)
+            .limit(limit))
+            .scalars()
+            .all())
+
+        return list(book_ids)
+
     def list_books_with_image(self, offset_book_id: int, limit: int) -> list[Book]:
         book_ids = (self._session.execute(
             select(Book)
@@ -70,3 +90,50 @@ class BookRepository(RepositoryBase[Book]):
         books_by_isbn = {book.isbn: book for book in books}
 
         return books_by_isbn
+
+    def upsert_books(self, books: Sequence[Book]) -> BookUpsertResult:
+        """
+        Creates books with new ISBNs and updates title, author and format of existing ones in a single statement.
+        Books that haven't changed aren't written. Returns the ids of all the books and which were created or updated.
+        """
+        books_by_isbn = {book.isbn: book for book in books}
+        existing_books = {
+            row.isbn: row for row in self._session.execute(
+                select(Book.id, Book.isbn, Book.title, Book.author, Book.format)
+                .where(Book.isbn.in_(books_by_isbn))).all()
+        }
+        result = BookUpsertResult(book_ids_by_isbn={isbn: row.id for isbn, row in existing_books.items()})
+        books_to_save = []
+        for isbn, book in books_by_isbn.items():
+            if not (existing_book := existing_books.get(isbn)):
+                books_to_save.append(book)
+            elif (existing_book.title, existing_book.author, existing_book.format) != (book.title, book.author, book.format):
+                books_to_save.append(book)
+                result.updated_book_ids.append(existing_book.id)
+
+        if not books_to_save:
+            return result
+
+        self._session.execute(self._create_upsert_statement([
+            {"Isbn": book.isbn, "Title": book.title, "Author": book.author, "Format": book.format,
+             "ImageUrl": book.image_url, "Created": book.created}
+            for book in books_to_save
+        ]))
+
+        if new_isbns := [book.isbn for book in books_to_save if book.isbn not in existing_books]:
+            for book_id, isbn in self._session.execute(select(Book.id, Book.isbn).where(Book.isbn.in_(new_isbns))):
+                result.book_ids_by_isbn[isbn] = book_id
+                result.created_book_ids.append(book_id)
+
+        return result
+
+    def _create_upsert_statement(self, values: list[dict]):
+        if self._session.get_bind().dialect.name == "sqlite":
+            stmt = sqlite.insert(Book).values(values)
+            return stmt.on_conflict_do_update(
+                index_elements=[Book.isbn],
+                set_={"Title": stmt.excluded.Title, "Author": stmt.excluded.Author, "Format": stmt.excluded.Format})
+
+        stmt = mysql.insert(Book).values(values)
+        return stmt.on_duplicate_key_update(
+            Title=stmt.inserted.Title, Author=stmt.inserted.Author, Format=stmt.inserted.Format)
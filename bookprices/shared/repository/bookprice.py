@@ -1,14 +1,28 @@
+import re
 from collections import defaultdict
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import ClassVar, Sequence
 
-from sqlalchemy import func, select, case, delete
+from sqlalchemy import func, select, case, delete, insert, literal, text, DateTime
 from sqlalchemy.orm import Session
 
-from bookprices.shared.db.tables import BookPrice, BookStore
+from bookprices.shared.db.tables import BookPrice, BookStore, BookStoreLatestPrice
 from bookprices.shared.repository.base import RepositoryBase
 
 
+@dataclass(frozen=True)
+class BookPricePartition:
+    name: str
+    less_than: date | None
+    row_count: int
+
+
 class BookPriceRepository(RepositoryBase[BookPrice]):
+    """ BookPrice is range partitioned by month of Created in MySQL. The partition methods only work there. """
+    future_partition_name: ClassVar[str] = "p_future"
+    _partition_name_pattern: ClassVar[re.Pattern] = re.compile(r"^p(\d{6}|_history|_future)$")
+
     def __init__(self, session: Session) -> None:
         super().__init__(session)
 
@@ -25,6 +39,109 @@ class BookPriceRepository(RepositoryBase[BookPrice]):
     def delete_prices(self, ids: list[int]) -> None:
         self._session.execute(delete(BookPrice).where(BookPrice.id.in_(ids)))
 
+    def get_duplicate_prices(self, from_book_id: int, to_book_id: int) -> list[tuple[int, int, int]]:
+        """
+        Returns (id, book id, bookstore id) of the prices for books in the id range that are equal to the previous
+        price of the same book in the same book store, i.e. all prices but the price changes.
+        """
+        prices = (
+            select(
+                BookPrice.id,
+                BookPrice.book_id,
+                BookPrice.book_store_id,
+                BookPrice.price,
+                func.lag(BookPrice.price)
+                .over(partition_by=(BookPrice.book_id, BookPrice.book_store_id), order_by=BookPrice.id)
+                .label("previous_price"))
+            .where(BookPrice.book_id.between(from_book_id, to_book_id))
+            .subquery("prices"))
+
+        stmt = (
+            select(prices.c.id, prices.c.book_id, prices.c.book_store_id)
+            .where(prices.c.price == prices.c.previous_price)
+            .order_by(prices.c.id))
+
+        return [(row[0], row[1], row[2]) for row in self._session.execute(stmt).all()]
+
+    def get_prices_created_before(
+            self, from_book_id: int, to_book_id: int, before: datetime) -> list[tuple[int, int, int, datetime]]:
+        """ Returns (id, book id, bookstore id, created) of the prices for books in the id range, ordered by id. """
+        stmt = (
+            select(BookPrice.id, BookPrice.book_id, BookPrice.book_store_id, BookPrice.created)
+            .where(BookPrice.book_id.between(from_book_id, to_book_id), BookPrice.created < before)
+            .order_by(BookPrice.id))
+
+        return [(row[0], row[1], row[2], row[3]) for row in self._session.execute(stmt).all()]
+
+    def carry_forward_latest_prices(self, before: datetime) -> set[int]:
+        """
+        Adds a copy of the latest price, created at before, for each book in each book store that hasn't had a
+        price since. Done before older prices are archived, so every book keeps its latest price in BookPrice.
+        Returns the ids of the books.
+        """
+        latest_prices = (
+            select(BookStoreLatestPrice.book_id, BookStoreLatestPrice.book_store_id, BookStoreLatestPrice.price)
+            .where(BookStoreLatestPrice.created < before))
+        book_ids = {row[0] for row in self._session.execute(latest_prices).all()}
+        if book_ids:
+            self._session.execute(
+                insert(BookPrice).from_select(
+                    [BookPrice.book_id, BookPrice.book_store_id, BookPrice.price, BookPrice.created],
+                    latest_prices.add_columns(literal(before, DateTime))))
+
+        return book_ids
+
+    def get_partitions(self) -> list[BookPricePartition]:
+        rows = self._session.execute(text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS "
+            "FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'BookPrice' AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION")).all()
+
+        return [
+            BookPricePartition(
+                row[0],
+                None if row[1] == "MAXVALUE" else date.fromisoformat(row[1].strip("'")[:10]),
+                row[2] or 0)
+            for row in rows
+        ]
+
+    def add_monthly_partitions(self, months: Sequence[date]) -> None:
+        """ Splits the future partition into a partition for each month, keeping the future partition last. """
+        partitions = [
+            f"PARTITION {self.get_partition_name(month)} VALUES LESS THAN ('{self._get_next_month(month).isoformat()}')"
+            for month in sorted(months)
+        ]
+        partitions.append(f"PARTITION {self.future_partition_name} VALUES LESS THAN (MAXVALUE)")
+        self._session.execute(text(
+            f"ALTER TABLE BookPrice REORGANIZE PARTITION {self.future_partition_name} INTO ({', '.join(partitions)})"))
+
+    def get_prices_in_partition(self, partition_name: str) -> list[tuple[int, int, int, float, datetime]]:
+        rows = self._session.execute(text(
+            "SELECT Id, BookId, BookStoreId, Price, Created "
+            f"FROM BookPrice PARTITION ({self._validate_partition_name(partition_name)})")).all()
+
+        return [(row[0], row[1], row[2], row[3], row[4]) for row in rows]
+
+    def drop_partition(self, partition_name: str) -> None:
+        self._session.execute(text(
+            f"ALTER TABLE BookPrice DROP PARTITION {self._validate_partition_name(partition_name)}"))
+
+    @staticmethod
+    def get_partition_name(month: date) -> str:
+        return f"p{month:%Y%m}"
+
+    @staticmethod
+    def _get_next_month(month: date) -> date:
+        return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+    @classmethod
+    def _validate_partition_name(cls, partition_name: str) -> str:
+        if not cls._partition_name_pattern.match(partition_name):
+            raise ValueError(f"Invalid partition name: {partition_name}")
+
+        return partition_name
+
     def get_price_count_by_bookstore(self, from_date: datetime) -> list[tuple[int, str, int]]:
         price_count = func.count(case((BookPrice.created >= from_date, 1)))
         stmt = (
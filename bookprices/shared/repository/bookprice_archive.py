@@ -0,0 +1,91 @@
+import gzip
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import ClassVar, Iterable, Sequence
+
+
+class BookPriceArchive:
+    """
+    Archived BookPrice partitions on disk. Each partition is stored column by column as gzip compressed JSON, with
+    the rows sorted by book and book store, so the prices for a book are found by binary search on the BookId column.
+    """
+    file_prefix: ClassVar[str] = "BookPrice_"
+    file_extension: ClassVar[str] = ".json.gz"
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def list_partitions(self) -> list[str]:
+        if not os.path.isdir(self._directory):
+            return []
+
+        return sorted(
+            file_name.removeprefix(self.file_prefix).removesuffix(self.file_extension)
+            for file_name in os.listdir(self._directory)
+            if file_name.startswith(self.file_prefix) and file_name.endswith(self.file_extension))
+
+    def write(self, partition_name: str, prices: Sequence[tuple[int, int, int, float, datetime]]) -> str:
+        """ Writes (id, book id, bookstore id, price, created) rows for a partition and returns the file path. """
+        os.makedirs(self._directory, exist_ok=True)
+        prices = sorted(prices, key=lambda price: (price[1], price[2], price[0]))
+        content = {
+            "partition": partition_name,
+            "columns": {
+                "Id": [price[0] for price in prices],
+                "BookId": [price[1] for price in prices],
+                "BookStoreId": [price[2] for price in prices],
+                "Price": [price[3] for price in prices],
+                "Created": [price[4].isoformat() for price in prices],
+            }
+        }
+        file_path = self._get_file_path(partition_name)
+        temporary_file_path = f"{file_path}.tmp"
+        with gzip.open(temporary_file_path, "wt", encoding="utf-8") as archive_file:
+            json.dump(content, archive_file, separators=(",", ":"))
+        os.replace(temporary_file_path, file_path)
+
+        return file_path
+
+    def read(self, partition_name: str) -> list[tuple[int, int, int, float, datetime]]:
+        columns = self._read_columns(partition_name)
+        return self._get_rows(columns, 0, len(columns["Id"]))
+
+    def get_prices_for_book(
+            self, book_id: int, bookstore_id: int | None = None) -> list[tuple[int, int, int, float, datetime]]:
+        """ Returns the archived (id, book id, bookstore id, price, created) rows for a book from all partitions. """
+        return [
+            price for price in self.get_prices_for_books([book_id])
+            if bookstore_id is None or price[2] == bookstore_id]
+
+    def get_prices_for_books(self, book_ids: Iterable[int]) -> list[tuple[int, int, int, float, datetime]]:
+        """ Like get_prices_for_book for several books, reading each partition once. """
+        book_ids = sorted(set(book_ids))
+        prices = []
+        for partition_name in self.list_partitions():
+            columns = self._read_columns(partition_name)
+            for book_id in book_ids:
+                start = bisect_left(columns["BookId"], book_id)
+                end = bisect_right(columns["BookId"], book_id, lo=start)
+                prices.extend(self._get_rows(columns, start, end))
+
+        return prices
+
+    def _read_columns(self, partition_name: str) -> dict[str, list]:
+        with gzip.open(self._get_file_path(partition_name), "rt", encoding="utf-8") as archive_file:
+            return json.load(archive_file)["columns"]
+
+    @staticmethod
+    def _get_rows(columns: dict[str, list], start: int, end: int) -> list[tuple[int, int, int, float, datetime]]:
+        return [
+            (columns["Id"][i],
+             columns["BookId"][i],
+             columns["BookStoreId"][i],
+             columns["Price"][i],
+             datetime.fromisoformat(columns["Created"][i]))
+            for i in range(start, end)
+        ]
+
+    def _get_file_path(self, partition_name: str) -> str:
+        return os.path.join(self._directory, f"{self.file_prefix}{partition_name}{self.file_extension}")
@@ -0,0 +1,204 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from bookprices.shared.db.tables import BookPrice, BookPriceInterval, BookStoreBook
+import bookprices.shared.model.bookprice as bookprice_model
+from bookprices.shared.repository.base import RepositoryBase
+from bookprices.shared.repository.bookprice_archive import BookPriceArchive
+
+
+class BookPriceIntervalRepository(RepositoryBase[BookPriceInterval]):
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+
+    @property
+    def entity_type(self) -> type:
+        return BookPriceInterval
+
+    def update(self, entity: BookPriceInterval) -> None:
+        raise NotImplementedError
+
+    def list_for_book(self, book_id: int, bookstore_id: int | None = None) -> list[BookPriceInterval]:
+        stmt = select(BookPriceInterval).where(BookPriceInterval.book_id == book_id)
+        if bookstore_id is not None:
+            stmt = stmt.where(BookPriceInterval.book_store_id == bookstore_id)
+
+        entities = self._session.execute(
+            stmt.order_by(BookPriceInterval.book_store_id, BookPriceInterval.valid_from)).scalars().all()
+        self._session.expunge_all()
+
+        return list(entities)
+
+    def get_daily_prices_for_book(
+            self,
+            book_id: int,
+            bookstore_id: int | None = None,
+            until: date | None = None) -> dict[int, list[tuple[date, float]]]:
+        """ Expands the intervals for a book to one price per day for each book store, oldest first. """
+        until = until or date.today()
+        last_checked_by_bookstore_id = dict(self._session.execute(
+            select(BookStoreBook.book_store_id, BookStoreBook.last_checked)
+            .where(BookStoreBook.book_id == book_id)).all())
+        daily_prices_by_bookstore_id = defaultdict(list)
+        for interval in self.list_for_book(book_id, bookstore_id):
+            daily_prices_by_bookstore_id[interval.book_store_id].extend(
+                bookprice_model.BookPriceInterval(
+                    interval.id,
+                    interval.book_store_id,
+                    interval.price,
+                    interval.valid_from,
+                    interval.valid_to,
+                    last_checked_by_bookstore_id.get(interval.book_store_id)).iter_daily_prices(until))
+
+        return dict(daily_prices_by_bookstore_id)
+
+    def add_prices(self, prices: Sequence[BookPrice]) -> None:
+        """
+        Extends the price history with new prices. A price that differs from the current price of the book in the
+        book store closes the current interval and starts a new one, while an unchanged price is ignored.
+        """
+        if not prices:
+            return
+
+        current_intervals = {
+            (interval.book_id, interval.book_store_id): interval
+            for interval in self._session.execute(
+                select(BookPriceInterval)
+                .where(BookPriceInterval.book_id.in_({price.book_id for price in prices}),
+                       BookPriceInterval.valid_to.is_(None))).scalars().all()
+        }
+        for price in sorted(prices, key=lambda p: p.created):
+            key = (price.book_id, price.book_store_id)
+            if (current_interval := current_intervals.get(key)) is not None:
+                if round(current_interval.price, 2) == round(price.price, 2):
+                    continue
+                current_interval.valid_to = price.created
+
+            new_interval = BookPriceInterval(
+                book_id=price.book_id,
+                book_store_id=price.book_store_id,
+                price=price.price,
+                valid_from=price.created)
+            self._session.add(new_interval)
+            current_intervals[key] = new_interval
+
+    def refresh_for_books(self, book_ids: Iterable[int], archive: BookPriceArchive | None = None) -> None:
+        """
+        Recalculates the intervals for the given books from BookPrice. Prices in archived partitions are no longer in
+        BookPrice, so the intervals before the first price of a book in a book store still in BookPrice are kept,
+        unless the archive is given to recalculate them from as well.
+        """
+        if not (book_ids := list(set(book_ids))):
+            return
+
+        if archive:
+            self._session.execute(delete(BookPriceInterval).where(BookPriceInterval.book_id.in_(book_ids)))
+            self._add_intervals_for_prices(
+                self._get_prices_for_books(book_ids) + archive.get_prices_for_books(book_ids))
+            return
+
+        self._refresh(BookPriceInterval.book_id.in_(book_ids))
+        self._session.execute(self._create_insert_intervals_statement(BookPrice.book_id.in_(book_ids)))
+
+    def rebuild(self) -> int:
+        """
+        Recalculates the intervals for all books, keeping those from archived prices as refresh_for_books does.
+        Returns the number of rows in the rebuilt table.
+        """
+        self._refresh()
+        self._session.execute(self._create_insert_intervals_statement())
+
+        return self._session.execute(select(func.count()).select_from(BookPriceInterval)).scalar_one()
+
+    def _refresh(self, *conditions) -> None:
+        """ Deletes the intervals calculated from prices still in BookPrice and ends those before them. """
+        first_price_created = (
+            select(func.min(BookPrice.created))
+            .where(BookPrice.book_id == BookPriceInterval.book_id,
+                   BookPrice.book_store_id == BookPriceInterval.book_store_id)
+            .scalar_subquery())
+        self._session.execute(
+            delete(BookPriceInterval)
+            .where(*conditions, BookPriceInterval.valid_from >= first_price_created)
+            .execution_options(synchronize_session=False))
+        self._session.execute(
+            update(BookPriceInterval)
+            .where(*conditions,
+                   first_price_created.is_not(None),
+                   or_(BookPriceInterval.valid_to.is_(None), BookPriceInterval.valid_to > first_price_created))
+            .values(valid_to=first_price_created)
+            .execution_options(synchronize_session=False))
+
+    def _get_prices_for_books(self, book_ids: list[int]) -> list[tuple[int, int, int, float, datetime]]:
+        stmt = (
+            select(BookPrice.id, BookPrice.book_id, BookPrice.book_store_id, BookPrice.price, BookPrice.created)
+            .where(BookPrice.book_id.in_(book_ids)))
+
+        return [(row[0], row[1], row[2], row[3], row[4]) for row in self._session.execute(stmt).all()]
+
+    def _add_intervals_for_prices(self, prices: Sequence[tuple[int, int, int, float, datetime]]) -> None:
+        """ Adds an interval for each price change in (id, book id, bookstore id, price, created) rows. """
+        intervals = []
+        previous_interval = None
+        for _, book_id, bookstore_id, price, created in sorted(
+                prices, key=lambda p: (p[1], p[2], p[4], p[0])):
+            if (previous_interval is not None and
+                    (previous_interval.book_id, previous_interval.book_store_id) == (book_id, bookstore_id)):
+                if round(previous_interval.price, 2) == round(price, 2):
+                    continue
+                previous_interval.valid_to = created
+
+            previous_interval = BookPriceInterval(
+                book_id=book_id, book_store_id=bookstore_id, price=price, valid_from=created)
+            intervals.append(previous_interval)
+
+        self._session.add_all(intervals)
+
+    def delete_older_than(self, earliest_date: date) -> None:
+        """ Deletes intervals that ended before earliest_date and cuts off the start of those spanning it. """
+        self._session.execute(
+            delete(BookPriceInterval)
+            .where(BookPriceInterval.valid_to.is_not(None), BookPriceInterval.valid_to <= earliest_date))
+        self._session.execute(
+            update(BookPriceInterval)
+            .where(BookPriceInterval.valid_from < earliest_date)
+            .values(valid_from=earliest_date))
+
+    @staticmethod
+    def _create_insert_intervals_statement(*conditions):
+        partition = (BookPrice.book_id, BookPrice.book_store_id)
+        prices = (
+            select(
+                BookPrice.book_id,
+                BookPrice.book_store_id,
+                BookPrice.price,
+                BookPrice.created,
+                func.lag(BookPrice.price)
+                .over(partition_by=partition, order_by=(BookPrice.created, BookPrice.id))
+                .label("previous_price"))
+            .where(*conditions)
+            .subquery("prices"))
+
+        price_changes = (
+            select(prices.c.book_id, prices.c.book_store_id, prices.c.price, prices.c.created)
+            .where(or_(prices.c.previous_price.is_(None), prices.c.previous_price != prices.c.price))
+            .subquery("price_changes"))
+
+        return insert(BookPriceInterval).from_select(
+            [BookPriceInterval.book_id,
+             BookPriceInterval.book_store_id,
+             BookPriceInterval.price,
+             BookPriceInterval.valid_from,
+             BookPriceInterval.valid_to],
+            select(
+                price_changes.c.book_id,
+                price_changes.c.book_store_id,
+                price_changes.c.price,
+                price_changes.c.created,
+                func.lead(price_changes.c.created)
+                .over(partition_by=(price_changes.c.book_id, price_changes.c.book_store_id),
+                      order_by=price_changes.c.created)))
@@ -1,8 +1,8 @@
 from collections import defaultdict
 from datetime import datetime
-from typing import Tuple, Sequence, Any
+from typing import Tuple, Sequence, Any, Iterable
 
-from sqlalchemy import select, and_, outerjoin, func, case, distinct, true, Row
+from sqlalchemy import select, and_, outerjoin, func, case, distinct, true, Row, update, delete, insert
 from sqlalchemy.orm import joinedload, Session
 
 from bookprices.shared.db.tables import BookStore, BookStoreBook, Book, BookPrice
@@ -80,9 +80,18 @@ class BookStoreRepository(RepositoryBase[BookStore]):
         existing_entity.color_hex = entity.color_hex
         existing_entity.scraper_id = entity.scraper_id
         existing_entity.api_key = entity.api_key
+        existing_entity.use_structured_data = entity.use_structured_data
 
         self._session.merge(existing_entity)
 
+    def delete(self, entity_id: int) -> None:
+        # BookPrice is partitioned and can't cascade deletes from BookStore
+        self._session.execute(delete(BookPrice).where(BookPrice.book_store_id == entity_id))
+        super().delete(entity_id)
+
+    def list_book_urls(self, bookstore_id: int) -> set[str]:
+        return set(self._session.scalars(select(BookStoreBook.url).where(BookStoreBook.book_store_id == bookstore_id)))
+
     def add_book_to_bookstore_if_not_exists(self, book_id: int, bookstore_id: int, url: str) -> None:
         existing_entry = (self._session.execute(
             select(BookStoreBook)
@@ -100,6 +109,30 @@ class BookStoreRepository(RepositoryBase[BookStore]):
         ]
         self._session.bulk_save_objects(book_store_entries)
 
+    def set_last_checked(self, book_store_ids: Iterable[Tuple[int, int]], last_checked: datetime) -> None:
+        """ Sets when the price was last checked for the given (book id, bookstore id) pairs. """
+        book_ids_by_bookstore_id = defaultdict(set)
+        for book_id, bookstore_id in book_store_ids:
+            book_ids_by_bookstore_id[bookstore_id].add(book_id)
+
+        for bookstore_id, book_ids in book_ids_by_bookstore_id.items():
+            self._session.execute(
+                update(BookStoreBook)
+                .where(BookStoreBook.book_store_id == bookstore_id, BookStoreBook.book_id.in_(book_ids))
+                .values(last_checked=last_checked))
+
+    def add_books_to_bookstores_if_not_exist(self, bookstores_for_books: Sequence[Tuple[int, int, str]]) -> None:
+        """ Adds (book id, bookstore id, url) entries in one statement, skipping books already in the bookstore. """
+        if not bookstores_for_books:
+            return
+
+        self._session.execute(
+            insert(BookStoreBook)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+            .values([{"BookId": book_id, "BookStoreId": bookstore_id, "Url": url}
+                     for book_id, bookstore_id, url in bookstores_for_books]))
+
     def delete_book_from_bookstore(self, book_id: int, bookstore_id: int) -> None:
         book_store = (self._session.execute(
             select(BookStore)
@@ -127,7 +160,7 @@ class BookStoreRepository(RepositoryBase[BookStore]):
     def get_bookstores_with_updated_prices_percentage(self, date_from: datetime) -> list[tuple[int, str, int, int, float]]:
         updated_prices = func.count(
             distinct(
-                case((BookPrice.created >= date_from, BookStoreBook.book_id))))
+                case((BookStoreBook.last_checked >= date_from, BookStoreBook.book_id))))
         book_count = func.count(distinct(BookStoreBook.book_id))
         updated_percentage = func.round((updated_prices * 100.0) / book_count, 4)
         stmt = (
@@ -139,10 +172,6 @@ class BookStoreRepository(RepositoryBase[BookStore]):
                 updated_percentage,
             )
             .outerjoin(BookStoreBook, BookStoreBook.book_store_id == BookStore.id)
-            .outerjoin(
-                BookPrice,
-                (BookPrice.book_store_id == BookStoreBook.book_store_id)
-                & (BookPrice.book_id == BookStoreBook.book_id))
             .group_by(BookStore.id, BookStore.name)
             .order_by(updated_percentage.desc())
         )
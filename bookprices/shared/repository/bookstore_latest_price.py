@@ -0,0 +1,71 @@
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from bookprices.shared.db.tables import BookPrice, BookStoreLatestPrice
+from bookprices.shared.repository.base import RepositoryBase
+
+
+class BookStoreLatestPriceRepository(RepositoryBase[BookStoreLatestPrice]):
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+
+    @property
+    def entity_type(self) -> type:
+        return BookStoreLatestPrice
+
+    def update(self, entity: BookStoreLatestPrice) -> None:
+        raise NotImplementedError
+
+    def list_for_book(self, book_id: int) -> list[BookStoreLatestPrice]:
+        entities = self._session.execute(
+            select(BookStoreLatestPrice)
+            .where(BookStoreLatestPrice.book_id == book_id)
+            .order_by(BookStoreLatestPrice.price)).scalars().all()
+        self._session.expunge_all()
+
+        return list(entities)
+
+    def list_for_books(self, book_ids: Iterable[int]) -> list[BookStoreLatestPrice]:
+        if not (book_ids := list(set(book_ids))):
+            return []
+
+        entities = self._session.execute(
+            select(BookStoreLatestPrice)
+            .where(BookStoreLatestPrice.book_id.in_(book_ids))).scalars().all()
+        self._session.expunge_all()
+
+        return list(entities)
+
+    def refresh_for_books(self, book_ids: Iterable[int]) -> None:
+        """ Recalculates the latest prices for the given books from BookPrice. """
+        if not (book_ids := list(set(book_ids))):
+            return
+
+        self._session.execute(delete(BookStoreLatestPrice).where(BookStoreLatestPrice.book_id.in_(book_ids)))
+        self._session.execute(self._create_insert_latest_prices_statement(BookPrice.book_id.in_(book_ids)))
+
+    def rebuild(self) -> int:
+        """ Recalculates the latest prices for all books. Returns the number of rows in the rebuilt table. """
+        self._session.execute(delete(BookStoreLatestPrice))
+        self._session.execute(self._create_insert_latest_prices_statement())
+
+        return self._session.execute(select(func.count()).select_from(BookStoreLatestPrice)).scalar_one()
+
+    @staticmethod
+    def _create_insert_latest_prices_statement(*conditions):
+        latest_price_ids = (
+            select(func.max(BookPrice.id).label("id"))
+            .where(*conditions)
+            .group_by(BookPrice.book_id, BookPrice.book_store_id)
+            .subquery("latest_price_ids"))
+
+        return insert(BookStoreLatestPrice).from_select(
+            [BookStoreLatestPrice.book_id,
+             BookStoreLatestPrice.book_store_id,
+             BookStoreLatestPrice.book_price_id,
+             BookStoreLatestPrice.price,
+             BookStoreLatestPrice.created],
+            select(BookPrice.book_id, BookPrice.book_store_id, BookPrice.id, BookPrice.price, BookPrice.created)
+            .join(latest_price_ids, BookPrice.id == latest_price_ids.c.id))
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from bookprices.shared.db.tables import BookStore, BookStoreRequestRate
+from bookprices.shared.repository.base import RepositoryBase
+
+
+class BookStoreRequestRateRepository(RepositoryBase[BookStoreRequestRate]):
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+
+    @property
+    def entity_type(self) -> type:
+        return BookStoreRequestRate
+
+    def update(self, entity: BookStoreRequestRate) -> None:
+        self._session.merge(entity)
+
+    def save_rates(self, request_rates: Iterable[BookStoreRequestRate]) -> None:
+        """ Adds or replaces the rate for each book store. """
+        for request_rate in request_rates:
+            self._session.merge(request_rate)
+
+    def get_rates_by_bookstore_id(self) -> dict[int, float]:
+        return {
+            bookstore_id: requests_per_second for bookstore_id, requests_per_second in self._session.execute(
+                select(BookStoreRequestRate.book_store_id, BookStoreRequestRate.requests_per_second)).all()
+        }
+
+    def get_rates_with_bookstore_names(self) -> list[tuple[int, str, float, float, int, datetime]]:
+        stmt = (
+            select(
+                BookStore.id,
+                BookStore.name,
+                BookStoreRequestRate.requests_per_second,
+                BookStoreRequestRate.configured_requests_per_second,
+                BookStoreRequestRate.backoffs,
+                BookStoreRequestRate.updated)
+            .join(BookStore, BookStore.id == BookStoreRequestRate.book_store_id)
+            .order_by(BookStore.name)
+        )
+
+        return [tuple(row) for row in self._session.execute(stmt).all()]
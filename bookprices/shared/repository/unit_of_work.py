@@ -1,10 +1,16 @@
+from typing import Iterator
+
 from sqlalchemy.orm import Session
 
 from bookprices.shared.repository.api_key import ApiKeyRepository
+from bookprices.shared.repository.base import RepositoryBase
 from bookprices.shared.repository.book import BookRepository
 from bookprices.shared.repository.booklist import BookListRepository
 from bookprices.shared.repository.bookprice import BookPriceRepository
+from bookprices.shared.repository.bookprice_interval import BookPriceIntervalRepository
 from bookprices.shared.repository.bookstore import BookStoreRepository
+from bookprices.shared.repository.bookstore_latest_price import BookStoreLatestPriceRepository
+from bookprices.shared.repository.bookstore_request_rate import BookStoreRequestRateRepository
 from bookprices.shared.db.data_session import SessionFactory
 from bookprices.shared.repository.currency import CurrencyRepository
 from bookprices.shared.repository.excluded_book_image import ExcludedBookImageRepository
@@ -12,38 +18,95 @@ from bookprices.shared.repository.failed_price_update import FailedPriceUpdateRe
 
 
 class UnitOfWork:
+    """ Wraps a session in a transaction. Repositories are created on first access within each unit of work. """
+
     def __init__(self, session_factory: SessionFactory) -> None:
         self._session_factory = session_factory
         self._session: Session | None = None
-        self.booklist_repository: BookListRepository | None = None
-        self.book_repository: BookRepository | None = None
-        self.bookstore_repository: BookStoreRepository | None = None
-        self.bookprice_repository: BookPriceRepository | None = None
-        self.currency_repository: CurrencyRepository | None = None
-        self.api_key_repository: ApiKeyRepository | None = None
-        self.failed_price_update_repository: FailedPriceUpdateRepository | None = None
-        self.excluded_book_image_repository: ExcludedBookImageRepository | None = None
+        self._repositories: dict[type, RepositoryBase] = {}
+
+    @property
+    def booklist_repository(self) -> BookListRepository:
+        return self._get_repository(BookListRepository)
+
+    @property
+    def book_repository(self) -> BookRepository:
+        return self._get_repository(BookRepository)
+
+    @property
+    def bookstore_repository(self) -> BookStoreRepository:
+        return self._get_repository(BookStoreRepository)
+
+    @property
+    def bookprice_repository(self) -> BookPriceRepository:
+        return self._get_repository(BookPriceRepository)
+
+    @property
+    def bookprice_interval_repository(self) -> BookPriceIntervalRepository:
+        return self._get_repository(BookPriceIntervalRepository)
+
+    @property
+    def bookstore_latest_price_repository(self) -> BookStoreLatestPriceRepository:
+        return self._get_repository(BookStoreLatestPriceRepository)
+
+    @property
+    def bookstore_request_rate_repository(self) -> BookStoreRequestRateRepository:
+        return self._get_repository(BookStoreRequestRateRepository)
+
+    @property
+    def currency_repository(self) -> CurrencyRepository:
+        return self._get_repository(CurrencyRepository)
+
+    @property
+    def api_key_repository(self) -> ApiKeyRepository:
+        return self._get_repository(ApiKeyRepository)
+
+    @property
+    def failed_price_update_repository(self) -> FailedPriceUpdateRepository:
+        return self._get_repository(FailedPriceUpdateRepository)
+
+    @property
+    def excluded_book_image_repository(self) -> ExcludedBookImageRepository:
+        return self._get_repository(ExcludedBookImageRepository)
+
+    def create_new(self) -> "UnitOfWork":
+        """ Returns a separate unit of work on the same session factory, e.g. for use in another thread. """
+        return UnitOfWork(self._session_factory)
 
     def __enter__(self) -> "UnitOfWork":
+        self._repositories = {}
+        self._session = self._session_factory.create_scoped_session()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         try:
-            self._session = self._session_factory.create_scoped_session()
-            self.booklist_repository = BookListRepository(self._session)
-            self.book_repository = BookRepository(self._session)
-            self.bookstore_repository = BookStoreRepository(self._session)
-            self.bookprice_repository = BookPriceRepository(self._session)
-            self.currency_repository = CurrencyRepository(self._session)
-            self.api_key_repository = ApiKeyRepository(self._session)
-            self.failed_price_update_repository = FailedPriceUpdateRepository(self._session)
-            self.excluded_book_image_repository = ExcludedBookImageRepository(self._session)
-            return self
-        except Exception:
-            if self._session:
+            if exc_val:
                 self._session.rollback()
-            raise
+            else:
+                self._session.commit()
+        finally:
+            self._session.close()
+            self._session = None
+            self._repositories = {}
 
-    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        if exc_val:
-            self._session.rollback()
-        else:
-            self._session.commit()
-        self._session.close()
\ No newline at end of file
+    def iter_book_id_batches(self, after_id: int = 0, size: int = 500) -> Iterator[list[int]]:
+        """
+        Yields ids of all books with id greater than after_id in ascending batches. Each batch is read in its own
+        transaction and seeks past the last id of the previous batch, so late batches are as cheap as the first.
+        """
+        while True:
+            with self as uow:
+                book_ids = uow.book_repository.list_book_ids_after(after_id, size)
+            if not book_ids:
+                return
+            yield book_ids
+            after_id = book_ids[-1]
+
+    def _get_repository[T: RepositoryBase](self, repository_type: type[T]) -> T:
+        if self._session is None:
+            raise RuntimeError("Repositories are only available inside the unit of work context")
+        if not (repository := self._repositories.get(repository_type)):
+            repository = repository_type(self._session)
+            self._repositories[repository_type] = repository
+
+        return repository
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+from bookprices.shared.db.book import SearchQuery
+from bookprices.shared.model.book import Book
+
+
+class BookSearchBackend(ABC):
+    """ Searches books by title, author and ISBN. """
+
+    @abstractmethod
+    def search(self, search_query: SearchQuery) -> list[Book]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        raise NotImplementedError
@@ -0,0 +1,28 @@
+from bookprices.shared.db.book import SearchQuery, BookSearchSortOption
+from bookprices.shared.db.database import Database
+from bookprices.shared.model.book import Book
+from bookprices.shared.search.base import BookSearchBackend
+
+
+class DatabaseSearchBackend(BookSearchBackend):
+    """
+    Searches the Book table in MySQL. With full_text, the FULLTEXT (ngram) index is used, which matches words
+    anywhere in title and author and ranks by relevance. Otherwise, prefix matching with LIKE is used.
+    Search suggestions always use prefix matching. The web app serves them from the in-memory suggestion index.
+    """
+
+    def __init__(self, db: Database, full_text: bool = True) -> None:
+        self._db = db
+        self._full_text = full_text
+
+    def search(self, search_query: SearchQuery) -> list[Book]:
+        if search_query.sort_option == BookSearchSortOption.PriceUpdated:
+            return self._db.book_db.search_books_with_newest_prices(search_query, full_text=self._full_text)
+
+        return self._db.book_db.search_books(search_query, full_text=self._full_text)
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        if author:
+            return self._db.book_db.get_search_suggestions_for_author(search_phrase, author)
+
+        return self._db.book_db.get_search_suggestions(search_phrase)
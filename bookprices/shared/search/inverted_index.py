@@ -0,0 +1,266 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime
+from threading import Lock
+from typing import Callable, ClassVar, Iterable, Any
+
+from bookprices.shared.db.book import SearchQuery, BookSearchSortOption, SearchCursor
+from bookprices.shared.model.book import Book
+from bookprices.shared.search.base import BookSearchBackend
+from bookprices.shared.search.versioned import VersionedIndex
+
+ISBN_SEARCH_PATTERN = re.compile(r"[\d\-\s]+")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    return TOKEN_PATTERN.findall(text.casefold()) if text else []
+
+
+class BookSearchIndex:
+    """
+    In-process inverted index over book titles and authors. Query words match words in titles and authors
+    anywhere (infix), all words must match and results can be ranked by how well they match.
+    """
+    title_weight: ClassVar[float] = 2.0
+    author_weight: ClassVar[float] = 1.0
+    exact_match_score: ClassVar[int] = 3
+    prefix_match_score: ClassVar[int] = 2
+    infix_match_score: ClassVar[int] = 1
+    max_suggestions: ClassVar[int] = 100
+    _ngram_size: ClassVar[int] = 3
+
+    def __init__(self, books: Iterable[Book]) -> None:
+        self._books: dict[int, Book] = {}
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        ids_by_author: defaultdict[str, list[int]] = defaultdict(list)
+        isbns = []
+        for book in books:
+            self._books[book.id] = book
+            for token in set(tokenize(book.title)) | set(tokenize(book.author)):
+                postings[token].append(book.id)
+            ids_by_author[book.author].append(book.id)
+            isbns.append((book.isbn, book.id))
+
+        self._postings = {token: array("I", book_ids) for token, book_ids in postings.items()}
+        self._ids_by_author = {author: array("I", book_ids) for author, book_ids in ids_by_author.items()}
+        self._vocabulary = sorted(self._postings)
+        self._vocabulary_by_ngram: defaultdict[str, set[str]] = defaultdict(set)
+        for token in self._vocabulary:
+            for ngram in self._get_ngrams(token):
+                self._vocabulary_by_ngram[ngram].add(token)
+        self._isbns = sorted(isbns)
+        self._sort_orders: dict[BookSearchSortOption, tuple[list[int], list[tuple], dict[int, int]]] = {}
+        self._sort_lock = Lock()
+
+    @property
+    def book_count(self) -> int:
+        return len(self._books)
+
+    def search(self, search_query: SearchQuery) -> list[Book]:
+        book_ids = self._find_matching_book_ids(search_query.search_phrase)
+        if search_query.author:
+            author_book_ids = set(self._ids_by_author.get(search_query.author, ()))
+            book_ids = author_book_ids if book_ids is None else book_ids & author_book_ids
+
+        page_end = search_query.page * search_query.page_size
+        if search_query.sort_option == BookSearchSortOption.Relevance and book_ids is not None:
+            query_tokens = tokenize(search_query.search_phrase)
+            ranked = heapq.nsmallest(
+                page_end,
+                ((-self._score(query_tokens, self._books[book_id]), book_id) for book_id in book_ids))
+            page_ids = [book_id for _, book_id in ranked[page_end - search_query.page_size:]]
+        else:
+            page_ids = self._get_sorted_page(book_ids, search_query)
+
+        return [self._books[book_id] for book_id in page_ids]
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        query_tokens = tokenize(search_phrase)
+        book_ids = self._find_matching_book_ids(search_phrase)
+        if not query_tokens or not book_ids:
+            return []
+
+        if author:
+            candidates = {self._books[book_id].title for book_id in book_ids
+                          if self._books[book_id].author == author}
+        else:
+            candidates = set()
+            for book_id in book_ids:
+                book = self._books[book_id]
+                candidates.add(book.title)
+                candidates.add(book.author)
+
+        suggestions = (candidate for candidate in candidates
+                       if self._field_matches_all(query_tokens, tokenize(candidate)))
+        return heapq.nsmallest(self.max_suggestions, suggestions)
+
+    def _find_matching_book_ids(self, search_phrase: str) -> set[int] | None:
+        """ Returns None if the phrase is empty, meaning all books match. """
+        if not search_phrase.strip():
+            return None
+        if ISBN_SEARCH_PATTERN.fullmatch(search_phrase):
+            return self._find_by_isbn_prefix(re.sub(r"[\-\s]", "", search_phrase))
+        if not (query_tokens := tokenize(search_phrase)):
+            return set()
+
+        book_ids = None
+        for query_token in sorted(query_tokens, key=len, reverse=True):
+            token_book_ids = set()
+            for token in self._find_tokens(query_token):
+                token_book_ids.update(self._postings[token])
+            book_ids = token_book_ids if book_ids is None else book_ids & token_book_ids
+            if not book_ids:
+                return set()
+
+        return book_ids
+
+    def _find_tokens(self, query_token: str) -> list[str]:
+        if len(query_token) < self._ngram_size:
+            start = bisect_left(self._vocabulary, query_token)
+            end = bisect_left(self._vocabulary, query_token + "\uffff", lo=start)
+            return self._vocabulary[start:end]
+
+        candidate_tokens = None
+        for ngram in self._get_ngrams(query_token):
+            tokens_with_ngram = self._vocabulary_by_ngram.get(ngram, set())
+            candidate_tokens = tokens_with_ngram if candidate_tokens is None else candidate_tokens & tokens_with_ngram
+            if not candidate_tokens:
+                return []
+
+        return [token for token in candidate_tokens if query_token in token]
+
+    def _find_by_isbn_prefix(self, isbn_prefix: str) -> set[int]:
+        start = bisect_left(self._isbns, (isbn_prefix,))
+        end = bisect_left(self._isbns, (isbn_prefix + "\uffff",), lo=start)
+        return {book_id for _, book_id in self._isbns[start:end]}
+
+    def _score(self, query_tokens: list[str], book: Book) -> float:
+        title_tokens, author_tokens = tokenize(book.title), tokenize(book.author)
+        return sum(self.title_weight * self._match_score(query_token, title_tokens) +
+                   self.author_weight * self._match_score(query_token, author_tokens)
+                   for query_token in query_tokens)
+
+    @classmethod
+    def _match_score(cls, query_token: str, field_tokens: list[str]) -> int:
+        best_score = 0
+        for token in field_tokens:
+            if token == query_token:
+                return cls.exact_match_score
+            if token.startswith(query_token):
+                best_score = cls.prefix_match_score
+            elif query_token in token:
+                best_score = max(best_score, cls.infix_match_score)
+
+        return best_score
+
+    @staticmethod
+    def _field_matches_all(query_tokens: list[str], field_tokens: list[str]) -> bool:
+        return all(any(query_token in token for token in field_tokens) for query_token in query_tokens)
+
+    def _get_sorted_page(self, book_ids: set[int] | None, search_query: SearchQuery) -> list[int]:
+        """
+        Books are sorted once per sort option. Matching books are paged by their position in that order,
+        so a page only needs the positions of the matching books, not a sort of their keys.
+        """
+        sorted_ids, sort_keys, positions = self._get_sort_order(search_query.sort_option)
+        descending = search_query.sort_in_descending_order
+        if search_query.after:
+            after_key = self._get_cursor_key(search_query.after, search_query.sort_option)
+            start = bisect_left(sort_keys, after_key) if descending else bisect_right(sort_keys, after_key)
+            skip = 0
+        else:
+            start = len(sorted_ids) if descending else 0
+            skip = (search_query.page - 1) * search_query.page_size
+
+        count = skip + search_query.page_size
+        if book_ids is None:
+            page_positions = range(start - 1, max(start - count, 0) - 1, -1) if descending \
+                else range(start, min(start + count, len(sorted_ids)))
+            return [sorted_ids[position] for position in page_positions][skip:]
+
+        if descending:
+            matching_positions = heapq.nlargest(
+                count, (position for book_id in book_ids if (position := positions[book_id]) < start))
+        else:
+            matching_positions = heapq.nsmallest(
+                count, (position for book_id in book_ids if (position := positions[book_id]) >= start))
+
+        return [sorted_ids[position] for position in matching_positions[skip:]]
+
+    def _get_sort_order(self, sort_option: BookSearchSortOption) -> tuple[list[int], list[tuple], dict[int, int]]:
+        """ Returns all book ids and their sort keys in ascending order and the position of each book. """
+        if sort_option not in self._sort_orders:
+            with self._sort_lock:
+                if sort_option not in self._sort_orders:
+                    keyed_ids = sorted(
+                        (self._get_sort_key(book, sort_option), book.id) for book in self._books.values())
+                    sorted_ids = [book_id for _, book_id in keyed_ids]
+                    self._sort_orders[sort_option] = (
+                        sorted_ids,
+                        [key for key, _ in keyed_ids],
+                        {book_id: position for position, book_id in enumerate(sorted_ids)})
+
+        return self._sort_orders[sort_option]
+
+    @staticmethod
+    def _get_sort_key(book: Book, sort_option: BookSearchSortOption) -> tuple:
+        if sort_option == BookSearchSortOption.Author:
+            return book.author.casefold(), book.id
+        if sort_option == BookSearchSortOption.Created:
+            return book.created or datetime.min, book.id
+        if sort_option == BookSearchSortOption.PriceUpdated:
+            return book.id,
+
+        return book.title.casefold(), book.id
+
+    @staticmethod
+    def _get_cursor_key(cursor: SearchCursor, sort_option: BookSearchSortOption) -> tuple:
+        sort_value: Any = cursor.sort_value
+        if sort_option == BookSearchSortOption.PriceUpdated:
+            return cursor.book_id,
+        if isinstance(sort_value, str):
+            sort_value = sort_value.casefold()
+
+        return sort_value, cursor.book_id
+
+    @classmethod
+    def _get_ngrams(cls, token: str) -> list[str]:
+        return [token[i:i + cls._ngram_size] for i in range(len(token) - cls._ngram_size + 1)]
+
+
+class InvertedIndexSearchBackend(BookSearchBackend):
+    """
+    Searches an in-process index of all books. The index is built from load_books on first use and rebuilt in the
+    background when get_version returns a new value, or with rebuild(). Sorting by latest price update requires price
+    data, so those searches go to the fallback backend if one is given.
+    """
+
+    def __init__(
+            self,
+            load_books: Callable[[], Iterable[Book]],
+            fallback: BookSearchBackend | None = None,
+            get_version: Callable[[], Any] | None = None,
+            version_check_interval_seconds: float | None = None) -> None:
+        self._fallback = fallback
+        self._versioned_index = VersionedIndex(
+            lambda: BookSearchIndex(load_books()), get_version, version_check_interval_seconds)
+
+    @property
+    def index(self) -> BookSearchIndex:
+        return self._versioned_index.index
+
+    def rebuild(self) -> None:
+        self._versioned_index.rebuild()
+
+    def search(self, search_query: SearchQuery) -> list[Book]:
+        if search_query.sort_option == BookSearchSortOption.PriceUpdated and self._fallback:
+            return self._fallback.search(search_query)
+
+        return self.index.search(search_query)
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        return self.index.get_search_suggestions(search_phrase, author)
@@ -0,0 +1,79 @@
+from bisect import bisect_left
+from typing import Callable, ClassVar, Iterable, Any
+
+from bookprices.shared.db.book import SearchQuery
+from bookprices.shared.model.book import Book
+from bookprices.shared.search.base import BookSearchBackend
+from bookprices.shared.search.versioned import VersionedIndex
+
+
+class SearchSuggestionIndex:
+    """
+    Sorted arrays of distinct titles and authors for case-insensitive prefix lookups, the same suggestions as
+    LIKE 'phrase%' on the Book table.
+    """
+    max_suggestions: ClassVar[int] = 100
+    _upper_bound: ClassVar[str] = "\uffff"
+
+    def __init__(self, titles_and_authors: Iterable[tuple[str, str]]) -> None:
+        suggestions = set()
+        titles_by_author: dict[str, set[str]] = {}
+        for title, author in titles_and_authors:
+            suggestions.add(title)
+            suggestions.add(author)
+            titles_by_author.setdefault(author, set()).add(title)
+
+        self._keys, self._suggestions = self._sort(suggestions)
+        self._titles_by_author = {author: self._sort(titles) for author, titles in titles_by_author.items()}
+
+    @property
+    def suggestion_count(self) -> int:
+        return len(self._suggestions)
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        if author:
+            if author not in self._titles_by_author:
+                return []
+            keys, suggestions = self._titles_by_author[author]
+        else:
+            keys, suggestions = self._keys, self._suggestions
+
+        prefix = search_phrase.casefold()
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + self._upper_bound, lo=start, hi=min(start + self.max_suggestions, len(keys)))
+
+        return suggestions[start:end]
+
+    @staticmethod
+    def _sort(values: Iterable[str]) -> tuple[list[str], list[str]]:
+        keyed_values = sorted((value.casefold(), value) for value in values)
+        return [key for key, _ in keyed_values], [value for _, value in keyed_values]
+
+
+class SearchSuggestionService(VersionedIndex[SearchSuggestionIndex]):
+    """ Keeps a SearchSuggestionIndex in memory and rebuilds it when the search index version changes. """
+
+    def __init__(
+            self,
+            load_titles_and_authors: Callable[[], Iterable[tuple[str, str]]],
+            get_version: Callable[[], Any] | None = None,
+            version_check_interval_seconds: float | None = None) -> None:
+        super().__init__(
+            lambda: SearchSuggestionIndex(load_titles_and_authors()), get_version, version_check_interval_seconds)
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        return self.index.get_search_suggestions(search_phrase, author)
+
+
+class IndexedSuggestionsSearchBackend(BookSearchBackend):
+    """ Searches with the given backend, but serves search suggestions from an in-memory prefix index. """
+
+    def __init__(self, search_backend: BookSearchBackend, suggestion_service: SearchSuggestionService) -> None:
+        self._search_backend = search_backend
+        self._suggestion_service = suggestion_service
+
+    def search(self, search_query: SearchQuery) -> list[Book]:
+        return self._search_backend.search(search_query)
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        return self._suggestion_service.get_search_suggestions(search_phrase, author)
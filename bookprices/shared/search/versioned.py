@@ -0,0 +1,83 @@
+import logging
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import Callable, ClassVar, Any
+
+
+class VersionedIndex[T]:
+    """
+    Keeps an index in memory. When get_version returns a new value, e.g. a counter in Redis that is incremented when
+    books are created, imported or deleted, the index is rebuilt in a background thread while the current index keeps
+    serving lookups.
+    """
+    default_version_check_interval_seconds: ClassVar[float] = 5.0
+
+    def __init__(
+            self,
+            build_index: Callable[[], T],
+            get_version: Callable[[], Any] | None = None,
+            version_check_interval_seconds: float | None = None) -> None:
+        self._build_index = build_index
+        self._get_version = get_version
+        self._version_check_interval_seconds = (
+            version_check_interval_seconds if version_check_interval_seconds is not None
+            else self.default_version_check_interval_seconds)
+        self._index: T | None = None
+        self._index_version = None
+        self._next_version_check = 0.0
+        self._rebuilding = False
+        self._lock = Lock()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def index(self) -> T:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._build(self._read_version())
+        else:
+            self._rebuild_if_outdated()
+
+        return self._index
+
+    def rebuild(self) -> None:
+        self._build(self._read_version())
+
+    def _rebuild_if_outdated(self) -> None:
+        now = monotonic()
+        if now < self._next_version_check or self._rebuilding:
+            return
+        with self._lock:
+            if now < self._next_version_check or self._rebuilding:
+                return
+            self._next_version_check = now + self._version_check_interval_seconds
+            version = self._read_version()
+            if version == self._index_version:
+                return
+            self._rebuilding = True
+
+        Thread(target=self._build_in_background, args=(version,), daemon=True).start()
+
+    def _build_in_background(self, version: Any) -> None:
+        try:
+            self._build(version)
+        except Exception as ex:
+            self._logger.exception(f"Failed to rebuild index: {ex}")
+        finally:
+            self._rebuilding = False
+
+    def _build(self, version: Any) -> None:
+        started = perf_counter()
+        index = self._build_index()
+        self._index, self._index_version = index, version
+        self._logger.info(f"Built {type(index).__name__} in {perf_counter() - started:.2f} seconds "
+                          f"(version {version})")
+
+    def _read_version(self) -> Any:
+        if not self._get_version:
+            return None
+        try:
+            return self._get_version()
+        except Exception as ex:
+            self._logger.warning(f"Failed to read search index version: {ex}")
+            return self._index_version
@@ -8,14 +8,22 @@ from bookprices.shared.webscraping.bookstore import (
     BookStoreScraper, StaticBookStoreScraper, BookStoreConfiguration, WilliamDamScraper, SaxoScraper, BogOgIdeScraper,
     PlusbogScraper, GuccaScraper, CSalgScraper, IMusicScraper, AcademicBooksScraper, DinBoghandelScraper)
 from bookprices.shared.webscraping.currency import CurrencyConverter
+from bookprices.shared.webscraping.rate_limit import TokenBucketStore
+from bookprices.shared.webscraping.validator_store import HttpValidatorStore
 
 
 class BookStoreScraperService:
     """ Service for listing and getting bookstore scrapers """
 
-    def __init__(self, unit_of_work: UnitOfWork) -> None:
+    def __init__(
+            self,
+            unit_of_work: UnitOfWork,
+            http_validator_store: HttpValidatorStore | None = None,
+            token_bucket_store: TokenBucketStore | None = None) -> None:
         self._logger = logging.getLogger(self.__class__.__name__)
         self._unit_of_work = unit_of_work
+        self._http_validator_store = http_validator_store
+        self._token_bucket_store = token_bucket_store
         self._scraper_types = {
             StaticBookStoreScraper.get_name(): StaticBookStoreScraper,
             WilliamDamScraper.get_name(): WilliamDamScraper,
@@ -32,23 +40,28 @@ class BookStoreScraperService:
     def list_scrapers(self) -> list[BookStoreScraper]:
         with self._unit_of_work as uow:
             bookstores = uow.bookstore_repository.get_list()
+            request_rates = uow.bookstore_request_rate_repository.get_rates_by_bookstore_id()
 
         return [
             scraper for bookstore in bookstores
-            if (scraper := self._create_scraper_for_bookstore(bookstore)) is not None]
+            if (scraper := self._create_scraper_for_bookstore(bookstore, request_rates.get(bookstore.id))) is not None]
 
     def get_scraper(self, bookstore_id: int) -> BookStoreScraper | None:
         with self._unit_of_work as uow:
             if not (bookstore := uow.bookstore_repository.get(bookstore_id)):
                 self._logger.warning(f"Bookstore with id {bookstore_id} not found.")
                 return None
+            request_rate = uow.bookstore_request_rate_repository.get(bookstore_id)
 
-        return self._create_scraper_for_bookstore(bookstore)
+        return self._create_scraper_for_bookstore(
+            bookstore, request_rate.requests_per_second if request_rate else None)
 
     def get_scraper_names(self) -> list[str]:
         return list(self._scraper_types.keys())
 
-    def _create_scraper_for_bookstore(self, bookstore: BookStore) -> BookStoreScraper | None:
+    def _create_scraper_for_bookstore(
+            self, bookstore: BookStore, requests_per_second: float | None) -> BookStoreScraper | None:
+        """ requests_per_second is the request rate learned in earlier runs, if any. """
         if not (scraper_class := self._scraper_types.get(bookstore.scraper_id)):
             self._logger.warning(f"No scraper found for bookstore {bookstore.name}")
             return None
@@ -64,6 +77,10 @@ class BookStoreScraperService:
             bookstore_isbn_css_selector=bookstore.isbn_css_selector,
             search_result_css_selector=bookstore.search_result_css_selector,
             bookstore_api_key=bookstore.api_key,
-            currency_converter=currency_converter)
+            currency_converter=currency_converter,
+            http_validator_store=self._http_validator_store,
+            token_bucket_store=self._token_bucket_store,
+            requests_per_second=requests_per_second,
+            use_structured_data=bookstore.use_structured_data)
 
         return scraper_class(configuration)
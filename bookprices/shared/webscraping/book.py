@@ -9,6 +9,7 @@ from dataclasses import dataclass, replace
 from bookprices.shared.webscraping.content import HtmlContent
 from bookprices.shared.webscraping.headers import HTTP_HEADERS_FOR_SAXO
 from bookprices.shared.webscraping.http import HttpClient, HttpResponse, RateLimiter
+from bookprices.shared.webscraping.parse_pool import parse_pool
 
 REDIRECTED_PERMANENT = 301
 REDIRECTED_TEMPORARY = 302
@@ -74,8 +75,7 @@ class RedirectsToDetailPageBookScraper(BookScraper):
         if isbn in response.url:
             return True
 
-        response_bs = HtmlContent(response.text)
-        if not (isbn_element := response_bs.find_element_text_by_css(self._isbn_css_selector)):
+        if not (isbn_element := parse_pool.find_element_text_by_css(response.text, self._isbn_css_selector)):
             self._logger.error(
                 f"No matches for ISBN CSS selector in the response body ({response.url, self._isbn_css_selector})")
             return False
@@ -96,9 +96,10 @@ class RateLimitedRedirectsToDetailPageBookScraper(RedirectsToDetailPageBookScrap
             search_url: str,
             isbn_css_selector: str,
             max_requests: int,
-            period_seconds: int) -> None:
+            period_seconds: int,
+            rate_limiter: RateLimiter | None = None) -> None:
         super().__init__(bookstore_id, bookstore_url, search_url, isbn_css_selector)
-        self._rate_limiter = RateLimiter(max_requests, period_seconds)
+        self._rate_limiter = rate_limiter or RateLimiter(max_requests, period_seconds)
         self._logger = logging.getLogger(self.__class__.__name__)
 
     def find_book(self, isbn: str) -> SearchResult:
@@ -151,9 +152,8 @@ class MatchesInResultListBookScraper(BookScraper):
         return search_result
 
     def _get_match_url(self, response: HttpResponse) -> str | None:
-        content_bs = HtmlContent(response.text)
-        if not (match_url := content_bs.find_element_and_get_attribute_value(
-                self._search_result_css_selector, self._href_tag)):
+        if not (match_url := parse_pool.find_element_and_get_attribute_value(
+                response.text, self._search_result_css_selector, self._href_tag)):
             self._logger.error(
                 f"Couldn't find match url in the search results ({response.url, self._search_result_css_selector}).")
             return None
@@ -167,8 +167,7 @@ class MatchesInResultListBookScraper(BookScraper):
             if response.redirected:
                 self._logger.warning(f"Match URL {match_url} redirected to {response.url}.")
 
-        content_bs = HtmlContent(response.text)
-        if not (isbn_element := content_bs.find_element_text_by_css(self._isbn_css_selector)):
+        if not (isbn_element := parse_pool.find_element_text_by_css(response.text, self._isbn_css_selector)):
             self._logger.error(
                 f"No matches for ISBN CSS selector in the response body ({response.url, self._isbn_css_selector})")
             return False
@@ -187,14 +186,15 @@ class RateLimitedMatchesInResultListBookScraper(MatchesInResultListBookScraper):
             search_result_css_selector: str,
             isbn_css_selector: str,
             max_requests: int,
-            period_seconds: int) -> None:
+            period_seconds: int,
+            rate_limiter: RateLimiter | None = None) -> None:
         super().__init__(
             bookstore_id,
             bookstore_url,
             search_url,
             search_result_css_selector,
             isbn_css_selector)
-        self._rate_limiter = RateLimiter(max_requests, period_seconds)
+        self._rate_limiter = rate_limiter or RateLimiter(max_requests, period_seconds)
         self._logger = logging.getLogger(self.__class__.__name__)
 
     def find_book(self, isbn: str) -> SearchResult:
@@ -362,9 +362,8 @@ class BogOgIdeBookScraper(BookScraper):
     def _is_match_url_valid(match_url: str, isbn: str) -> bool:
         with HttpClient() as http_client:
             response = http_client.get(match_url)
-            html_content = HtmlContent(response.text)
 
-            return html_content.contains_text(isbn)
+        return parse_pool.contains_text(response.text, isbn)
 
     @staticmethod
     def _create_json_payload(isbn: str) ->  str:
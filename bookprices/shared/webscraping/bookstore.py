@@ -8,8 +8,11 @@ from bookprices.shared.webscraping.book import (
     RateLimitedMatchesInResultListBookScraper, PlusbogBookScraper, BogOgIdeBookScraper, SaxoBookScraper)
 from bookprices.shared.webscraping.currency import CurrencyConverter
 from bookprices.shared.webscraping.http import RateLimiter
+from bookprices.shared.webscraping.rate_limit import AdaptiveTokenBucketRateLimiter, AdaptiveRate, TokenBucketStore
+from bookprices.shared.webscraping.validator_store import HttpValidatorStore
 from bookprices.shared.webscraping.price import (
-    PriceScraper, StaticHtmlPriceScraper, RateLimitedStaticHtmlPriceScraper, GuccaStaticHtmlPriceScraper)
+    PriceScraper, StaticHtmlPriceScraper, RateLimitedStaticHtmlPriceScraper, GuccaStaticHtmlPriceScraper,
+    PriceSourceStatistics)
 
 FALLBACK_PRICE_FORMAT = r".*"
 
@@ -37,6 +40,10 @@ class BookStoreConfiguration:
     search_result_css_selector: str | None
     bookstore_api_key: str | None
     currency_converter: CurrencyConverter
+    http_validator_store: HttpValidatorStore | None = None
+    token_bucket_store: TokenBucketStore | None = None
+    requests_per_second: float | None = None
+    use_structured_data: bool = False
 
 
 class BookStoreScraper(ABC):
@@ -54,6 +61,40 @@ class BookStoreScraper(ABC):
     def get_price(self, url: str) -> float:
         raise NotImplementedError
 
+    def forget_price_validators(self, url: str) -> None:
+        """ Makes the next get_price for the URL download the page in full, even if it hasn't changed. """
+        pass
+
+    def get_price_rate_limiter(self) -> RateLimiter | None:
+        """ Returns the rate limiter applied to get_price, if the bookstore limits price requests. """
+        return None
+
+    def get_price_source_statistics(self) -> PriceSourceStatistics | None:
+        """ Returns how many prices get_price has found with each price source, if the scraper counts them. """
+        return None
+
+    def get_request_rate(self) -> AdaptiveRate | None:
+        """ Returns the rate the price rate limiter has adapted to, if the bookstore limits price requests. """
+        if isinstance(rate_limiter := self.get_price_rate_limiter(), AdaptiveTokenBucketRateLimiter):
+            return rate_limiter.get_rate()
+        return None
+
+    @property
+    def bookstore_name(self) -> str:
+        return self._configuration.bookstore_name
+
+    def _create_rate_limiter(self, max_requests: int, period_seconds: int) -> RateLimiter:
+        """
+        All rate limiters for a bookstore share the bookstore's token bucket, also across job runners. The bucket
+        refills at a rate adapted to how the bookstore responds, starting from the rate learned in the last run.
+        """
+        return AdaptiveTokenBucketRateLimiter(
+            f"bookstore_{self._configuration.bookstore_id}",
+            max_requests,
+            period_seconds,
+            self._configuration.token_bucket_store,
+            self._configuration.requests_per_second)
+
     @classmethod
     @abstractmethod
     def get_name(cls) -> str:
@@ -67,13 +108,17 @@ class StaticBookStoreScraper(BookStoreScraper):
     that the request is redirected to the book detail page when searching for a book by ISBN
     """
     _price_format_fallback: ClassVar[str] = FALLBACK_PRICE_FORMAT
+    _max_price_page_bytes: ClassVar[int | None] = None
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
         self._logger = getLogger(self.__class__.__name__)
         self._price_scraper: PriceScraper = StaticHtmlPriceScraper(
             configuration.bookstore_price_css_selector,
-            configuration.bookstore_price_format)
+            configuration.bookstore_price_format,
+            configuration.http_validator_store,
+            self._max_price_page_bytes,
+            configuration.use_structured_data)
 
         self._book_scraper = RedirectsToDetailPageBookScraper(
             configuration.bookstore_id,
@@ -91,6 +136,15 @@ class StaticBookStoreScraper(BookStoreScraper):
     def get_price(self, url: str) -> float:
         return self._price_scraper.get_price(url)
 
+    def forget_price_validators(self, url: str) -> None:
+        self._price_scraper.forget_validators(url)
+
+    def get_price_rate_limiter(self) -> RateLimiter | None:
+        return self._price_scraper.rate_limiter
+
+    def get_price_source_statistics(self) -> PriceSourceStatistics | None:
+        return self._price_scraper.price_source_statistics
+
     @classmethod
     def get_name(cls) -> str:
         return cls.__name__
@@ -103,19 +157,25 @@ class WilliamDamScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = RateLimitedRedirectsToDetailPageBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
             configuration.bookstore_search_url,
             configuration.bookstore_isbn_css_selector,
             self._max_requests_per_period,
-            self._period_seconds)
+            self._period_seconds,
+            rate_limiter=self._rate_limiter)
 
         self._price_scraper = RateLimitedStaticHtmlPriceScraper(
             configuration.bookstore_price_css_selector,
             configuration.bookstore_price_format,
             self._max_requests_per_period,
-            self._period_seconds)
+            self._period_seconds,
+            configuration.http_validator_store,
+            self._max_price_page_bytes,
+            self._rate_limiter,
+            configuration.use_structured_data)
 
 
 class SaxoScraper(StaticBookStoreScraper):
@@ -125,17 +185,22 @@ class SaxoScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = SaxoBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
             configuration.bookstore_search_url,
-            RateLimiter(self._max_requests_per_period, self._period_seconds))
+            self._rate_limiter)
 
         self._price_scraper = RateLimitedStaticHtmlPriceScraper(
             configuration.bookstore_price_css_selector,
             configuration.bookstore_price_format,
             self._max_requests_per_period,
-            self._period_seconds)
+            self._period_seconds,
+            configuration.http_validator_store,
+            self._max_price_page_bytes,
+            self._rate_limiter,
+            configuration.use_structured_data)
 
 
 class BogOgIdeScraper(StaticBookStoreScraper):
@@ -145,7 +210,7 @@ class BogOgIdeScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
-        self._rate_limiter = RateLimiter(self._max_requests_per_period, self._period_seconds)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = BogOgIdeBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
@@ -162,7 +227,7 @@ class PlusbogScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
-        self._rate_limiter = RateLimiter(self._max_requests_per_period, self._period_seconds)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = PlusbogBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
@@ -178,6 +243,7 @@ class GuccaScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = RateLimitedMatchesInResultListBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
@@ -185,14 +251,19 @@ class GuccaScraper(StaticBookStoreScraper):
             configuration.search_result_css_selector,
             configuration.bookstore_isbn_css_selector,
             max_requests=self._max_requests_per_period,
-            period_seconds=self._period_seconds)
+            period_seconds=self._period_seconds,
+            rate_limiter=self._rate_limiter)
 
         self._price_scraper = GuccaStaticHtmlPriceScraper(
             configuration.bookstore_price_css_selector,
             configuration.bookstore_price_format,
             self._max_requests_per_period,
             self._period_seconds,
-            configuration.currency_converter)
+            configuration.currency_converter,
+            configuration.http_validator_store,
+            self._max_price_page_bytes,
+            self._rate_limiter,
+            configuration.use_structured_data)
 
 
 class CSalgScraper(StaticBookStoreScraper):
@@ -202,6 +273,7 @@ class CSalgScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = RateLimitedMatchesInResultListBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
@@ -209,7 +281,8 @@ class CSalgScraper(StaticBookStoreScraper):
             configuration.search_result_css_selector,
             configuration.bookstore_isbn_css_selector,
             max_requests=self._max_requests_per_period,
-            period_seconds=self._period_seconds)
+            period_seconds=self._period_seconds,
+            rate_limiter=self._rate_limiter)
 
 
 class IMusicScraper(StaticBookStoreScraper):
@@ -219,13 +292,15 @@ class IMusicScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = RateLimitedRedirectsToDetailPageBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
             configuration.bookstore_search_url,
             configuration.bookstore_isbn_css_selector,
             max_requests=self._max_requests_per_period,
-            period_seconds=self._period_seconds)
+            period_seconds=self._period_seconds,
+            rate_limiter=self._rate_limiter)
 
 
 class AcademicBooksScraper(StaticBookStoreScraper):
@@ -235,6 +310,7 @@ class AcademicBooksScraper(StaticBookStoreScraper):
 
     def  __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = RateLimitedMatchesInResultListBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
@@ -242,7 +318,8 @@ class AcademicBooksScraper(StaticBookStoreScraper):
             configuration.search_result_css_selector,
             configuration.bookstore_isbn_css_selector,
             max_requests=self._max_requests_per_period,
-            period_seconds=self._period_seconds)
+            period_seconds=self._period_seconds,
+            rate_limiter=self._rate_limiter)
 
 
 class DinBoghandelScraper(StaticBookStoreScraper):
@@ -252,6 +329,7 @@ class DinBoghandelScraper(StaticBookStoreScraper):
 
     def __init__(self, configuration: BookStoreConfiguration) -> None:
         super().__init__(configuration)
+        self._rate_limiter = self._create_rate_limiter(self._max_requests_per_period, self._period_seconds)
         self._book_scraper = RateLimitedMatchesInResultListBookScraper(
             configuration.bookstore_id,
             configuration.bookstore_url,
@@ -259,4 +337,5 @@ class DinBoghandelScraper(StaticBookStoreScraper):
             configuration.search_result_css_selector,
             configuration.bookstore_isbn_css_selector,
             max_requests=self._max_requests_per_period,
-            period_seconds=self._period_seconds)
+            period_seconds=self._period_seconds,
+            rate_limiter=self._rate_limiter)
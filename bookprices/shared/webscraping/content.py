@@ -1,13 +1,46 @@
+import logging
+from enum import StrEnum
+from importlib.util import find_spec
 from typing import ClassVar
 
 from bs4 import BeautifulSoup
 
 
+class HtmlParserBackend(StrEnum):
+    HTML_PARSER = "html.parser"
+    LXML = "lxml"
+
+    @property
+    def is_available(self) -> bool:
+        return self == HtmlParserBackend.HTML_PARSER or find_spec(self.value) is not None
+
+
 class HtmlContent:
-    _html_parser: ClassVar[str] = "html.parser"
+    """
+    Parses HTML with the default parser backend unless another one is given. Only the tree is built by the backend,
+    CSS selectors are matched the same way for all backends.
+    """
+    default_parser_backend: ClassVar[HtmlParserBackend] = HtmlParserBackend.HTML_PARSER
+
+    def __init__(self, html_content: str, parser_backend: HtmlParserBackend | None = None) -> None:
+        self._html_content_bs = BeautifulSoup(html_content, parser_backend or self.default_parser_backend)
 
-    def __init__(self, html_content: str) -> None:
-        self._html_content_bs = BeautifulSoup(html_content, self._html_parser)
+    @classmethod
+    def set_default_parser_backend(cls, name: str | None) -> HtmlParserBackend:
+        """ Falls back to html.parser if the backend is unknown or not installed. """
+        logger = logging.getLogger(cls.__name__)
+        try:
+            parser_backend = HtmlParserBackend(name) if name else HtmlParserBackend.HTML_PARSER
+        except ValueError:
+            logger.warning(f"Unknown HTML parser backend {name}. Using {HtmlParserBackend.HTML_PARSER}")
+            parser_backend = HtmlParserBackend.HTML_PARSER
+
+        if not parser_backend.is_available:
+            logger.warning(f"HTML parser backend {parser_backend} isn't installed. Using {HtmlParserBackend.HTML_PARSER}")
+            parser_backend = HtmlParserBackend.HTML_PARSER
+
+        cls.default_parser_backend = parser_backend
+        return parser_backend
 
     def find_elements_by_css_and_get_attribute_values(self, css_selector: str, attribute_name: str) -> list[str]:
         return [
@@ -24,6 +57,43 @@ class HtmlContent:
         match = self._html_content_bs.select_one(css_selector)
         return match.get_text() if match else None
 
+    def find_element_text_without_child_by_css(self, css_selector: str, child_css_selector: str) -> str | None:
+        """ Returns the text of the element with the text of its first child matching child_css_selector removed. """
+        if not (match := self._html_content_bs.select_one(css_selector)):
+            return None
+
+        text = match.get_text()
+        if child := match.select_one(child_css_selector):
+            text = text.replace(child.get_text(), "")
+
+        return text
+
+    def find_elements_by_css_and_get_child_texts(
+            self, css_selector: str, child_css_selector: str) -> list[tuple[str, str | None]]:
+        """ Returns the text of each element along with the text of its first child matching child_css_selector. """
+        texts = []
+        for match in self._html_content_bs.select(css_selector):
+            child = match.select_one(child_css_selector)
+            texts.append((match.get_text(), child.get_text() if child else None))
+
+        return texts
+
+    def contains_closed_element_by_css(self, css_selector: str) -> bool:
+        """
+        Returns True if an element matches and is followed by another element, so the element is known to be
+        complete even if the HTML has been cut off.
+        """
+        if not (match := self._html_content_bs.select_one(css_selector)):
+            return False
+
+        element = match
+        while element is not None:
+            if element.find_next_sibling() is not None:
+                return True
+            element = element.parent
+
+        return False
+
     def find_element_by_css(self, css_selector) -> str | None:
         match = self._html_content_bs.select_one(css_selector)
         return str(match) if match else None
@@ -1,23 +1,57 @@
+import codecs
 import dataclasses
 import json
 from collections import deque
 from enum import StrEnum
+from http import HTTPStatus
 from threading import Lock
-from typing import ClassVar
+from typing import ClassVar, Callable, Iterator
 from random import getrandbits
 from time import monotonic, sleep
 
 import requests
 from logging import getLogger
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
 
 
 class RequestFailedError(Exception):
     pass
 
 
+def is_overload_error(error: BaseException) -> bool:
+    """
+    Whether the error, or an error it was raised from, shows that the server is overloaded: it answered 429 or 5xx,
+    timed out or dropped the connection.
+    """
+    seen_errors = set()
+    while error is not None and id(error) not in seen_errors:
+        seen_errors.add(id(error))
+        if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return (error.response.status_code == HTTPStatus.TOO_MANY_REQUESTS or
+                    error.response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR)
+        error = error.__cause__ or error.__context__
+
+    return False
+
+
 class HttpHeaderName(StrEnum):
     USER_AGENT = "User-Agent"
     ACCEPT = "Accept"
+    ETAG = "ETag"
+    LAST_MODIFIED = "Last-Modified"
+    IF_NONE_MATCH = "If-None-Match"
+    IF_MODIFIED_SINCE = "If-Modified-Since"
+    CONTENT_LENGTH = "Content-Length"
+
+
+@dataclasses.dataclass(frozen=True)
+class HttpValidators:
+    """ Validators from a previous response, used to make a conditional request. """
+    etag: str | None = None
+    last_modified: str | None = None
 
 
 @dataclasses.dataclass(frozen=True)
@@ -26,32 +60,138 @@ class HttpResponse:
     status_code: int
     url: str
     text: str
+    validators: HttpValidators | None = None
+    complete: bool = True
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@dataclasses.dataclass(frozen=True)
+class HttpSessionPoolStatistics:
+    hosts: int
+    connections_opened: int
+    requests_sent: int
+
+    @property
+    def requests_per_connection(self) -> float:
+        return self.requests_sent / self.connections_opened if self.connections_opened else 0.0
+
+
+class HttpSessionPool:
+    """
+    Thread-safe pool of keep-alive sessions, one per host, so requests to the same bookstore reuse connections
+    instead of opening a new connection (and TLS handshake) for every request.
+    """
+    default_connections_per_host: ClassVar[int] = 10
+
+    def __init__(self, connections_per_host: int | None = None) -> None:
+        self._connections_per_host = connections_per_host or self.default_connections_per_host
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        host = urlparse(url).netloc
+        with self._lock:
+            if not (session := self._sessions.get(host)):
+                session = self._create_session()
+                self._sessions[host] = session
+
+        return session
+
+    def get_statistics(self) -> HttpSessionPoolStatistics:
+        connections_opened, requests_sent = 0, 0
+        with self._lock:
+            sessions = list(self._sessions.values())
+
+        for session in sessions:
+            # The same adapter is mounted for both http:// and https://
+            adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+            for adapter in adapters.values():
+                for connection_pool in self._get_connection_pools(adapter):
+                    connections_opened += connection_pool.num_connections
+                    requests_sent += connection_pool.num_requests
+
+        return HttpSessionPoolStatistics(
+            hosts=len(sessions), connections_opened=connections_opened, requests_sent=requests_sent)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._connections_per_host)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    @staticmethod
+    def _get_connection_pools(adapter) -> list:
+        if not (pool_manager := getattr(adapter, "poolmanager", None)):
+            return []
+
+        return [pool for key in pool_manager.pools.keys() if (pool := pool_manager.pools.get(key)) is not None]
+
+
+session_pool = HttpSessionPool()
 
 
 class HttpClient:
-    """ Wrapper for requests library """
+    """ Wrapper for requests library. Requests use the keep-alive sessions from the shared session pool. """
     _default_timeout_seconds: ClassVar[int] = 5
+    _stream_chunk_size: ClassVar[int] = 8 * 1024
+    _stream_first_check_bytes: ClassVar[int] = 32 * 1024
+    _max_drain_bytes: ClassVar[int] = 256 * 1024
 
-    def __init__(self, headers: dict[str, str] | None = None, timeout_seconds: int | None = None) -> None:
+    def __init__(
+            self,
+            headers: dict[str, str] | None = None,
+            timeout_seconds: int | None = None,
+            http_session_pool: HttpSessionPool | None = None) -> None:
         self._logger = getLogger(self.__class__.__name__)
-        self._session = requests.Session()
+        self._session_pool = http_session_pool or session_pool
         self._timeout_seconds = timeout_seconds if timeout_seconds is not None else self._default_timeout_seconds
 
-        merged_request_headers = self._get_default_headers(headers)
-        merged_request_headers.update(headers or {})
-        self._session.headers.update(merged_request_headers)
+        self._headers = self._get_default_headers(headers)
+        self._headers.update(headers or {})
 
-    def get(self, url: str) -> HttpResponse:
+    def get(
+            self,
+            url: str,
+            validators: HttpValidators | None = None,
+            stop_when: Callable[[str], bool] | None = None,
+            max_bytes: int | None = None) -> HttpResponse:
+        """
+        With validators, the request is conditional and the response is not_modified if the page is unchanged.
+        With stop_when or max_bytes, the body is streamed and reading stops as soon as stop_when returns True for the
+        text read so far or max_bytes have been read. The response is then not complete.
+        """
+        streamed = stop_when is not None or max_bytes is not None
         try:
-            response = self._session.get(url, timeout=self._timeout_seconds)
+            session = self._session_pool.get_session(url)
+            response = session.get(
+                url, headers=self._create_request_headers(validators), timeout=self._timeout_seconds, stream=streamed)
+            if streamed:
+                text, complete = self._read_text(response, stop_when, max_bytes)
+            else:
+                text, complete = response.text, True
             response.raise_for_status()
             redirected = response.history != []
 
             return HttpResponse(
                 redirected=redirected,
                 status_code=response.status_code,
-                text=response.text,
-                url=response.url
+                text=text,
+                url=response.url,
+                validators=self._get_validators(response),
+                complete=complete
             )
         except requests.RequestException as e:
             self._logger.exception(f"HTTP GET request to {url} failed: {e}")
@@ -59,7 +199,8 @@ class HttpClient:
 
     def post(self, url: str, payload: dict | str) -> HttpResponse:
         try:
-            response = self._session.post(url, payload, timeout=self._timeout_seconds)
+            session = self._session_pool.get_session(url)
+            response = session.post(url, payload, headers=self._headers, timeout=self._timeout_seconds)
             response.raise_for_status()
             redirected = response.history != []
 
@@ -74,16 +215,86 @@ class HttpClient:
             raise RequestFailedError from e
 
     def close_session(self) -> None:
-        self._session.close()
+        """ Sessions are shared, so they are kept open for the next client. """
+        pass
 
     def __enter__(self) -> "HttpClient":
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close_session()
+
+    def _read_text(
+            self,
+            response: requests.Response,
+            stop_when: Callable[[str], bool] | None,
+            max_bytes: int | None) -> tuple[str, bool]:
+        """
+        stop_when is called each time the text read has doubled in size, so calling it costs at most about twice as
+        much as calling it once on the full text.
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        text_parts, bytes_read, next_check_bytes = [], 0, self._stream_first_check_bytes
+        chunks = response.iter_content(self._stream_chunk_size)
+        try:
+            for chunk in chunks:
+                bytes_read += len(chunk)
+                text_parts.append(decoder.decode(chunk))
+                if max_bytes is not None and bytes_read >= max_bytes:
+                    self._logger.debug(f"Stopped reading {response.url} after {bytes_read} bytes (max {max_bytes})")
+                    return "".join(text_parts), False
+                if stop_when and bytes_read >= next_check_bytes:
+                    next_check_bytes = bytes_read * 2
+                    if stop_when(text := "".join(text_parts)):
+                        self._logger.debug(f"Stopped reading {response.url} after {bytes_read} bytes")
+                        return text, False
+
+            text_parts.append(decoder.decode(b"", final=True))
+            return "".join(text_parts), True
+        finally:
+            self._release_connection(response, chunks)
+
+    def _release_connection(self, response: requests.Response, chunks: Iterator[bytes]) -> None:
+        """
+        After an early stop, the rest of a small body is read and discarded, so the keep-alive connection goes back to
+        the pool. If more than _max_drain_bytes are left, or the length is unknown, the connection is closed instead.
+        """
         try:
-            self._session.close()
-        except Exception as e:
-            self._logger.error(f"Failed to close HTTP session: {e}")
+            if (unread_bytes := self._get_unread_bytes(response)) is not None and unread_bytes <= self._max_drain_bytes:
+                for _ in chunks:
+                    pass
+        except requests.RequestException as ex:
+            self._logger.debug(f"Failed to read the rest of {response.url}: {ex}")
+        finally:
+            # Connections with unread data are discarded instead of being returned to the pool
+            response.close()
+
+    @staticmethod
+    def _get_unread_bytes(response: requests.Response) -> int | None:
+        content_length = response.headers.get(HttpHeaderName.CONTENT_LENGTH, "")
+        if not content_length.isdigit():
+            return None
+        # The bytes read from the connection, which differ from the decoded bytes if the body is compressed
+        return int(content_length) - response.raw.tell()
+
+    def _create_request_headers(self, validators: HttpValidators | None) -> dict[str, str]:
+        if not validators:
+            return self._headers
+
+        headers = dict(self._headers)
+        if validators.etag:
+            headers[HttpHeaderName.IF_NONE_MATCH] = validators.etag
+        if validators.last_modified:
+            headers[HttpHeaderName.IF_MODIFIED_SINCE] = validators.last_modified
+
+        return headers
+
+    @staticmethod
+    def _get_validators(response: requests.Response) -> HttpValidators | None:
+        etag = response.headers.get(HttpHeaderName.ETAG)
+        last_modified = response.headers.get(HttpHeaderName.LAST_MODIFIED)
+
+        return HttpValidators(etag=etag, last_modified=last_modified) if etag or last_modified else None
 
     @classmethod
     def _get_default_headers(cls, custom_headers: dict[str, str] | None) -> dict[str, str]:
@@ -115,6 +326,23 @@ class RateLimiter:
         self._lock = Lock()
         self._logger = getLogger(self.__class__.__name__)
 
+    @property
+    def request_count(self) -> int:
+        return self._request_count
+
+    @property
+    def seconds(self) -> int:
+        return self._seconds
+
+    @property
+    def max_request_count(self) -> int:
+        """ The most requests let through per period. Rate limiters that adapt their rate may exceed request_count. """
+        return self._request_count
+
+    def add_response(self, latency_seconds: float, overloaded: bool) -> None:
+        """ Reports how a request made after waiting went. Ignored unless the rate limiter adapts its rate. """
+        pass
+
     def wait_if_needed(self) -> None:
         while True:
             with self._lock:
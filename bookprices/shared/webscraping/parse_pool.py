@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from logging import getLogger
+from threading import Lock
+from typing import Callable, TypeVar
+
+from bookprices.shared.webscraping.content import HtmlContent, HtmlParserBackend
+
+T = TypeVar("T")
+
+
+def find_element_text_by_css(html: str, css_selector: str) -> str | None:
+    return HtmlContent(html).find_element_text_by_css(css_selector)
+
+
+def find_element_and_get_attribute_value(html: str, css_selector: str, attribute_name: str) -> str | None:
+    return HtmlContent(html).find_element_and_get_attribute_value(css_selector, attribute_name)
+
+
+def contains_closed_element_by_css(html: str, css_selector: str) -> bool:
+    return HtmlContent(html).contains_closed_element_by_css(css_selector)
+
+
+def contains_text(html: str, text: str) -> bool:
+    return HtmlContent(html).contains_text(text)
+
+
+def _set_parser_backend(parser_backend: HtmlParserBackend) -> None:
+    HtmlContent.default_parser_backend = parser_backend
+
+
+class HtmlParsePool:
+    """
+    Parses HTML in worker processes, so threads waiting for HTTP responses don't compete with parsing for the GIL.
+    Until the pool has been started, functions run in the calling thread.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+        self._logger = getLogger(self.__class__.__name__)
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self, process_count: int | None = None) -> int:
+        """ Starts process_count worker processes, or one per CPU core. Returns the number of processes. """
+        process_count = process_count or os.cpu_count() or 1
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown()
+            # Worker processes are spawned, as forking a process with running threads isn't safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=process_count,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_set_parser_backend,
+                initargs=(HtmlContent.default_parser_backend,))
+
+        self._logger.info(f"Parsing HTML in {process_count} processes")
+        return process_count
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown()
+
+    def run(self, function: Callable[..., T], *args) -> T:
+        """ Runs the function in a worker process. The function and its arguments must be picklable. """
+        if not (executor := self._executor):
+            return function(*args)
+
+        return executor.submit(function, *args).result()
+
+    def find_element_text_by_css(self, html: str, css_selector: str) -> str | None:
+        return self.run(find_element_text_by_css, html, css_selector)
+
+    def find_element_and_get_attribute_value(self, html: str, css_selector: str, attribute_name: str) -> str | None:
+        return self.run(find_element_and_get_attribute_value, html, css_selector, attribute_name)
+
+    def contains_closed_element_by_css(self, html: str, css_selector: str) -> bool:
+        return self.run(contains_closed_element_by_css, html, css_selector)
+
+    def contains_text(self, html: str, text: str) -> bool:
+        return self.run(contains_text, html, text)
+
+
+parse_pool = HtmlParsePool()
@@ -1,11 +1,17 @@
 import logging
 import re
 from abc import ABC, abstractmethod
+from collections import Counter
+from enum import StrEnum
+from threading import Lock
+from time import monotonic
 from typing import ClassVar
 
-from bookprices.shared.webscraping.content import HtmlContent
 from bookprices.shared.webscraping.currency import CurrencyConverter
-from bookprices.shared.webscraping.http import HttpClient, RequestFailedError, RateLimiter
+from bookprices.shared.webscraping.http import HttpClient, RequestFailedError, RateLimiter, is_overload_error
+from bookprices.shared.webscraping.parse_pool import parse_pool
+from bookprices.shared.webscraping.structured_data import OfferPrice, find_offer_price
+from bookprices.shared.webscraping.validator_store import HttpValidatorStore
 
 FALLBACK_PRICE_FORMAT = r".*"
 
@@ -26,6 +32,32 @@ class PriceFinderConnectionError(Exception):
     pass
 
 
+class PriceNotModifiedException(Exception):
+    """ The page hasn't changed since the price was last found, so the price is unchanged. """
+    pass
+
+
+class PriceSource(StrEnum):
+    STRUCTURED_DATA = "structured data"
+    CSS_SELECTOR = "CSS selector"
+
+
+class PriceSourceStatistics:
+    """ Counts how many prices were found with each price source. Safe to update from several threads. """
+
+    def __init__(self) -> None:
+        self._counts = Counter()
+        self._lock = Lock()
+
+    def add(self, price_source: PriceSource) -> None:
+        with self._lock:
+            self._counts[price_source] += 1
+
+    def get_counts(self) -> dict[PriceSource, int]:
+        with self._lock:
+            return {price_source: self._counts[price_source] for price_source in PriceSource}
+
+
 class PriceScraper(ABC):
     """ Abstract base class for price scrapers."""
     def __init__(self) -> None:
@@ -35,30 +67,109 @@ class PriceScraper(ABC):
     def get_price(self, url: str) -> float:
         raise NotImplementedError
 
+    def forget_validators(self, url: str) -> None:
+        """ Makes the next request for the page unconditional, if the scraper sends conditional requests. """
+        pass
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        return None
+
+    @property
+    def price_source_statistics(self) -> PriceSourceStatistics | None:
+        return None
+
 
 class StaticHtmlPriceScraper(PriceScraper):
-    """ Price scraper for static HTML content. """
+    """
+    Price scraper for static HTML content. With use_structured_data, the price is read from schema.org offer data
+    in the page if there is any, so the page only has to be parsed when the price is found with the CSS selector.
+    The page is downloaded until the price has been found or max_page_bytes have been read.
+    """
+    _structured_data_currency: ClassVar[str] = "DKK"
+    _structured_data_requires_currency: ClassVar[bool] = False
+    default_max_page_bytes: ClassVar[int] = 2 * 1024 * 1024
 
-    def __init__(self, price_css_selector: str, price_format: str | None) -> None:
+    def __init__(
+            self,
+            price_css_selector: str,
+            price_format: str | None,
+            validator_store: HttpValidatorStore | None = None,
+            max_page_bytes: int | None = None,
+            use_structured_data: bool = False) -> None:
         super().__init__()
         self._price_css_selector = price_css_selector
         self._price_format = price_format or FALLBACK_PRICE_FORMAT
+        self._validator_store = validator_store
+        self._max_page_bytes = max_page_bytes or self.default_max_page_bytes
+        self._use_structured_data = use_structured_data
+        self._price_source_statistics = PriceSourceStatistics()
         self._logger = logging.getLogger(self.__class__.__name__)
 
+    @property
+    def price_source_statistics(self) -> PriceSourceStatistics | None:
+        return self._price_source_statistics
+
+    def forget_validators(self, url: str) -> None:
+        if self._validator_store:
+            self._validator_store.delete(url)
+
     def get_price(self, url: str) -> float:
-        with HttpClient() as http_client:
-            try:
-                response = http_client.get(url)
-                if response.text:
-                    return self._parse_price(response.text)
+        """
+        With a validator store, the page is requested conditionally and PriceNotModifiedException is raised if it
+        hasn't changed. Validators are only saved after the price has been found on the page.
+        """
+        try:
+            validators = self._validator_store.get(url) if self._validator_store else None
+            response = self._http_client.get(url, validators, self._contains_price, self._max_page_bytes)
+            if response.not_modified:
+                raise PriceNotModifiedException
+            if not response.text:
                 raise PriceNotFoundException
-            except RequestFailedError as ex:
-                raise PriceNotFoundException from ex
+
+            price = self._parse_price(response.text)
+            if self._validator_store and response.validators:
+                self._validator_store.set(url, response.validators)
+
+            return price
+        except RequestFailedError as ex:
+            raise PriceNotFoundException from ex
 
     def _parse_price(self, response_text: str) -> float:
-        html_content = HtmlContent(response_text)
-        if not (
-        price_text := html_content.find_element_text_by_css(self._price_css_selector)):
+        if (price := self._find_structured_data_price(response_text)) is not None:
+            self._price_source_statistics.add(PriceSource.STRUCTURED_DATA)
+            return price
+
+        price = self._parse_price_with_css_selector(response_text)
+        self._price_source_statistics.add(PriceSource.CSS_SELECTOR)
+        return price
+
+    def _contains_price(self, partial_response_text: str) -> bool:
+        if self._find_structured_data_price(partial_response_text) is not None:
+            return True
+
+        return parse_pool.contains_closed_element_by_css(partial_response_text, self._price_css_selector)
+
+    def _find_structured_data_price(self, response_text: str) -> float | None:
+        if not self._use_structured_data or not (offer_price := find_offer_price(response_text)):
+            return None
+
+        return self._convert_offer_price(offer_price)
+
+    def _convert_offer_price(self, offer_price: OfferPrice) -> float | None:
+        """
+        Returns the price in DKK, or None if the currency isn't supported. A price without a currency is taken to be
+        in DKK, unless the book store also shows prices in other currencies.
+        """
+        if not offer_price.currency:
+            return None if self._structured_data_requires_currency else offer_price.price
+        if offer_price.currency.upper() != self._structured_data_currency:
+            return None
+
+        return offer_price.price
+
+    def _parse_price_with_css_selector(self, response_text: str) -> float:
+        if not (price_text := parse_pool.find_element_text_by_css(response_text, self._price_css_selector)):
             raise PriceSelectorError
 
         if not (price_match := re.search(self._price_format, price_text)):
@@ -79,19 +190,37 @@ class RateLimitedStaticHtmlPriceScraper(StaticHtmlPriceScraper):
             price_css_selector: str,
             price_format: str | None,
             max_requests: int,
-            period_seconds: int) -> None:
-        super().__init__(price_css_selector, price_format)
-        self._rate_limiter = RateLimiter(max_requests, period_seconds)
+            period_seconds: int,
+            validator_store: HttpValidatorStore | None = None,
+            max_page_bytes: int | None = None,
+            rate_limiter: RateLimiter | None = None,
+            use_structured_data: bool = False) -> None:
+        super().__init__(price_css_selector, price_format, validator_store, max_page_bytes, use_structured_data)
+        self._rate_limiter = rate_limiter or RateLimiter(max_requests, period_seconds)
         self._logger = logging.getLogger(self.__class__.__name__)
 
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        return self._rate_limiter
+
     def get_price(self, url: str) -> float:
+        """ Reports the response time and whether the bookstore was overloaded to the rate limiter. """
         self._rate_limiter.wait_if_needed()
-        return super().get_price(url)
+        started = monotonic()
+        try:
+            price = super().get_price(url)
+        except Exception as ex:
+            self._rate_limiter.add_response(monotonic() - started, is_overload_error(ex))
+            raise
+
+        self._rate_limiter.add_response(monotonic() - started, overloaded=False)
+        return price
 
 
 class GuccaStaticHtmlPriceScraper(RateLimitedStaticHtmlPriceScraper):
-    """ Price scraper for Gucca.dk bookstore. """
+    """ Price scraper for Gucca.dk bookstore. Prices may be in SEK, so offer data must state the currency. """
     _sek_currency_code: ClassVar[str] = "SEK"
+    _structured_data_requires_currency: ClassVar[bool] = True
 
     def __init__(
             self,
@@ -99,14 +228,24 @@ class GuccaStaticHtmlPriceScraper(RateLimitedStaticHtmlPriceScraper):
             price_format: str | None,
             max_requests: int,
             period_seconds: int,
-            currency_converter: CurrencyConverter) -> None:
-        super().__init__(price_css_selector, price_format, max_requests, period_seconds)
+            currency_converter: CurrencyConverter,
+            validator_store: HttpValidatorStore | None = None,
+            max_page_bytes: int | None = None,
+            rate_limiter: RateLimiter | None = None,
+            use_structured_data: bool = False) -> None:
+        super().__init__(
+            price_css_selector, price_format, max_requests, period_seconds, validator_store, max_page_bytes,
+            rate_limiter, use_structured_data)
         self._currency_converter = currency_converter
 
-    def _parse_price(self, response_text: str) -> float:
-        html_content = HtmlContent(response_text)
-        if not (
-                price_text := html_content.find_element_text_by_css(self._price_css_selector)):
+    def _convert_offer_price(self, offer_price: OfferPrice) -> float | None:
+        if offer_price.currency and offer_price.currency.upper() == self._sek_currency_code:
+            return self._currency_converter.convert_to_dkk(offer_price.price, self._sek_currency_code)
+
+        return super()._convert_offer_price(offer_price)
+
+    def _parse_price_with_css_selector(self, response_text: str) -> float:
+        if not (price_text := parse_pool.find_element_text_by_css(response_text, self._price_css_selector)):
             raise PriceSelectorError
 
         if not (price_match := re.search(self._price_format, price_text)):
@@ -0,0 +1,227 @@
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import StrEnum
+from logging import getLogger
+from threading import Lock
+from time import monotonic, sleep
+from typing import ClassVar
+
+from redis import Redis, RedisError
+
+from bookprices.shared.webscraping.http import RateLimiter
+
+
+class TokenBucketStoreBackend(StrEnum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+
+class TokenBucketStore(ABC):
+    """ Keeps token buckets by key, so every rate limiter with the same key takes tokens from the same bucket. """
+
+    @abstractmethod
+    def take_token(self, key: str, capacity: int, tokens_per_second: float) -> float:
+        """ Takes a token and returns 0 if the bucket has one, otherwise the seconds until it will have one. """
+        raise NotImplementedError
+
+
+@dataclass
+class _TokenBucket:
+    tokens: float
+    updated: float
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """ Token buckets shared by the rate limiters in this process. """
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, _TokenBucket] = {}
+        self._lock = Lock()
+
+    def take_token(self, key: str, capacity: int, tokens_per_second: float) -> float:
+        with self._lock:
+            now = monotonic()
+            if not (bucket := self._buckets.get(key)):
+                bucket = _TokenBucket(tokens=capacity, updated=now)
+                self._buckets[key] = bucket
+
+            bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated) * tokens_per_second)
+            bucket.updated = now
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+
+            return (1 - bucket.tokens) / tokens_per_second
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """
+    Token buckets in Redis, shared by all job runners. Tokens are taken by a Lua script, so it is atomic, and the
+    Redis server clock is used, so the runners' clocks don't have to agree. Falls back to in-process buckets if
+    Redis is unavailable.
+    """
+    _key_prefix: ClassVar[str] = "rate_limit_"
+    _take_token_script: ClassVar[str] = """
+        local capacity = tonumber(ARGV[1])
+        local tokens_per_second = tonumber(ARGV[2])
+        local time = redis.call('TIME')
+        local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * tokens_per_second)
+        local wait_seconds = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+        else
+            wait_seconds = (1 - tokens) / tokens_per_second
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / tokens_per_second) + 60)
+        return tostring(wait_seconds)
+    """
+
+    def __init__(self, redis: Redis, fallback_store: TokenBucketStore | None = None) -> None:
+        self._take_token = redis.register_script(self._take_token_script)
+        self._fallback_store = fallback_store or memory_token_bucket_store
+        self._logger = getLogger(self.__class__.__name__)
+
+    def take_token(self, key: str, capacity: int, tokens_per_second: float) -> float:
+        try:
+            return float(self._take_token(keys=[f"{self._key_prefix}{key}"], args=[capacity, tokens_per_second]))
+        except (RedisError, ValueError) as ex:
+            self._logger.warning(f"Failed to take token for {key} from Redis. Using in-process bucket: {ex}")
+            return self._fallback_store.take_token(key, capacity, tokens_per_second)
+
+
+memory_token_bucket_store = MemoryTokenBucketStore()
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Allows request_count requests per seconds with bursts of up to request_count requests. Rate limiters with the
+    same key share a bucket, also across processes with a Redis store.
+    """
+
+    def __init__(self, key: str, request_count: int, seconds: int, store: TokenBucketStore | None = None) -> None:
+        super().__init__(request_count, seconds)
+        self._key = key
+        self._store = store or memory_token_bucket_store
+
+    def wait_if_needed(self) -> None:
+        while (wait_seconds := self._store.take_token(
+                self._key, self.request_count, self._get_tokens_per_second())) > 0:
+            sleeping_time = max(wait_seconds, self._default_sleep_time)
+            self._logger.debug(f"Rate limit hit for {self._key}! Sleeping for {sleeping_time:.2f} seconds...")
+            sleep(sleeping_time)
+
+    def _get_tokens_per_second(self) -> float:
+        return self.request_count / self.seconds
+
+
+@dataclass(frozen=True)
+class AdaptiveRate:
+    requests_per_second: float
+    configured_requests_per_second: float
+    backoffs: int
+
+
+class AdaptiveRateController:
+    """
+    Adjusts a request rate by additive increase, multiplicative decrease (AIMD). The rate is raised by a step of the
+    configured rate after every healthy_responses_per_increase fast, successful responses in a row and halved when the
+    server answers 429 or 5xx, times out or drops the connection. Requests in flight when the server starts failing
+    fail together, so the rate is lowered at most once per decrease_cooldown_seconds.
+    """
+    healthy_responses_per_increase: ClassVar[int] = 20
+    increase_factor: ClassVar[float] = 0.1
+    decrease_factor: ClassVar[float] = 0.5
+    decrease_cooldown_seconds: ClassVar[float] = 5.0
+    slow_response_seconds: ClassVar[float] = 3.0
+    min_rate_factor: ClassVar[float] = 0.25
+    max_rate_factor: ClassVar[float] = 2.0
+
+    def __init__(self, configured_requests_per_second: float, requests_per_second: float | None = None) -> None:
+        self._configured_requests_per_second = configured_requests_per_second
+        self._min_requests_per_second = configured_requests_per_second * self.min_rate_factor
+        self._max_requests_per_second = configured_requests_per_second * self.max_rate_factor
+        self._requests_per_second = self._clamp(requests_per_second or configured_requests_per_second)
+        self._healthy_responses = 0
+        self._backoffs = 0
+        self._last_decrease: float | None = None
+        self._lock = Lock()
+        self._logger = getLogger(self.__class__.__name__)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self._requests_per_second
+
+    @property
+    def max_requests_per_second(self) -> float:
+        return self._max_requests_per_second
+
+    def get_rate(self) -> AdaptiveRate:
+        with self._lock:
+            return AdaptiveRate(
+                requests_per_second=self._requests_per_second,
+                configured_requests_per_second=self._configured_requests_per_second,
+                backoffs=self._backoffs)
+
+    def add_response(self, latency_seconds: float, overloaded: bool) -> None:
+        with self._lock:
+            if overloaded:
+                self._decrease()
+            elif latency_seconds >= self.slow_response_seconds:
+                self._healthy_responses = 0
+            else:
+                self._healthy_responses += 1
+                if self._healthy_responses >= self.healthy_responses_per_increase:
+                    self._healthy_responses = 0
+                    self._requests_per_second = self._clamp(
+                        self._requests_per_second + self._configured_requests_per_second * self.increase_factor)
+
+    def _decrease(self) -> None:
+        self._healthy_responses = 0
+        now = monotonic()
+        if self._last_decrease is not None and now - self._last_decrease < self.decrease_cooldown_seconds:
+            return
+
+        self._last_decrease = now
+        self._backoffs += 1
+        self._requests_per_second = self._clamp(self._requests_per_second * self.decrease_factor)
+        self._logger.info(f"Server overloaded. Lowered rate to {self._requests_per_second:.2f} requests per second")
+
+    def _clamp(self, requests_per_second: float) -> float:
+        return min(max(requests_per_second, self._min_requests_per_second), self._max_requests_per_second)
+
+
+class AdaptiveTokenBucketRateLimiter(TokenBucketRateLimiter):
+    """
+    Token bucket rate limiter that refills at the rate of an AdaptiveRateController instead of the configured rate,
+    so throughput goes up while the server keeps up and down when it doesn't. The configured rate is the starting
+    rate unless a rate learned in an earlier run is given.
+    """
+
+    def __init__(
+            self,
+            key: str,
+            request_count: int,
+            seconds: int,
+            store: TokenBucketStore | None = None,
+            requests_per_second: float | None = None) -> None:
+        super().__init__(key, request_count, seconds, store)
+        self._controller = AdaptiveRateController(request_count / seconds, requests_per_second)
+
+    @property
+    def max_request_count(self) -> int:
+        return math.ceil(self._controller.max_requests_per_second * self.seconds)
+
+    def get_rate(self) -> AdaptiveRate:
+        return self._controller.get_rate()
+
+    def add_response(self, latency_seconds: float, overloaded: bool) -> None:
+        self._controller.add_response(latency_seconds, overloaded)
+
+    def _get_tokens_per_second(self) -> float:
+        return self._controller.requests_per_second
@@ -0,0 +1,117 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Iterator, Any
+
+JSON_LD_SCRIPT_TYPE = "application/ld+json"
+
+_product_type = "Product"
+_offer_types = {"Offer", "AggregateOffer"}
+_microdata_price_patterns = [
+    re.compile(r"<meta[^>]*itemprop=[\"']price[\"'][^>]*content=[\"']([^\"']+)[\"']", re.IGNORECASE),
+    re.compile(r"<meta[^>]*content=[\"']([^\"']+)[\"'][^>]*itemprop=[\"']price[\"']", re.IGNORECASE),
+]
+_microdata_currency_pattern = re.compile(
+    r"itemprop=[\"']priceCurrency[\"'][^>]*content=[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class OfferPrice:
+    price: float
+    currency: str | None
+
+
+def find_offer_price(html: str) -> OfferPrice | None:
+    """
+    Finds the price of the first schema.org Product offer in JSON-LD, or in microdata meta tags if there is no
+    JSON-LD offer. Only searches the raw HTML, so it is much cheaper than building a DOM.
+    """
+    for json_ld_block in iter_json_ld_blocks(html):
+        try:
+            data = json.loads(json_ld_block)
+        except ValueError:
+            continue
+        if offer_price := _find_product_offer_price(data):
+            return offer_price
+
+    return _find_microdata_offer_price(html)
+
+
+def iter_json_ld_blocks(html: str) -> Iterator[str]:
+    position = 0
+    while (type_index := html.find(JSON_LD_SCRIPT_TYPE, position)) != -1:
+        position = type_index + len(JSON_LD_SCRIPT_TYPE)
+        if html.rfind("<script", 0, type_index) < html.rfind(">", 0, type_index):
+            continue
+        if (content_start := html.find(">", type_index)) == -1:
+            return
+        if (content_end := html.find("</script", content_start)) == -1:
+            return
+        position = content_end
+        yield html[content_start + 1:content_end]
+
+
+def _find_product_offer_price(data: Any) -> OfferPrice | None:
+    if isinstance(data, list):
+        return next((price for item in data if (price := _find_product_offer_price(item))), None)
+    if not isinstance(data, dict):
+        return None
+    if "@graph" in data:
+        return _find_product_offer_price(data["@graph"])
+    if _has_type(data, {_product_type}):
+        return _get_offer_price(data.get("offers"))
+
+    return None
+
+
+def _get_offer_price(offers: Any) -> OfferPrice | None:
+    if isinstance(offers, list):
+        return next((price for offer in offers if (price := _get_offer_price(offer))), None)
+    if not isinstance(offers, dict) or not _has_type(offers, _offer_types):
+        return None
+
+    # The lowPrice of an AggregateOffer may be from another seller or edition, so it isn't used
+    price = offers.get("price")
+    currency = offers.get("priceCurrency")
+    if price is None and isinstance(price_specification := offers.get("priceSpecification"), dict):
+        price = price_specification.get("price")
+        currency = currency or price_specification.get("priceCurrency")
+
+    if (price_value := _parse_price(price)) is None:
+        return None
+
+    return OfferPrice(price_value, currency)
+
+
+def _find_microdata_offer_price(html: str) -> OfferPrice | None:
+    for pattern in _microdata_price_patterns:
+        if (match := pattern.search(html)) and (price := _parse_price(match.group(1))) is not None:
+            currency_match = _microdata_currency_pattern.search(html)
+            return OfferPrice(price, currency_match.group(1) if currency_match else None)
+
+    return None
+
+
+def _has_type(data: dict, types: set[str]) -> bool:
+    data_type = data.get("@type")
+    if isinstance(data_type, list):
+        return any(t in types for t in data_type)
+
+    return data_type in types
+
+
+def _parse_price(price: Any) -> float | None:
+    if isinstance(price, bool):
+        return None
+    if isinstance(price, (int, float)):
+        return float(price)
+    if not isinstance(price, str):
+        return None
+
+    price = price.strip()
+    if "," in price and "." not in price:
+        price = price.replace(",", ".")
+    try:
+        return float(price)
+    except ValueError:
+        return None
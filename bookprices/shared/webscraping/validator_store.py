@@ -0,0 +1,84 @@
+import json
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import ClassVar
+
+from redis import Redis, RedisError
+from logging import getLogger
+
+from bookprices.shared.webscraping.http import HttpValidators
+
+
+class HttpValidatorStore(ABC):
+    """ Stores ETag and Last-Modified validators per URL for conditional requests. """
+
+    @abstractmethod
+    def get(self, url: str) -> HttpValidators | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, url: str, validators: HttpValidators) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, url: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryHttpValidatorStore(HttpValidatorStore):
+    def __init__(self) -> None:
+        self._validators: dict[str, HttpValidators] = {}
+        self._lock = Lock()
+
+    def get(self, url: str) -> HttpValidators | None:
+        with self._lock:
+            return self._validators.get(url)
+
+    def set(self, url: str, validators: HttpValidators) -> None:
+        with self._lock:
+            self._validators[url] = validators
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._validators.pop(url, None)
+
+
+class RedisHttpValidatorStore(HttpValidatorStore):
+    """
+    Keeps validators in Redis, so they survive between job runs. Validators expire, so pages are downloaded in full
+    now and then even if the server keeps answering 304.
+    """
+    _key_prefix: ClassVar[str] = "http_validators_"
+    default_ttl_seconds: ClassVar[int] = 60 * 60 * 24 * 14
+
+    def __init__(self, redis: Redis, ttl_seconds: int | None = None) -> None:
+        self._redis = redis
+        self._ttl_seconds = ttl_seconds or self.default_ttl_seconds
+        self._logger = getLogger(self.__class__.__name__)
+
+    def get(self, url: str) -> HttpValidators | None:
+        try:
+            if not (value := self._redis.get(self._create_key(url))):
+                return None
+            etag, last_modified = json.loads(value)
+            return HttpValidators(etag=etag, last_modified=last_modified)
+        except (RedisError, ValueError, TypeError) as ex:
+            self._logger.warning(f"Failed to get HTTP validators for {url}: {ex}")
+            return None
+
+    def set(self, url: str, validators: HttpValidators) -> None:
+        try:
+            self._redis.set(
+                self._create_key(url), json.dumps([validators.etag, validators.last_modified]), ex=self._ttl_seconds)
+        except RedisError as ex:
+            self._logger.warning(f"Failed to save HTTP validators for {url}: {ex}")
+
+    def delete(self, url: str) -> None:
+        try:
+            self._redis.delete(self._create_key(url))
+        except RedisError as ex:
+            self._logger.warning(f"Failed to delete HTTP validators for {url}: {ex}")
+
+    @classmethod
+    def _create_key(cls, url: str) -> str:
+        return f"{cls._key_prefix}{url}"
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import argparse
+from datetime import date, datetime, time
+
+from bookprices.job.db.session import JobSessionFactory
+from bookprices.shared.config import loader
+from bookprices.shared.repository.bookprice_archive import BookPriceArchive
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Archives BookPrice partitions older than the given number of months to compressed files "
+                    "and drops them. The price charts keep the archived history. DeletePricesJob deletes prices "
+                    "older than a year for good, so there is nothing left to archive if it is run.")
+    parser.add_argument("-c", "--configuration", dest="configuration", type=str, required=True)
+    parser.add_argument("-d", "--archive-dir", dest="archive_dir", type=str,
+                        help="Defaults to price_archive_dir in the configuration")
+    parser.add_argument("-m", "--months-to-keep", dest="months_to_keep", type=int, default=24)
+    parser.add_argument("--dry-run", dest="dry_run", action="store_true")
+    return parser.parse_args()
+
+
+def get_cutoff(months_to_keep: int, today: date | None = None) -> date:
+    today = today or date.today()
+    month_index = today.year * 12 + today.month - 1 - months_to_keep
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def main():
+    args = parse_args()
+    configuration = loader.load_from_file(args.configuration)
+    if not (archive_dir := args.archive_dir or configuration.price_archive_dir):
+        print("No archive directory given or configured")
+        return
+    unit_of_work = UnitOfWork(JobSessionFactory(configuration))
+    archive = BookPriceArchive(archive_dir)
+    cutoff = get_cutoff(args.months_to_keep)
+
+    with unit_of_work as uow:
+        partitions = [p for p in uow.bookprice_repository.get_partitions() if p.less_than and p.less_than <= cutoff]
+    if not partitions:
+        print(f"No partitions before {cutoff} to archive")
+        return
+
+    for partition in partitions:
+        print(f"Archiving partition {partition.name} (about {partition.row_count} rows)...")
+        if args.dry_run:
+            continue
+
+        with unit_of_work as uow:
+            carried_book_ids = uow.bookprice_repository.carry_forward_latest_prices(
+                datetime.combine(partition.less_than, time.min))
+            uow.bookstore_latest_price_repository.refresh_for_books(carried_book_ids)
+        with unit_of_work as uow:
+            prices = uow.bookprice_repository.get_prices_in_partition(partition.name)
+
+        file_path = archive.write(partition.name, prices)
+        with unit_of_work as uow:
+            uow.bookprice_repository.drop_partition(partition.name)
+
+        print(f"Archived {len(prices)} prices to {file_path} and carried forward latest prices "
+              f"for {len(carried_book_ids)} books")
+
+
+if __name__ == "__main__":
+    main()
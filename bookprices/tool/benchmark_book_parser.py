@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+from time import perf_counter
+from typing import Callable
+
+from bookprices.job.job.import_books import WilliamDamBookParser
+from bookprices.shared.db.tables import Book
+from bookprices.shared.webscraping.content import HtmlContent
+
+
+def parse_book_reparsing_elements(data: str) -> Book:
+    """ The previous parser, which parsed the title and every detail element again. Kept for comparison. """
+    html_content = HtmlContent(data)
+    title, isbn, format_ = (None, None, None)
+    if title_element := html_content.find_element_by_css("h1"):
+        title = html_content.find_element_text_by_css("h1")
+        if span_text := HtmlContent(title_element).find_element_text_by_css("span"):
+            title = title.replace(span_text, "")
+
+    author = html_content.find_element_text_by_css("a.manufacturer-link")
+    for element in html_content.find_elements_by_css("ul.list li"):
+        if "ISBN-13" in element:
+            isbn = HtmlContent(element).find_element_text_by_css("span.detail-value").strip()
+        if "Format" in element:
+            format_text = HtmlContent(element).find_element_text_by_css("span.detail-value").strip()
+            if format_text in WilliamDamBookParser.valid_book_formats:
+                format_ = format_text
+
+    return Book(isbn=isbn, title=title.strip() if title else None, author=author.strip() if author else None,
+                format=format_)
+
+
+class BookParserBenchmark:
+    def __init__(self, html_files: list[str], iterations: int) -> None:
+        self._html_files = html_files
+        self._iterations = iterations
+
+    def run(self) -> None:
+        pages = []
+        for html_file in self._html_files:
+            with open(html_file, encoding="utf-8") as file:
+                pages.append(file.read())
+
+        self._measure("Reparsing elements", parse_book_reparsing_elements, pages)
+        self._measure("Single parse", WilliamDamBookParser().parse, pages)
+
+    def _measure(self, name: str, parse: Callable[[str], Book], pages: list[str]) -> None:
+        started = perf_counter()
+        for _ in range(self._iterations):
+            for page in pages:
+                parse(page)
+        elapsed = perf_counter() - started
+        page_count = self._iterations * len(pages)
+        print(f"{name}: {elapsed / page_count * 1000:.2f} ms/page ({page_count / elapsed:.1f} pages/sec)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("html_files", nargs="+", help="Saved WilliamDam.dk book pages")
+    parser.add_argument("-n", "--iterations", dest="iterations", type=int, default=200)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    benchmark = BookParserBenchmark(args.html_files, args.iterations)
+    benchmark.run()
+
+
+if __name__ == "__main__":
+    main()
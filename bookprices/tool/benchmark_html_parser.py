@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import argparse
+from time import perf_counter
+
+from bookprices.shared.webscraping.content import HtmlContent, HtmlParserBackend
+
+
+class HtmlParserBenchmark:
+    def __init__(self, html_files: list[str], css_selector: str, iterations: int) -> None:
+        self._html_files = html_files
+        self._css_selector = css_selector
+        self._iterations = iterations
+
+    def run(self) -> None:
+        pages = []
+        for html_file in self._html_files:
+            with open(html_file, encoding="utf-8") as file:
+                pages.append(file.read())
+
+        for parser_backend in HtmlParserBackend:
+            if not parser_backend.is_available:
+                print(f"{parser_backend}: not installed")
+                continue
+            self._measure(parser_backend, pages)
+
+    def _measure(self, parser_backend: HtmlParserBackend, pages: list[str]) -> None:
+        started = perf_counter()
+        for _ in range(self._iterations):
+            for page in pages:
+                HtmlContent(page, parser_backend).find_element_text_by_css(self._css_selector)
+        elapsed = perf_counter() - started
+        page_count = self._iterations * len(pages)
+        print(f"{parser_backend}: {elapsed / page_count * 1000:.2f} ms/page ({page_count / elapsed:.1f} pages/sec)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("html_files", nargs="+", help="Saved HTML pages, e.g. tests/html/*.html")
+    parser.add_argument("-s", "--selector", dest="selector", type=str, default="span.price",
+                        help="CSS selector looked up after each parse")
+    parser.add_argument("-n", "--iterations", dest="iterations", type=int, default=200)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    benchmark = HtmlParserBenchmark(args.html_files, args.selector, args.iterations)
+    benchmark.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, sleep
+
+from bookprices.shared.webscraping.parse_pool import HtmlParsePool
+
+
+class ParsePoolBenchmark:
+    """
+    Simulates price updates: each page waits for the given latency, like an HTTP request would, and is then parsed
+    either in the worker thread or in the process pool.
+    """
+
+    def __init__(
+            self,
+            html_files: list[str],
+            css_selector: str,
+            page_count: int,
+            thread_count: int,
+            process_count: int | None,
+            latency_seconds: float) -> None:
+        self._html_files = html_files
+        self._css_selector = css_selector
+        self._page_count = page_count
+        self._thread_count = thread_count
+        self._process_count = process_count
+        self._latency_seconds = latency_seconds
+
+    def run(self) -> None:
+        pages = []
+        for html_file in self._html_files:
+            with open(html_file, encoding="utf-8") as file:
+                pages.append(file.read())
+
+        self._measure(f"{self._thread_count} threads", HtmlParsePool(), pages)
+
+        parse_pool = HtmlParsePool()
+        process_count = parse_pool.start(self._process_count)
+        try:
+            # Starts the worker processes before measuring
+            parse_pool.find_element_text_by_css(pages[0], self._css_selector)
+            self._measure(f"{self._thread_count} threads, {process_count} parse process(es)", parse_pool, pages)
+        finally:
+            parse_pool.close()
+
+    def _measure(self, name: str, parse_pool: HtmlParsePool, pages: list[str]) -> None:
+        def _fetch_and_parse(page_number: int) -> None:
+            sleep(self._latency_seconds)
+            parse_pool.find_element_text_by_css(pages[page_number % len(pages)], self._css_selector)
+
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=self._thread_count) as executor:
+            list(executor.map(_fetch_and_parse, range(self._page_count)))
+        elapsed = perf_counter() - started
+        print(f"{name}: {self._page_count / elapsed:.1f} pages/sec")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("html_files", nargs="+", help="Saved HTML pages, e.g. tests/html/*.html")
+    parser.add_argument("-s", "--selector", dest="selector", type=str, default="span.price")
+    parser.add_argument("-n", "--pages", dest="pages", type=int, default=2000)
+    parser.add_argument("-t", "--threads", dest="threads", type=int, default=32)
+    parser.add_argument("-p", "--processes", dest="processes", type=int, default=None,
+                        help="Parse processes (default: one per CPU core)")
+    parser.add_argument("-l", "--latency", dest="latency", type=float, default=0.05,
+                        help="Simulated request latency in seconds")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    benchmark = ParsePoolBenchmark(
+        args.html_files, args.selector, args.pages, args.threads, args.processes, args.latency)
+    benchmark.run()
+
+
+if __name__ == "__main__":
+    main()
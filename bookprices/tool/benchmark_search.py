@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+import argparse
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from bookprices.shared.config import loader
+from bookprices.shared.db.book import SearchQuery, BookSearchSortOption
+from bookprices.shared.db.database import Database
+from bookprices.shared.model.book import Book
+from bookprices.shared.search.base import BookSearchBackend
+from bookprices.shared.search.database import DatabaseSearchBackend
+from bookprices.shared.search.inverted_index import InvertedIndexSearchBackend
+from bookprices.shared.search.suggestions import SearchSuggestionIndex
+
+WORDS = [
+    "huset", "havet", "natten", "kongen", "skoven", "drømmen", "byen", "vinteren", "sommer", "krigen", "hjertet",
+    "stjerner", "ulven", "kærlighed", "hemmelighed", "rejsen", "morderen", "sandheden", "brødre", "søstre",
+    "python", "programmering", "historie", "danmark", "verden", "lyset", "mørket", "tiden", "spejlet", "øen",
+]
+FIRST_NAMES = ["Anna", "Peter", "Karen", "Jens", "Mette", "Lars", "Sofie", "Henrik", "Ida", "Morten", "Astrid"]
+LAST_NAMES = ["Hansen", "Jensen", "Nielsen", "Andersen", "Pedersen", "Christensen", "Larsen", "Sørensen", "Holm"]
+
+
+class SearchBenchmark:
+    def __init__(self, book_count: int, queries: int, seed: int) -> None:
+        self._book_count = book_count
+        self._queries = queries
+        self._random = random.Random(seed)
+
+    def run(self, database_backend: BookSearchBackend | None) -> None:
+        books = self._create_books()
+        memory_backend = InvertedIndexSearchBackend(lambda: books)
+        started = perf_counter()
+        memory_backend.rebuild()
+        print(f"Built index of {memory_backend.index.book_count} books in {perf_counter() - started:.1f} seconds")
+
+        search_queries = self._create_search_queries()
+        self._measure("Inverted index", memory_backend, search_queries)
+        if database_backend:
+            self._measure("MySQL", database_backend, search_queries)
+        self._measure_prefix_suggestions(books, search_queries)
+
+    @staticmethod
+    def _measure_prefix_suggestions(books: list[Book], search_queries: list[SearchQuery]) -> None:
+        started = perf_counter()
+        index = SearchSuggestionIndex((book.title, book.author) for book in books)
+        print(f"Built prefix suggestion index of {index.suggestion_count} suggestions "
+              f"in {perf_counter() - started:.1f} seconds")
+
+        started = perf_counter()
+        for search_query in search_queries:
+            index.get_search_suggestions(search_query.search_phrase, search_query.author)
+        elapsed = perf_counter() - started
+        print(f"Prefix suggestion index: {len(search_queries) / elapsed:.1f} suggestions/sec")
+
+    def _measure(self, name: str, backend: BookSearchBackend, search_queries: list[SearchQuery]) -> None:
+        started = perf_counter()
+        for search_query in search_queries:
+            backend.search(search_query)
+        search_elapsed = perf_counter() - started
+
+        started = perf_counter()
+        for search_query in search_queries:
+            backend.get_search_suggestions(search_query.search_phrase, search_query.author)
+        suggestions_elapsed = perf_counter() - started
+
+        print(f"{name}: {len(search_queries) / search_elapsed:.1f} searches/sec, "
+              f"{len(search_queries) / suggestions_elapsed:.1f} suggestions/sec")
+
+    def _create_books(self) -> list[Book]:
+        created = datetime(2020, 1, 1)
+        books = []
+        for book_id in range(1, self._book_count + 1):
+            title = " ".join(self._random.sample(WORDS, self._random.randint(1, 4))).capitalize()
+            author = f"{self._random.choice(FIRST_NAMES)} {self._random.choice(LAST_NAMES)}"
+            isbn = f"978{book_id:010d}"
+            books.append(Book(book_id, isbn, title, author, "Paperback",
+                              created=created + timedelta(minutes=book_id)))
+
+        return books
+
+    def _create_search_queries(self) -> list[SearchQuery]:
+        search_queries = []
+        for _ in range(self._queries):
+            words = self._random.sample(WORDS, self._random.randint(1, 2))
+            search_phrase = " ".join(word[self._random.randint(0, 2):] for word in words)
+            author = f"{self._random.choice(FIRST_NAMES)} {self._random.choice(LAST_NAMES)}" \
+                if self._random.random() < 0.2 else None
+            sort_option = self._random.choice(
+                [BookSearchSortOption.Relevance, BookSearchSortOption.Title, BookSearchSortOption.Created])
+            search_queries.append(SearchQuery(search_phrase, author=author, page=1, page_size=20,
+                                              sort_option=sort_option, sort_in_descending_order=False))
+
+        return search_queries
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--configuration", dest="configuration", type=str, required=False,
+                        help="Also benchmark the MySQL full-text backend with the database from this configuration")
+    parser.add_argument("-b", "--books", dest="books", type=int, default=1_000_000)
+    parser.add_argument("-q", "--queries", dest="queries", type=int, default=200)
+    parser.add_argument("-s", "--seed", dest="seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    database_backend = None
+    if args.configuration:
+        configuration = loader.load_from_file(args.configuration)
+        database_backend = DatabaseSearchBackend(Database(
+            configuration.database.db_host,
+            configuration.database.db_port,
+            configuration.database.db_user,
+            configuration.database.db_password,
+            configuration.database.db_name))
+
+    benchmark = SearchBenchmark(args.books, args.queries, args.seed)
+    benchmark.run(database_backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import argparse
+from threading import Thread
+from time import perf_counter
+
+from sqlalchemy import create_engine, Engine
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
+
+from bookprices.shared.config import loader
+from bookprices.shared.config.config import Config
+from bookprices.shared.db.data_session import SessionFactory
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+class PerRequestEngineSessionFactory(SessionFactory):
+    """ Mimics the old behaviour: a new engine and sessionmaker for every unit of work. """
+
+    def __init__(self, url: str) -> None:
+        self.engine = create_engine(url, pool_pre_ping=True)
+
+    def create_session(self) -> Session:
+        return sessionmaker(bind=self.engine)()
+
+    def create_scoped_session(self) -> Session:
+        return scoped_session(sessionmaker(bind=self.engine))()
+
+
+class SharedEngineSessionFactory(SessionFactory):
+    def __init__(self, engine: Engine, session_maker: sessionmaker) -> None:
+        self.engine = engine
+        self._session_maker = session_maker
+
+    def create_session(self) -> Session:
+        return self._session_maker()
+
+    def create_scoped_session(self) -> Session:
+        return scoped_session(self._session_maker)()
+
+
+class SessionBenchmark:
+    def __init__(self, config: Config, requests: int, threads: int, pool_size: int, max_overflow: int) -> None:
+        self._url = (f"mysql+pymysql://{config.database.db_user}:{config.database.db_password}@"
+                     f"{config.database.db_host}/{config.database.db_name}")
+        self._requests = requests
+        self._threads = threads
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+
+    def run(self) -> None:
+        per_request = self._measure(lambda: PerRequestEngineSessionFactory(self._url))
+        print(f"Engine per request: {per_request:.1f} requests/sec")
+
+        engine = create_engine(
+            self._url, pool_pre_ping=True, pool_size=self._pool_size, max_overflow=self._max_overflow)
+        session_maker = sessionmaker(bind=engine)
+        shared = self._measure(lambda: SharedEngineSessionFactory(engine, session_maker))
+        engine.dispose()
+        print(f"Shared engine: {shared:.1f} requests/sec ({shared / per_request:.1f}x)")
+
+    def _measure(self, create_session_factory) -> float:
+        requests_per_thread = self._requests // self._threads
+
+        def _simulate_requests() -> None:
+            for _ in range(requests_per_thread):
+                with UnitOfWork(create_session_factory()) as uow:
+                    uow.book_repository.list_by_id([1])
+
+        threads = [Thread(target=_simulate_requests) for _ in range(self._threads)]
+        started = perf_counter()
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        elapsed = perf_counter() - started
+
+        return requests_per_thread * self._threads / elapsed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--configuration", dest="configuration", type=str, required=True)
+    parser.add_argument("-r", "--requests", dest="requests", type=int, default=1000)
+    parser.add_argument("-t", "--threads", dest="threads", type=int, default=8)
+    parser.add_argument("--pool-size", dest="pool_size", type=int, default=8)
+    parser.add_argument("--max-overflow", dest="max_overflow", type=int, default=4)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    configuration = loader.load_from_file(args.configuration)
+    benchmark = SessionBenchmark(configuration, args.requests, args.threads, args.pool_size, args.max_overflow)
+    benchmark.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+import argparse
+
+from bookprices.job.db.session import JobSessionFactory
+from bookprices.shared.config import loader
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuilds the BookStoreLatestPrice table from BookPrice")
+    parser.add_argument("-c", "--configuration", dest="configuration", type=str, required=True)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    configuration = loader.load_from_file(args.configuration)
+    with UnitOfWork(JobSessionFactory(configuration)) as uow:
+        row_count = uow.bookstore_latest_price_repository.rebuild()
+
+    print(f"Rebuilt latest prices: {row_count} rows")
+
+
+if __name__ == "__main__":
+    main()
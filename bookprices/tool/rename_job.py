@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import argparse
+
+from bookprices.job.db.session import JobSessionFactory
+from bookprices.shared.api.job import JobApiClient
+from bookprices.shared.config import loader
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+from bookprices.shared.service.job_service import JobService, JobSchemaFields
+
+JOB_API_CLIENT_ID = "JobApiRenameJob"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Renames a job in the job API, e.g. when the job class is renamed. The job runner finds jobs by "
+                    "name, so run it when the new job runner is deployed.")
+    parser.add_argument("-c", "--configuration", dest="configuration", type=str, required=True)
+    parser.add_argument("old_name", type=str)
+    parser.add_argument("new_name", type=str)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    configuration = loader.load_from_file(args.configuration)
+    job_service = JobService(
+        JobApiClient(
+            configuration.job_api.base_url,
+            configuration.job_api.api_username,
+            configuration.job_api.api_password,
+            JOB_API_CLIENT_ID,
+            UnitOfWork(JobSessionFactory(configuration))))
+
+    jobs = [job for job in job_service.get_job_list() if job[JobSchemaFields.NAME.value] == args.old_name]
+    if not jobs:
+        print(f"No job named {args.old_name}")
+        return
+
+    job = jobs[0]
+    job_service.update_job(
+        job[JobSchemaFields.ID.value],
+        args.new_name,
+        job[JobSchemaFields.DESCRIPTION.value],
+        job[JobSchemaFields.VERSION.value],
+        job[JobSchemaFields.IS_ACTIVE.value])
+    print(f"Renamed job {args.old_name} to {args.new_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ from flask.logging import default_handler
 from typing import Optional
 from flask import Flask, request, jsonify, Response
 from flask_login import LoginManager
-from bookprices.shared.db.database import Database
 from bookprices.web.blueprints.api import api_blueprint
 from bookprices.web.blueprints.auth import auth_blueprint
 from bookprices.web.blueprints.book import book_blueprint
@@ -24,8 +23,8 @@ from bookprices.web.service.csrf import CSRFService
 from bookprices.web.service.site_menu_service import SiteMenuService
 from bookprices.web.service.sri import get_sri_attribute_values
 from bookprices.web.settings import (
-    DEBUG_MODE, FLASK_APP_PORT, FLASK_SECRET_KEY, SITE_HOSTNAME, MYSQL_HOST, MYSQL_PORT,
-    MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
+    DEBUG_MODE, FLASK_APP_PORT, FLASK_SECRET_KEY, SITE_HOSTNAME)
+from bookprices.web.shared.database import db
 from bookprices.web.shared.enum import HttpStatusCode
 
 
@@ -108,7 +107,6 @@ def include_sri_attribute_values() -> dict[str, str]:
 
 @app.context_processor
 def include_user_menu_items() -> dict[str, list]:
-    db = Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
     auth_service = AuthService(db, cache)
     menu_items_service = SiteMenuService(auth_service)
 
@@ -117,7 +115,6 @@ def include_user_menu_items() -> dict[str, list]:
 
 @app.context_processor
 def include_user_menu_items() -> dict[str, list]:
-    db = Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
     auth_service = AuthService(db, cache)
     menu_items_service = SiteMenuService(auth_service)
 
@@ -126,9 +123,7 @@ def include_user_menu_items() -> dict[str, list]:
 
 @login_manager.user_loader
 def load_user(user_id: str) -> Optional[WebUser]:
-    auth_service = AuthService(
-        Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE),
-        cache)
+    auth_service = AuthService(db, cache)
 
     return auth_service.get_user(user_id)
 
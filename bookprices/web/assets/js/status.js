@@ -4,6 +4,7 @@ const bookImportCountsContainer = $("#book-import-counts-container");
 const bookPriceCountsContainer = $("#book-price-counts-container");
 const priceUpdatesContainer = $("#book-prices-updated-container");
 const finishedJobRunsByJobContainer = $("#finished-job-runs-container");
+const requestRatesContainer = $("#request-rates-container");
 
 const baseUrl = "/status";
 
@@ -178,12 +179,38 @@ function getFinishedJobRunsByJob(){
     });
 }
 
+function getRequestRates(){
+    let url = `${baseUrl}/request-rates`;
+    $.ajax(url, {
+            "method" : "GET",
+            "dataType": "json",
+            "success" : function (data, status, xhr) {
+                let title = data["table"]["title"];
+                let columns = data["table"]["columns"];
+                let rows = data["table"]["rows"];
+                let translations = data["translations"];
+                let headingId = "request-rates-heading";
+                initializeTable(
+                    requestRatesContainer,
+                    title,
+                    columns,
+                    rows,
+                    translations,
+                    headingId);
+            },
+            "error" : function (error) {
+                console.log(error);
+            }
+    });
+}
+
 $(document).ready(() => {
     getFailedPriceUpdates();
     getBookImportCounts();
     getBookPriceCounts();
     getUpdatedPricesForBookStores();
     getFinishedJobRunsByJob();
+    getRequestRates();
 
     timePeriodSelect.on("change", () => {
         getFailedPriceUpdates();
@@ -1,19 +1,13 @@
 from flask import Blueprint, Response, jsonify, request, current_app, abort
-from bookprices.shared.db.database import Database
 from bookprices.web.blueprints.error_handler import not_found_api, internal_server_error_api
 from bookprices.web.mapper.price import map_prices_history, map_price_history_for_stores
 from bookprices.web.cache.redis import cache
 from bookprices.web.blueprints.urlhelper import parse_args_for_search
 from werkzeug.local import LocalProxy
 from bookprices.web.service.book_service import BookService
-from bookprices.web.settings import (
-    MYSQL_HOST,
-    MYSQL_PORT,
-    MYSQL_USER,
-    MYSQL_PASSWORD,
-    MYSQL_DATABASE,
-    AUTHOR_URL_PARAMETER,
-    SEARCH_URL_PARAMETER)
+from bookprices.web.settings import AUTHOR_URL_PARAMETER, SEARCH_URL_PARAMETER
+from bookprices.web.shared.database import db
+from bookprices.web.shared.search import search_backend
 from bookprices.web.shared.enum import HttpStatusCode, HttpMethod
 
 RESPONSE_CACHE_TIMEOUT = 600
@@ -23,8 +17,7 @@ api_blueprint.register_error_handler(HttpStatusCode.NOT_FOUND, not_found_api)
 api_blueprint.register_error_handler(HttpStatusCode.INTERNAL_SERVER_ERROR, internal_server_error_api)
 
 logger = LocalProxy(lambda: current_app.logger)
-db = Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
-book_service = BookService(db, cache)
+book_service = BookService(db, cache, search_backend)
 
 
 @api_blueprint.route("/book/<int:book_id>", methods=[HttpMethod.GET.value])
@@ -60,9 +53,6 @@ def search_suggestions() -> tuple[Response, int]:
     if not search_phrase:
         return jsonify([]), HttpStatusCode.OK
 
-    if author:
-        suggestions = db.book_db.get_search_suggestions_for_author(search_phrase, author)
-    else:
-        suggestions = db.book_db.get_search_suggestions(search_phrase)
+    suggestions = book_service.get_search_suggestions(search_phrase, author)
 
     return jsonify(suggestions), HttpStatusCode.OK
@@ -1,25 +1,18 @@
 import google_auth_oauthlib.flow
 from flask import Blueprint, request, redirect, url_for, session, Response, jsonify, abort, current_app
 from werkzeug.local import LocalProxy
-from bookprices.shared.db.database import Database
 from bookprices.web.blueprints.error_handler import (
     not_found_api, internal_server_error_api, bad_request_api, forbidden_api, unauthorized_api)
 from bookprices.web.cache.redis import cache
 from bookprices.web.service.auth_service import AuthService
 from bookprices.web.service.google_api_service import GoogleApiService
 from bookprices.web.blueprints.urlhelper import format_url_for_redirection
+from bookprices.web.shared.database import db
 from bookprices.web.shared.enum import HttpMethod, HttpStatusCode, SessionKey, Endpoint
 from flask_login import (
     login_user,
     logout_user)
-from bookprices.web.settings import (
-    MYSQL_HOST,
-    MYSQL_PORT,
-    MYSQL_USER,
-    MYSQL_PASSWORD,
-    MYSQL_DATABASE,
-    GOOGLE_CLIENT_SECRETS_FILE,
-    GOOGLE_API_SCOPES)
+from bookprices.web.settings import GOOGLE_CLIENT_SECRETS_FILE, GOOGLE_API_SCOPES
 
 
 REDIRECT_URL_PARAMETER = "redirect_url"
@@ -33,9 +26,7 @@ auth_blueprint.register_error_handler(HttpStatusCode.INTERNAL_SERVER_ERROR, inte
 auth_blueprint.register_error_handler(HttpStatusCode.UNAUTHORIZED, unauthorized_api)
 auth_blueprint.register_error_handler(HttpStatusCode.FORBIDDEN, forbidden_api)
 
-auth_service = AuthService(
-    Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE),
-    cache)
+auth_service = AuthService(db, cache)
 
 
 @auth_blueprint.route("/authorize", methods=[HttpMethod.GET.value])
@@ -6,7 +6,6 @@ from flask import Blueprint, abort, request, render_template, Response, redirect
 from bookprices.job.job.book_search import SearchSelectedBooksInBookStoresJob
 from bookprices.job.service.argument_service import JobRunArgumentService, JobRunArgumentName
 from bookprices.shared.api.job import JobApiClient
-from bookprices.shared.db import database
 from bookprices.shared.event.enum import BookPricesEvents
 from bookprices.shared.event.listener import StartJobListener
 from bookprices.shared.model.book import Book
@@ -22,10 +21,12 @@ from bookprices.web.service.booklist_service import BookListService
 from bookprices.web.service.csrf import get_csrf_token
 from bookprices.web.settings import (
     PAGE_URL_PARAMETER, SEARCH_URL_PARAMETER, AUTHOR_URL_PARAMETER, ORDER_BY_URL_PARAMETER, DESCENDING_URL_PARAMETER,
-    MYSQL_USER, MYSQL_PORT, MYSQL_HOST, MYSQL_DATABASE, MYSQL_PASSWORD, BOOK_PAGESIZE, BOOK_IMAGE_FILE_PATH,
+    CURSOR_URL_PARAMETER, BOOK_PAGESIZE, BOOK_IMAGE_FILE_PATH,
     BOOK_IMAGES_BASE_URL, BOOKLIST_ID_URL_PARAMETER, JOB_API_BASE_URL, JOB_API_CLIENT_ID, JOB_API_PASSWORD,
     JOB_API_USERNAME)
 from bookprices.web.cache.redis import cache
+from bookprices.web.shared.database import db
+from bookprices.web.shared.search import search_backend
 from bookprices.web.shared.db_session import WebSessionFactory
 from bookprices.web.shared.enum import HttpStatusCode, HttpMethod, BookTemplate, Endpoint
 from bookprices.web.viewmodels.book import CreateBookViewModel
@@ -33,8 +34,7 @@ from bookprices.shared.event.base import EventManager, Event
 
 logger = LocalProxy(lambda: current_app.logger)
 book_blueprint = Blueprint("book", __name__)
-db = database.Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
-book_service = BookService(db, cache)
+book_service = BookService(db, cache, search_backend)
 
 
 def _create_event_manager() -> EventManager:
@@ -69,10 +69,10 @@ def search() -> str:
     order_by = args.get(ORDER_BY_URL_PARAMETER)
     descending = args.get(DESCENDING_URL_PARAMETER)
     page = args.get(PAGE_URL_PARAMETER)
+    cursor = args.get(CURSOR_URL_PARAMETER)
 
     authors = book_service.get_authors()
-    current_books = book_service.search(search_phrase, author, page, BOOK_PAGESIZE, order_by, descending)
-    next_books = book_service.search(search_phrase, author, page + 1, BOOK_PAGESIZE, order_by, descending)
+    search_result = book_service.search_page(search_phrase, author, page, BOOK_PAGESIZE, order_by, descending, cursor)
 
     booklist_service = BookListService(UnitOfWork(WebSessionFactory()), cache)
     if flask_login.current_user.is_authenticated and flask_login.current_user.booklist_id:
@@ -81,11 +81,11 @@ def search() -> str:
     else:
         book_ids_from_current_booklist = None
 
-    next_page = page + 1 if len(next_books) > 0 else None
+    next_page = page + 1 if search_result.has_next_page else None
     previous_page = page - 1 if page >= 2 else None
     booklists_active = book_ids_from_current_booklist is not None
 
-    vm = bookmapper.map_search_vm(current_books,
+    vm = bookmapper.map_search_vm(search_result.books,
                                   authors,
                                   book_ids_from_current_booklist,
                                   search_phrase,
@@ -93,6 +93,7 @@ def search() -> str:
                                   author,
                                   previous_page,
                                   next_page,
+                                  search_result.next_cursor,
                                   order_by,
                                   descending,
                                   booklists_active)
@@ -3,7 +3,6 @@ from flask import render_template, current_app, Blueprint, request, redirect, ur
 from flask_login import login_required
 from werkzeug.local import LocalProxy
 
-from bookprices.shared.db.database import Database
 from bookprices.web.cache.redis import cache
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.web.mapper.booklist import map_to_booklist_list, map_to_details_view_model, map_to_edit_view_model
@@ -11,8 +10,9 @@ from bookprices.web.service.auth_service import require_member
 from bookprices.web.service.book_service import BookService
 from bookprices.web.service.booklist_service import BookListService, BookListNotFoundError
 from bookprices.web.service.csrf import get_csrf_token
-from bookprices.web.settings import (
-    MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE, PAGE_URL_PARAMETER, BOOK_PAGESIZE)
+from bookprices.web.settings import PAGE_URL_PARAMETER, BOOK_PAGESIZE
+from bookprices.web.shared.database import db
+from bookprices.web.shared.search import search_backend
 from bookprices.web.shared.db_session import WebSessionFactory
 from bookprices.web.shared.enum import HttpMethod, BookListTemplate, Endpoint, HttpStatusCode
 from bookprices.web.viewmodels.booklist import BookListEditViewModel, AddToListRequest, RemoveFromListRequest
@@ -26,8 +26,7 @@ def _create_booklist_service() -> BookListService:
 
 
 def _create_book_service() -> BookService:
-    db = Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
-    return BookService(db, cache)
+    return BookService(db, cache, search_backend)
 
 
 @booklist_blueprint.context_processor
@@ -7,12 +7,11 @@ from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.shared.service.scraper_service import BookStoreScraperService
 from bookprices.web.service.auth_service import require_admin, AuthService
 from bookprices.web.service.bookstore_service import BookStoreService
-from bookprices.shared.db.database import Database
 from bookprices.web.mapper.bookstore import (
     map_to_bookstore_list, map_bookstore_edit_view_model, map_bookstore_edit_view_model_from_form)
 from bookprices.web.cache.redis import cache
 from bookprices.web.service.csrf import get_csrf_token
-from bookprices.web.settings import MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE
+from bookprices.web.shared.database import db
 from bookprices.web.shared.db_session import WebSessionFactory
 from bookprices.web.shared.enum import BookStoreTemplate, HttpMethod, HttpStatusCode, Endpoint
 from bookprices.web.viewmodels.bookstore import BookStoreEditViewModel
@@ -21,8 +20,6 @@ logger = LocalProxy(lambda: current_app.logger)
 
 bookstore_blueprint = Blueprint("bookstore", __name__)
 
-
-db = Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
 bookstore_service = BookStoreService(UnitOfWork(WebSessionFactory()), cache)
 bookstore_scraper_service = BookStoreScraperService(UnitOfWork(WebSessionFactory()))
 
@@ -70,7 +67,8 @@ def create() -> str | Response:
             price_format=view_model.price_format,
             color_hex=view_model.color_hex,
             scraper_id=view_model.scraper_id,
-            api_key=view_model.api_key)
+            api_key=view_model.api_key,
+            use_structured_data=view_model.use_structured_data)
 
         return redirect(url_for(Endpoint.BOOKSTORE_INDEX.value))
 
@@ -114,7 +112,8 @@ def edit(bookstore_id: int) -> str | Response:
                 price_format=view_model.price_format,
                 color_hex=view_model.color_hex,
                 scraper_id=view_model.scraper_id,
-                api_key=view_model.api_key)
+                api_key=view_model.api_key,
+                use_structured_data=view_model.use_structured_data)
 
             return redirect(url_for(Endpoint.BOOKSTORE_INDEX.value))
 
@@ -2,7 +2,6 @@ from flask import render_template, Response, jsonify, request, Blueprint, redire
 from flask_login import login_required
 
 from bookprices.shared.api.job import JobApiClient
-from bookprices.shared.db.database import Database
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.shared.service.job_service import (
     JobService,
@@ -15,11 +14,6 @@ from bookprices.web.service.auth_service import require_job_manager
 from bookprices.web.service.csrf import get_csrf_token
 from bookprices.shared.service.job_run_argument_parser import JobRunArgumentParser
 from bookprices.web.settings import (
-    MYSQL_HOST,
-    MYSQL_PORT,
-    MYSQL_USER,
-    MYSQL_PASSWORD,
-    MYSQL_DATABASE,
     JOB_API_BASE_URL,
     JOB_API_USERNAME,
     JOB_API_PASSWORD,
@@ -32,7 +26,6 @@ from bookprices.web.viewmodels.job_run import JobRunPriority, JobRunCreateViewMo
 MESSAGE_FIELD_NAME = "message"
 JOB_ID_URL_PARAMETER = "jobId"
 
-db = Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
 job_service = JobService(
     JobApiClient(
         JOB_API_BASE_URL, JOB_API_USERNAME, JOB_API_PASSWORD, JOB_API_CLIENT_ID, UnitOfWork(WebSessionFactory())))
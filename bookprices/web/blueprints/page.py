@@ -1,6 +1,5 @@
 import flask_login
 
-import bookprices.shared.db.database as database
 import bookprices.web.mapper.book as bookmapper
 from bookprices.shared.db.book import BookSearchSortOption
 from bookprices.shared.repository.unit_of_work import UnitOfWork
@@ -17,21 +16,16 @@ from bookprices.web.shared.db_session import SessionFactory, WebSessionFactory
 from bookprices.web.shared.enum import HttpMethod, HttpStatusCode, PageTemplate, Endpoint
 from bookprices.web.viewmodels.page import AboutViewModel
 from bookprices.shared.cache.key_generator import get_bookstores_key
-from bookprices.web.settings import (
-    MYSQL_HOST,
-    MYSQL_PORT,
-    MYSQL_USER,
-    MYSQL_PASSWORD,
-    MYSQL_DATABASE)
+from bookprices.web.shared.database import db
+from bookprices.web.shared.search import search_backend
 
 
 page_blueprint = Blueprint("page", __name__)
 page_blueprint.register_error_handler(HttpStatusCode.NOT_FOUND, not_found_html)
 page_blueprint.register_error_handler(HttpStatusCode.INTERNAL_SERVER_ERROR, internal_server_error_html)
 
-db = database.Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
 auth_service = AuthService(db, cache)
-book_service = BookService(db, cache)
+book_service = BookService(db, cache, search_backend)
 booklist_service = BookListService(UnitOfWork(WebSessionFactory()), cache)
 
 
@@ -98,6 +98,16 @@ def job_run_count_by_job() -> tuple[Response, int]:
     return jsonify(job_run_count_by_job_response), HttpStatusCode.OK
 
 
+@status_blueprint.route("/request-rates", methods=[HttpMethod.GET])
+@login_required
+@require_admin
+def request_rates() -> tuple[Response, int]:
+    status_service = _create_status_service()
+    request_rates_response = status_service.get_request_rates_by_bookstore()
+
+    return jsonify(request_rates_response), HttpStatusCode.OK
+
+
 def _create_status_service() -> StatusService:
     job_service = JobService(
         JobApiClient(
@@ -8,7 +8,7 @@ from bookprices.web.settings import (
     AUTHOR_URL_PARAMETER,
     PAGE_URL_PARAMETER,
     ORDER_BY_URL_PARAMETER,
-    DESCENDING_URL_PARAMETER, TIMEPERIOD_DAYS_URL_PARAMETER, BOOKLIST_ID_URL_PARAMETER)
+    DESCENDING_URL_PARAMETER, TIMEPERIOD_DAYS_URL_PARAMETER, BOOKLIST_ID_URL_PARAMETER, CURSOR_URL_PARAMETER)
 
 
 def parse_args_for_search(request_args: MultiDict) -> dict:
@@ -16,6 +16,7 @@ def parse_args_for_search(request_args: MultiDict) -> dict:
         SEARCH_URL_PARAMETER: request_args.get(SEARCH_URL_PARAMETER, type=str, default=""),
         AUTHOR_URL_PARAMETER: request_args.get(AUTHOR_URL_PARAMETER, type=str, default=""),
         DESCENDING_URL_PARAMETER: request_args.get(DESCENDING_URL_PARAMETER, type=bool, default=False),
+        CURSOR_URL_PARAMETER: request_args.get(CURSOR_URL_PARAMETER, type=str, default=""),
     }
 
     order_by = request_args.get(ORDER_BY_URL_PARAMETER, type=str)
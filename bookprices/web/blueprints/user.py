@@ -4,21 +4,19 @@ from werkzeug.local import LocalProxy
 
 import bookprices.web.mapper.user as usermapper
 from flask import Blueprint, request, render_template, Response, redirect, url_for, abort, current_app, jsonify
-from bookprices.shared.db import database
 from bookprices.shared.model.user import UserAccessLevel
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.web.cache.redis import cache
 from bookprices.web.service.auth_service import AuthService, require_member, require_admin
 from bookprices.web.service.booklist_service import BookListService
 from bookprices.web.service.csrf import get_csrf_token
-from bookprices.web.settings import MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE, MYSQL_PORT
+from bookprices.web.shared.database import db
 from bookprices.web.shared.db_session import SessionFactory, WebSessionFactory
 from bookprices.web.shared.enum import HttpMethod, UserTemplate, Endpoint, HttpStatusCode
 from bookprices.web.viewmodels.user import UserEditViewModel
 
 user_blueprint = Blueprint("user", __name__)
 
-db = database.Database(MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE)
 auth_service = AuthService(db, cache)
 
 logger = LocalProxy(lambda: current_app.logger)
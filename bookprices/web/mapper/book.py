@@ -13,7 +13,7 @@ from bookprices.web.settings import (
     ORDER_BY_URL_PARAMETER,
     DESCENDING_URL_PARAMETER,
     BOOK_IMAGES_BASE_URL,
-    BOOK_FALLBACK_IMAGE_NAME, BOOKLIST_ID_URL_PARAMETER)
+    BOOK_FALLBACK_IMAGE_NAME, BOOKLIST_ID_URL_PARAMETER, CURSOR_URL_PARAMETER)
 from bookprices.web.shared.enum import Endpoint
 from bookprices.web.viewmodels.book import (
     SearchViewModel,
@@ -76,6 +76,15 @@ def _map_sorting_options(search_phrase: str,
                          order_by: BookSearchSortOption,
                          descending: bool) -> list[SortingOption]:
     sorting_options = [
+        SortingOption(
+            text="Bedste match",
+            selected=order_by == BookSearchSortOption.Relevance,
+            url=_create_url(page_number=1,
+                            endpoint=Endpoint.BOOK_SEARCH.value,
+                            **{SEARCH_URL_PARAMETER: search_phrase,
+                               AUTHOR_URL_PARAMETER: author,
+                               ORDER_BY_URL_PARAMETER: BookSearchSortOption.Relevance.name,
+                               DESCENDING_URL_PARAMETER: False})),
         SortingOption(
             text="Titel: A til Z",
             selected=order_by == BookSearchSortOption.Title and not descending,
@@ -197,6 +206,7 @@ def map_search_vm(books: list[Book],
                   author: Optional[str],
                   previous_page: Optional[int],
                   next_page: Optional[int],
+                  next_page_cursor: Optional[str],
                   order_by: BookSearchSortOption,
                   descending: bool,
                   booklist_active: bool) -> SearchViewModel:
@@ -220,7 +230,8 @@ def map_search_vm(books: list[Book],
     if next_page:
         next_page_url = _create_url(next_page,
                                     endpoint=Endpoint.BOOK_SEARCH.value,
-                                    **url_parameters)
+                                    **url_parameters,
+                                    **{CURSOR_URL_PARAMETER: next_page_cursor})
 
     book_models = [
         map_book_item(
@@ -38,6 +38,7 @@ def map_bookstore_edit_view_model(bookstore: BookStore, scraper_names: Sequence[
         color_hex=bookstore.color_hex,
         scraper_id=bookstore.scraper_id,
         api_key=bookstore.api_key,
+        use_structured_data=bookstore.use_structured_data,
         scraper_names=list(scraper_names),
         form_action_url=url_for(Endpoint.BOOKSTORE_EDIT.value, bookstore_id=bookstore.id),
         return_url=url_for(Endpoint.BOOKSTORE_INDEX.value))
@@ -61,6 +62,7 @@ def map_bookstore_edit_view_model_from_form(
     color_hex = request.form.get(BookStoreEditViewModel.color_hex_field_name) or None
     scraper_id = request.form.get(BookStoreEditViewModel.scraper_id_field_name) or None
     api_key = request.form.get(BookStoreEditViewModel.api_key_field_name) or None
+    use_structured_data = bool(request.form.get(BookStoreEditViewModel.use_structured_data_field_name))
 
     return BookStoreEditViewModel(
         id=bookstore_id_from_form,
@@ -75,6 +77,7 @@ def map_bookstore_edit_view_model_from_form(
         color_hex=color_hex,
         scraper_id=scraper_id,
         api_key=api_key,
+        use_structured_data=use_structured_data,
         scraper_names=list(scraper_names),
         form_action_url=form_action_url,
         return_url=return_url)
@@ -1,19 +1,32 @@
+from dataclasses import dataclass
+
 from flask_caching import Cache
-from bookprices.shared.db.book import BookSearchSortOption, SearchQuery
+from bookprices.shared.db.book import BookSearchSortOption, SearchQuery, SearchCursor
 from bookprices.shared.db.database import Database
 from bookprices.shared.model.book import Book
 from bookprices.shared.model.bookprice import BookPrice
 from bookprices.shared.model.bookstore import BookStoreBookPrice, BookInBookStore, BookStore
+from bookprices.shared.search.base import BookSearchBackend
+from bookprices.shared.search.database import DatabaseSearchBackend
 from bookprices.shared.cache.key_generator import (
     get_authors_key, get_book_list_key, get_book_latest_prices_key, get_book_in_book_store_key, get_book_key,
-    get_prices_for_book_in_bookstore_key, get_prices_for_book_key)
+    get_prices_for_book_in_bookstore_key, get_prices_for_book_key, get_search_index_version_key)
+from bookprices.web.service.search_cursor import create_search_cursor, encode_search_cursor, decode_search_cursor
 from bookprices.web.shared.enum import CacheTtlOption
 
 
+@dataclass(frozen=True)
+class BookSearchPage:
+    books: list[Book]
+    next_cursor: str | None
+    has_next_page: bool = False
+
+
 class BookService:
-    def __init__(self, db: Database, cache: Cache) -> None:
+    def __init__(self, db: Database, cache: Cache, search_backend: BookSearchBackend | None = None) -> None:
         self._db = db
         self._cache = cache
+        self._search_backend = search_backend or DatabaseSearchBackend(db)
 
     def search(
             self,
@@ -22,7 +35,8 @@ class BookService:
             page: int,
             page_size: int,
             sort_option: BookSearchSortOption = BookSearchSortOption.Title,
-            descending: bool = False) -> list[Book]:
+            descending: bool = False,
+            after: SearchCursor | None = None) -> list[Book]:
 
         query = SearchQuery(
             search_phrase=search_phrase,
@@ -30,19 +44,49 @@ class BookService:
             page=page,
             page_size=page_size,
             sort_option=sort_option,
-            sort_in_descending_order=descending)
+            sort_in_descending_order=descending,
+            after=after)
 
-        book_search_function = self._get_search_function(sort_option)
         books_current_cache_key = get_book_list_key(query)
         if not (books := self._cache.get(books_current_cache_key)):
-            if books := book_search_function(query):
+            if books := self._search_backend.search(query):
                 self._cache.set(books_current_cache_key, books, timeout=CacheTtlOption.SHORT.value)
 
         return books
 
-    def _get_search_function(self, sort_option: BookSearchSortOption) -> callable:
-        return self._db.book_db.search_books_with_newest_prices if sort_option == BookSearchSortOption.PriceUpdated \
-            else self._db.book_db.search_books
+    def search_page(
+            self,
+            search_phrase: str,
+            author: str | None,
+            page: int,
+            page_size: int,
+            sort_option: BookSearchSortOption = BookSearchSortOption.Title,
+            descending: bool = False,
+            cursor: str | None = None) -> BookSearchPage:
+        """
+        Searches from the position given by the cursor token if it is valid for the sort order, otherwise from the
+        page number. The cursor for the next page is only returned if there is at least one more book.
+        Results sorted by relevance are paged by page number only.
+        """
+        if sort_option == BookSearchSortOption.Relevance:
+            books = self.search(search_phrase, author, page, page_size, sort_option, descending)
+            has_next_page = bool(self.search(search_phrase, author, page * page_size + 1, 1, sort_option, descending))
+            return BookSearchPage(books, next_cursor=None, has_next_page=has_next_page)
+
+        after = decode_search_cursor(cursor, sort_option, descending) if cursor else None
+        books = self.search(search_phrase, author, page, page_size, sort_option, descending, after)
+        if len(books) < page_size:
+            return BookSearchPage(books, next_cursor=None)
+
+        next_after = create_search_cursor(books[-1], sort_option)
+        if not self.search(search_phrase, author, page + 1, 1, sort_option, descending, next_after):
+            return BookSearchPage(books, next_cursor=None)
+
+        return BookSearchPage(
+            books, next_cursor=encode_search_cursor(next_after, sort_option, descending), has_next_page=True)
+
+    def get_search_suggestions(self, search_phrase: str, author: str | None = None) -> list[str]:
+        return self._search_backend.get_search_suggestions(search_phrase, author)
 
     def get_book(self, book_id: int) -> Book | None:
         cache_key = get_book_key(book_id)
@@ -104,17 +148,20 @@ class BookService:
     def create_book(self, book: Book) -> int:
         book_id = self._db.book_db.create_book(book)
         self._cache.delete(get_authors_key())
+        self._cache.inc(get_search_index_version_key())
 
         return book_id
 
     def update_book(self, book: Book) -> None:
         self._db.book_db.update_book(book)
         self._cache.delete(get_authors_key())
+        self._cache.inc(get_search_index_version_key())
         self._cache.delete(get_book_key(book.id))
 
     def delete_book(self, book_id: int) -> None:
         self._db.book_db.delete_book(book_id)
         self._cache.delete(get_authors_key())
+        self._cache.inc(get_search_index_version_key())
         self._cache.delete(get_book_key(book_id))
 
     def delete_book_in_bookstore(self, book_id: int, bookstore_id: int) -> None:
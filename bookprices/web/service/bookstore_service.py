@@ -37,7 +37,8 @@ class BookStoreService:
                price_format: str | None,
                color_hex: str | None,
                scraper_id: str | None,
-               api_key: str | None) -> None:
+               api_key: str | None,
+               use_structured_data: bool = False) -> None:
         bookstore = self._create_bookstore(
             name=name,
             url=url,
@@ -49,7 +50,8 @@ class BookStoreService:
             price_format=price_format,
             color_hex=color_hex,
             scraper_id=scraper_id,
-            api_key=api_key)
+            api_key=api_key,
+            use_structured_data=use_structured_data)
 
         with self._unit_of_work as uow:
             uow.bookstore_repository.add(bookstore)
@@ -68,7 +70,8 @@ class BookStoreService:
             price_format: str | None,
             color_hex: str | None,
             scraper_id: str | None,
-            api_key: str | None) -> None:
+            api_key: str | None,
+            use_structured_data: bool = False) -> None:
         bookstore = self._create_bookstore(
             bookstore_id=bookstore_id,
             name=name,
@@ -81,7 +84,8 @@ class BookStoreService:
             price_format=price_format,
             color_hex=color_hex,
             scraper_id=scraper_id,
-            api_key=api_key)
+            api_key=api_key,
+            use_structured_data=use_structured_data)
 
         with self._unit_of_work as uow:
             uow.bookstore_repository.update(bookstore)
@@ -107,6 +111,7 @@ class BookStoreService:
             color_hex: str | None,
             scraper_id: str | None,
             api_key: str | None,
+            use_structured_data: bool,
             bookstore_id: int = 0) -> BookStore:
         return BookStore(
             id=bookstore_id,
@@ -120,4 +125,5 @@ class BookStoreService:
             price_format=price_format,
             color_hex=color_hex.lower() if color_hex else None,
             scraper_id=scraper_id,
-            api_key=api_key)
+            api_key=api_key,
+            use_structured_data=use_structured_data)
@@ -0,0 +1,53 @@
+import binascii
+import json
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from datetime import datetime
+
+from bookprices.shared.db.book import BookSearchSortOption, SearchCursor
+from bookprices.shared.model.book import Book
+
+
+def create_search_cursor(book: Book, sort_option: BookSearchSortOption) -> SearchCursor:
+    return SearchCursor(book_id=book.id, sort_value=_get_sort_value(book, sort_option))
+
+
+def encode_search_cursor(cursor: SearchCursor, sort_option: BookSearchSortOption, descending: bool) -> str:
+    """ Creates an opaque URL-safe token for the cursor, bound to the sort order it was created for. """
+    sort_value = cursor.sort_value.isoformat() if isinstance(cursor.sort_value, datetime) else cursor.sort_value
+    payload = json.dumps([sort_option.name, descending, cursor.book_id, sort_value], separators=(",", ":"))
+
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(token: str, sort_option: BookSearchSortOption, descending: bool) -> SearchCursor | None:
+    """ Returns None if the token is malformed or was created for another sort order. """
+    if not token:
+        return None
+    try:
+        payload = urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_option_name, cursor_descending, book_id, sort_value = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+
+    if sort_option_name != sort_option.name or cursor_descending != descending or not isinstance(book_id, int):
+        return None
+    if sort_option == BookSearchSortOption.Created:
+        try:
+            sort_value = datetime.fromisoformat(sort_value)
+        except (TypeError, ValueError):
+            return None
+    elif sort_option in (BookSearchSortOption.Title, BookSearchSortOption.Author) and not isinstance(sort_value, str):
+        return None
+
+    return SearchCursor(book_id=book_id, sort_value=sort_value)
+
+
+def _get_sort_value(book: Book, sort_option: BookSearchSortOption) -> str | datetime | None:
+    if sort_option == BookSearchSortOption.Title:
+        return book.title
+    if sort_option == BookSearchSortOption.Author:
+        return book.author
+    if sort_option == BookSearchSortOption.Created:
+        return book.created
+
+    return None
@@ -5,13 +5,13 @@ from flask_caching import Cache
 from datetime import timedelta, datetime
 from bookprices.shared.cache.key_generator import (
     get_failed_count_by_reason_key, get_book_import_count_key, get_price_count_key, get_price_count_by_bookstore_key,
-    get_job_run_statistics_key)
+    get_job_run_statistics_key, get_request_rates_key)
 from bookprices.shared.repository.unit_of_work import UnitOfWork
 from bookprices.shared.service.job_service import JobService, JobRunStatisticsSchemaFields
 from bookprices.web.shared.enum import CacheTtlOption
 from bookprices.web.viewmodels.status import (
     TimePeriodSelectOption, UpdatedPricesForBookStoreResponse, TableResponse, PriceCountsResponse,
-    BookImportCountsResponse, FailedPriceUpdatesResponse, JobRunStatisticsResponse)
+    BookImportCountsResponse, FailedPriceUpdatesResponse, JobRunStatisticsResponse, RequestRatesResponse)
 
 
 class TableColumn(StrEnum):
@@ -22,6 +22,10 @@ class TableColumn(StrEnum):
     PRICE_COUNT = "price_count"
     JOB_NAME = "job_name"
     TOTAL_JOB_RUN_COUNT = "job_run_count"
+    REQUESTS_PER_MINUTE = "requests_per_minute"
+    CONFIGURED_REQUESTS_PER_MINUTE = "configured_requests_per_minute"
+    BACKOFFS = "backoffs"
+    UPDATED = "updated"
 
 
 class StatusService:
@@ -39,6 +43,10 @@ class StatusService:
             TableColumn.UPDATED_PERCENTAGE: "Opdateringsprocent",
             TableColumn.JOB_NAME: "Job",
             TableColumn.TOTAL_JOB_RUN_COUNT: "Total",
+            TableColumn.REQUESTS_PER_MINUTE: "Forespørgsler pr. minut",
+            TableColumn.CONFIGURED_REQUESTS_PER_MINUTE: "Konfigureret pr. minut",
+            TableColumn.BACKOFFS: "Nedsættelser",
+            TableColumn.UPDATED: "Opdateret",
         }
 
     def get_failed_price_updates_by_bookstore(self, days: int) -> FailedPriceUpdatesResponse:
@@ -202,6 +210,39 @@ class StatusService:
 
         return JobRunStatisticsResponse(translations=translations, table=table_response)
 
+    def get_request_rates_by_bookstore(self) -> RequestRatesResponse:
+        """ Request rates learned by the price updates. They only change when the price update runs. """
+        cache_key = get_request_rates_key()
+        request_rates = []
+        if cached_request_rates := self._cache.get(cache_key):
+            request_rates = cached_request_rates
+        else:
+            with self._unit_of_work as uow:
+                if source_request_rates := uow.bookstore_request_rate_repository.get_rates_with_bookstore_names():
+                    self._cache.set(cache_key, source_request_rates, timeout=CacheTtlOption.SHORT.value)
+                    request_rates = source_request_rates
+
+        return self._create_request_rates_response(request_rates)
+
+    def _create_request_rates_response(
+            self,
+            request_rates: list[tuple[int, str, float, float, int, datetime]]) -> RequestRatesResponse:
+        rows = []
+        for _, bookstore_name, requests_per_second, configured_requests_per_second, backoffs, updated in request_rates:
+            rows.append({
+                TableColumn.BOOK_STORE: bookstore_name,
+                TableColumn.REQUESTS_PER_MINUTE: f"{requests_per_second * 60:.1f}",
+                TableColumn.CONFIGURED_REQUESTS_PER_MINUTE: f"{configured_requests_per_second * 60:.1f}",
+                TableColumn.BACKOFFS: str(backoffs),
+                TableColumn.UPDATED: updated.strftime("%d-%m-%Y %H:%M"),
+            })
+
+        columns = list(rows[0].keys() if rows else [])
+        translations = self._get_translations_for_columns(columns)
+        table_response = TableResponse(title="Forespørgselsrater for boghandlere", columns=columns, rows=rows)
+
+        return RequestRatesResponse(translations=translations, table=table_response)
+
     def _get_translations_for_columns(self, columns: list[str]) -> dict[str, str]:
         return {column: self._translations.get(column, column) for column in columns}
 
@@ -6,6 +6,9 @@ MYSQL_PORT = int(os.environ["MYSQL_SERVER_PORT"])
 MYSQL_USER = os.environ["MYSQL_USER"]
 MYSQL_PASSWORD = os.environ["MYSQL_PASSWORD"]
 MYSQL_DATABASE = os.environ["MYSQL_DATABASE"]
+MYSQL_POOL_SIZE = int(os.environ.get("MYSQL_POOL_SIZE") or "8")
+MYSQL_POOL_RECYCLE_SECONDS = int(os.environ.get("MYSQL_POOL_RECYCLE_SECONDS") or "1800")
+MYSQL_POOL_MAX_OVERFLOW = int(os.environ.get("MYSQL_POOL_MAX_OVERFLOW") or "4")
 
 # Cache settings
 REDIS_SERVER = os.environ.get("REDIS_SERVER")
@@ -28,6 +31,9 @@ DEBUG_MODE = os.environ.get("DEBUG", "False") == "True"
 SITE_HOSTNAME = os.environ.get("SITE_HOSTNAME", "localhost")
 
 BOOK_PAGESIZE = 20
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND") or "fulltext"
+SEARCH_SUGGESTION_INDEX_CHECK_INTERVAL_SECONDS = float(
+    os.environ.get("SEARCH_SUGGESTION_INDEX_CHECK_INTERVAL_SECONDS") or "5")
 BOOK_IMAGES_BASE_URL = "/static/assets/images/books/" if DEBUG_MODE else "/static/images/books/"
 BOOK_FALLBACK_IMAGE_NAME = "default.png"
 BOOK_IMAGE_FILE_PATH = os.environ["BOOK_IMAGE_FILE_PATH"]
@@ -41,6 +47,7 @@ GOOGLE_AUTH_ERROR_URL_PARAMETER = "error"
 GOOGLE_AUTH_CODE_URL_PARAMETER = "code"
 TIMEPERIOD_DAYS_URL_PARAMETER = "days"
 BOOKLIST_ID_URL_PARAMETER = "booklist_id"
+CURSOR_URL_PARAMETER = "cursor"
 
 FLASK_SECRET_KEY = os.environ.get("FLASK_SECRET_KEY", os.urandom(32))
 FLASK_APP_PORT = int(os.environ.get("FLASK_APP_PORT", 3031))
@@ -55,9 +62,9 @@ SRI_ATTRIBUTE_VALUES = {
     "search_js": ("sha256-x6jrCBrfzLs34vymj15wO7JYE4dv8+guDsw2gTwLBw4= "
                   "sha384-zMJ85kLYeyaHQm2oOTy8r4EuIf/zjM9KhxZCppMcXBS9m4eXL372gZax+tjMYbhG "
                   "sha512-Z5RQ0pcYZQJlrLNIlEk+0uyUsXLCCOPQj7E6RZRTZGzsguRny81XjfK3PKplLa6Y3yYKFIagzg8j2Ck5HsGehQ=="),
-    "status_js": ("sha256-C3FLOaoTGOEoqpZAkJoyr+rBTt0/G63EzUA7hE07pEY= "
-                  "sha384-yxnh6V5azyqy5wWenG0+u+duzjM3pkSEhqB88tZH7ZSUDHIuWdZeX5bZLyn39GUP "
-                  "sha512-JaU7vtzb6A2UKqu6nRgQbRvlBKBFCU9lZxLtO7Tn54yx0bjpQVnk58lq72odb6TY7sdrI5R9la4qV+ImDXnH5Q=="),
+    "status_js": ("sha256-3be7z+erkO+lz+otuFtRsBkDb1kIrLElIZVZXJcf53s= "
+                  "sha384-DV7RJwO3a1s5LOiudIGgyhid9dHKElKEo0HphgSH3G42i9X+rgKQxE4rXtE0EFJX "
+                  "sha512-USYWQXnqaD9HdoPcCsYp/Y5C7/T4xyWrJtwR4Unr/dJjQ10scLI3NHl+ZqzPE35vlAzv13i7wSK55uehxDA4rQ=="),
     "book_js": ("sha256-ksumcu4R2xURc6vKSeMzzP9YTz3y2lVvhTzUoKzM9+Y= "
                 "sha384-HyrFTCYmUdoLpv+cbiY1xutb3nWahLHn4QQZBq9EBpjGtYhbBMZrso3hsVfeN3Ln "
                 "sha512-+UjqPHpLx52FfgXAWO6sc70sn/MJ/MwgvO854kVyx2P4wG0zDwIwiAJaLeyxCUw74xQz4iI8Fl2O6M/gtw9aBg=="),
@@ -0,0 +1,13 @@
+from bookprices.shared.db.database import Database
+from bookprices.web.settings import (
+    MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE, MYSQL_POOL_SIZE, MYSQL_POOL_RECYCLE_SECONDS)
+
+
+db = Database(
+    MYSQL_HOST,
+    MYSQL_PORT,
+    MYSQL_USER,
+    MYSQL_PASSWORD,
+    MYSQL_DATABASE,
+    pool_size=MYSQL_POOL_SIZE,
+    pool_max_lifetime_seconds=MYSQL_POOL_RECYCLE_SECONDS)
@@ -1,22 +1,57 @@
+from threading import Lock
+from typing import ClassVar
+
 from flask_session import Session
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, Engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from bookprices.shared.db.data_session import SessionFactory
-from bookprices.web.settings import MYSQL_USER, MYSQL_PASSWORD, MYSQL_HOST, MYSQL_DATABASE
+from bookprices.web.settings import (
+    MYSQL_USER,
+    MYSQL_PASSWORD,
+    MYSQL_HOST,
+    MYSQL_DATABASE,
+    MYSQL_POOL_SIZE,
+    MYSQL_POOL_MAX_OVERFLOW,
+    MYSQL_POOL_RECYCLE_SECONDS)
 
 
 class WebSessionFactory(SessionFactory):
+    """ Session factory sharing one engine (and connection pool) and one sessionmaker across the process. """
+    _engine: ClassVar[Engine | None] = None
+    _session_maker: ClassVar[sessionmaker | None] = None
+    _lock: ClassVar[Lock] = Lock()
+
     def __init__(self) -> None:
-        self.engine = create_engine(
-            f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DATABASE}",
-            connect_args={"connect_timeout": 10},
-            pool_pre_ping=True)
+        self.engine = self._get_engine()
 
     def create_session(self) -> Session:
-        session_maker = sessionmaker(bind=self.engine)
-        return session_maker()
+        return self._get_session_maker()()
 
     def create_scoped_session(self) -> Session:
-        session_maker = sessionmaker(bind=self.engine)
-        return scoped_session(session_maker)()
\ No newline at end of file
+        return scoped_session(self._get_session_maker())()
+
+    @classmethod
+    def _get_engine(cls) -> Engine:
+        if cls._engine is None:
+            with cls._lock:
+                if cls._engine is None:
+                    cls._engine = create_engine(
+                        f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DATABASE}",
+                        connect_args={"connect_timeout": 10},
+                        pool_pre_ping=True,
+                        pool_size=MYSQL_POOL_SIZE,
+                        max_overflow=MYSQL_POOL_MAX_OVERFLOW,
+                        pool_recycle=MYSQL_POOL_RECYCLE_SECONDS)
+
+        return cls._engine
+
+    @classmethod
+    def _get_session_maker(cls) -> sessionmaker:
+        if cls._session_maker is None:
+            engine = cls._get_engine()
+            with cls._lock:
+                if cls._session_maker is None:
+                    cls._session_maker = sessionmaker(bind=engine)
+
+        return cls._session_maker
@@ -95,3 +95,9 @@ class JobTemplate(Enum):
     INDEX = "job/index.html"
     CREATE = "job/create.html"
     EDIT = "job/edit.html"
+
+
+class SearchBackendOption(StrEnum):
+    FULL_TEXT = "fulltext"
+    LIKE = "like"
+    MEMORY = "memory"
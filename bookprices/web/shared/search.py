@@ -0,0 +1,38 @@
+from typing import Any
+
+from bookprices.shared.search.base import BookSearchBackend
+from bookprices.shared.search.database import DatabaseSearchBackend
+from bookprices.shared.cache.key_generator import get_search_index_version_key
+from bookprices.shared.search.inverted_index import InvertedIndexSearchBackend
+from bookprices.shared.search.suggestions import SearchSuggestionService, IndexedSuggestionsSearchBackend
+from bookprices.web.cache.redis import cache
+from bookprices.web.settings import SEARCH_BACKEND, SEARCH_SUGGESTION_INDEX_CHECK_INTERVAL_SECONDS
+from bookprices.web.shared.database import db
+from bookprices.web.shared.enum import SearchBackendOption
+
+
+def _get_search_index_version() -> Any:
+    return cache.get(get_search_index_version_key())
+
+
+def _create_search_backend(backend_option: SearchBackendOption) -> BookSearchBackend:
+    database_backend = DatabaseSearchBackend(db, full_text=backend_option != SearchBackendOption.LIKE)
+    if backend_option == SearchBackendOption.MEMORY:
+        return InvertedIndexSearchBackend(
+            db.book_db.get_books,
+            fallback=database_backend,
+            get_version=_get_search_index_version,
+            version_check_interval_seconds=SEARCH_SUGGESTION_INDEX_CHECK_INTERVAL_SECONDS)
+
+    return database_backend
+
+
+def _create_suggestion_service() -> SearchSuggestionService:
+    return SearchSuggestionService(
+        db.book_db.get_titles_and_authors,
+        get_version=_get_search_index_version,
+        version_check_interval_seconds=SEARCH_SUGGESTION_INDEX_CHECK_INTERVAL_SECONDS)
+
+
+search_backend = IndexedSuggestionsSearchBackend(
+    _create_search_backend(SearchBackendOption(SEARCH_BACKEND)), _create_suggestion_service())
@@ -38,6 +38,7 @@ class BookStoreEditViewModel:
     color_hex_field_name: ClassVar[str] = "color-hex"
     scraper_id_field_name: ClassVar[str] = "scraper-id"
     api_key_field_name: ClassVar[str] = "api-key"
+    use_structured_data_field_name: ClassVar[str] = "use-structured-data"
 
     name_min_length: ClassVar[int] = 1
     name_max_length: ClassVar[int] = 255
@@ -74,6 +75,7 @@ class BookStoreEditViewModel:
     color_hex: str | None
     scraper_id: str | None
     api_key: str | None
+    use_structured_data: bool
     form_action_url: str
     return_url: str
     scraper_names: list[str]
@@ -178,6 +180,7 @@ class BookStoreEditViewModel:
             color_hex=None,
             scraper_id=None,
             api_key=None,
+            use_structured_data=False,
             form_action_url=form_action_url,
             return_url=return_url,
             scraper_names=list(scraper_names))
@@ -47,3 +47,9 @@ class UpdatedPricesForBookStoreResponse:
 class JobRunStatisticsResponse:
     translations: dict[str, str]
     table: TableResponse
+
+
+@dataclass(frozen=True)
+class RequestRatesResponse:
+    translations: dict[str, str]
+    table: TableResponse
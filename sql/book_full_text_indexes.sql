@@ -0,0 +1,4 @@
+-- FULLTEXT index used by the full-text search backend (SEARCH_BACKEND=fulltext).
+-- The ngram parser splits titles and authors into bigrams (ngram_token_size=2), so words are matched anywhere,
+-- not only as prefixes. Single-character words aren't indexed, so the search matches them with LIKE.
+ALTER TABLE Book ADD FULLTEXT INDEX TitleAuthorFullText (Title, Author) WITH PARSER ngram;
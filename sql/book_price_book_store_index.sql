@@ -0,0 +1,2 @@
+-- Lets the trim job read prices for a range of books ordered by book, book store and id without sorting.
+ALTER TABLE `BookPrice` ADD KEY `BookId_BookStoreId` (`BookId`, `BookStoreId`);
@@ -0,0 +1,19 @@
+-- Price history as intervals: one row per price change for each book in each book store. Replaces the daily rollup
+-- in BookPriceDaily, which can be dropped with sql/drop_book_price_daily.sql.
+-- ValidTo is the time of the next price change and empty for the current price. The price charts expand the
+-- intervals to daily prices. The price update job extends the intervals, fill it initially by running
+-- BackfillPriceIntervalsJob. If the job was created as BackfillDailyPricesJob, rename it first:
+-- python -m bookprices.tool.rename_job -c <config> BackfillDailyPricesJob BackfillPriceIntervalsJob
+CREATE TABLE `BookPriceInterval` (
+  `Id` int unsigned NOT NULL AUTO_INCREMENT,
+  `BookId` mediumint unsigned NOT NULL,
+  `BookStoreId` mediumint unsigned NOT NULL,
+  `Price` float(10,2) NOT NULL,
+  `ValidFrom` datetime NOT NULL,
+  `ValidTo` datetime DEFAULT NULL,
+  PRIMARY KEY (`Id`),
+  KEY `BookId_BookStoreId_ValidFrom` (`BookId`, `BookStoreId`, `ValidFrom`),
+  KEY `BookStoreId` (`BookStoreId`),
+  CONSTRAINT `BookPriceInterval_ibfk_1` FOREIGN KEY (`BookId`) REFERENCES `Book` (`Id`) ON DELETE CASCADE,
+  CONSTRAINT `BookPriceInterval_ibfk_2` FOREIGN KEY (`BookStoreId`) REFERENCES `BookStore` (`Id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -0,0 +1,47 @@
+-- Range partitions BookPrice by month of Created.
+-- Partitioned InnoDB tables can't have foreign keys, so prices are deleted explicitly when a book or book store is
+-- deleted, and the partition key must be part of the primary key. ManageBookPricePartitionsJob adds partitions for
+-- the coming months by splitting p_future, and bookprices/tool/archive_prices.py archives and drops old partitions.
+ALTER TABLE `BookPrice` DROP FOREIGN KEY `BookPrice_ibfk_1`, DROP FOREIGN KEY `BookPrice_ibfk_2`;
+ALTER TABLE `BookPrice` DROP PRIMARY KEY, ADD PRIMARY KEY (`Id`, `Created`);
+
+ALTER TABLE `BookPrice` PARTITION BY RANGE COLUMNS(`Created`) (
+  PARTITION p_history VALUES LESS THAN ('2024-01-01'),
+  PARTITION p202401 VALUES LESS THAN ('2024-02-01'),
+  PARTITION p202402 VALUES LESS THAN ('2024-03-01'),
+  PARTITION p202403 VALUES LESS THAN ('2024-04-01'),
+  PARTITION p202404 VALUES LESS THAN ('2024-05-01'),
+  PARTITION p202405 VALUES LESS THAN ('2024-06-01'),
+  PARTITION p202406 VALUES LESS THAN ('2024-07-01'),
+  PARTITION p202407 VALUES LESS THAN ('2024-08-01'),
+  PARTITION p202408 VALUES LESS THAN ('2024-09-01'),
+  PARTITION p202409 VALUES LESS THAN ('2024-10-01'),
+  PARTITION p202410 VALUES LESS THAN ('2024-11-01'),
+  PARTITION p202411 VALUES LESS THAN ('2024-12-01'),
+  PARTITION p202412 VALUES LESS THAN ('2025-01-01'),
+  PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+  PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+  PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+  PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+  PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+  PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+  PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+  PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+  PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+  PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+  PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+  PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
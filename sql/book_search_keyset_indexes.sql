@@ -0,0 +1,4 @@
+-- Index used when seeking to the next search result page sorted by creation date.
+-- Title and Author are already indexed; InnoDB appends the primary key (Id) to secondary indexes,
+-- so (Column, Id) seeks are served by them.
+ALTER TABLE Book ADD INDEX Created (Created);
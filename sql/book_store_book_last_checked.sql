@@ -0,0 +1,8 @@
+-- When the price of a book in a book store was last checked.
+-- The price update only inserts into BookPrice when the price has changed, so BookPrice.Created is the time of the
+-- last price change, while LastChecked is updated for every successful price update.
+ALTER TABLE `BookStoreBook` ADD COLUMN `LastChecked` datetime NULL DEFAULT NULL;
+
+UPDATE BookStoreBook bsb
+INNER JOIN BookStoreLatestPrice lp ON lp.BookId = bsb.BookId AND lp.BookStoreId = bsb.BookStoreId
+SET bsb.LastChecked = lp.Created;
@@ -0,0 +1,22 @@
+-- Latest price for each book in each book store.
+-- Maintained by the price update, trim and delete prices jobs. Rebuild with bookprices/tool/rebuild_latest_prices.py
+CREATE TABLE `BookStoreLatestPrice` (
+  `BookId` mediumint unsigned NOT NULL,
+  `BookStoreId` mediumint unsigned NOT NULL,
+  `BookPriceId` mediumint unsigned NOT NULL,
+  `Price` float(10,2) NOT NULL,
+  `Created` datetime NOT NULL,
+  PRIMARY KEY (`BookId`, `BookStoreId`),
+  KEY `BookStoreId` (`BookStoreId`),
+  KEY `BookPriceId` (`BookPriceId`),
+  CONSTRAINT `BookStoreLatestPrice_ibfk_1` FOREIGN KEY (`BookId`) REFERENCES `Book` (`Id`) ON DELETE CASCADE,
+  CONSTRAINT `BookStoreLatestPrice_ibfk_2` FOREIGN KEY (`BookStoreId`) REFERENCES `BookStore` (`Id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+INSERT INTO BookStoreLatestPrice (BookId, BookStoreId, BookPriceId, Price, Created)
+SELECT bp.BookId, bp.BookStoreId, bp.Id, bp.Price, bp.Created
+FROM BookPrice bp
+INNER JOIN (
+    SELECT MAX(Id) AS Id
+    FROM BookPrice
+    GROUP BY BookId, BookStoreId) lp ON lp.Id = bp.Id;
@@ -0,0 +1,12 @@
+-- Request rate for each book store learned by the adaptive rate limiting of the price updates.
+-- Written after each price update and used as the starting rate for the next run. Backoffs is the number of times
+-- the rate was lowered during the last run, because the book store answered 429 or 5xx or timed out.
+CREATE TABLE `BookStoreRequestRate` (
+  `BookStoreId` mediumint unsigned NOT NULL,
+  `RequestsPerSecond` double NOT NULL,
+  `ConfiguredRequestsPerSecond` double NOT NULL,
+  `Backoffs` int unsigned NOT NULL DEFAULT 0,
+  `Updated` datetime NOT NULL,
+  PRIMARY KEY (`BookStoreId`),
+  CONSTRAINT `BookStoreRequestRate_ibfk_1` FOREIGN KEY (`BookStoreId`) REFERENCES `BookStore` (`Id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
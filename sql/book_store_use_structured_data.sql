@@ -0,0 +1,3 @@
+-- Whether prices are read from schema.org offer data (JSON-LD or microdata) on the book store's pages before the
+-- price CSS selector is used. Off by default; turn it on per book store once its offer data has been checked.
+ALTER TABLE `BookStore` ADD COLUMN `UseStructuredData` tinyint(1) NOT NULL DEFAULT 0;
@@ -0,0 +1,2 @@
+-- The price charts read BookPriceInterval, so the daily rollup is no longer written or read.
+DROP TABLE IF EXISTS `BookPriceDaily`;
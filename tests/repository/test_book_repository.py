@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime
+
+from bookprices.shared.db.tables import Book
+from bookprices.shared.repository.book import BookRepository
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def book_repository(data_session) -> BookRepository:
+    return BookRepository(data_session)
+
+
+@pytest.fixture
+def books() -> list[Book]:
+    return [
+        Book(isbn=f"978000000000{i}", title=f"Title {i}", author="Author", created=datetime.now())
+        for i in range(7)
+    ]
+
+
+def test_list_book_ids_after_seeks_past_given_id(book_repository: BookRepository, books: list[Book]) -> None:
+    for book in books:
+        book_repository.add(book)
+    book_repository._session.commit()
+
+    assert book_repository.list_book_ids_after(0, 3) == [1, 2, 3]
+    assert book_repository.list_book_ids_after(3, 3) == [4, 5, 6]
+    assert book_repository.list_book_ids_after(6, 3) == [7]
+    assert book_repository.list_book_ids_after(7, 3) == []
+
+
+def test_iter_book_id_batches_yields_all_book_ids(
+        book_repository: BookRepository,
+        books: list[Book],
+        session_factory) -> None:
+    for book in books:
+        book_repository.add(book)
+    book_repository._session.commit()
+
+    batches = list(UnitOfWork(session_factory).iter_book_id_batches(after_id=2, size=2))
+
+    assert batches == [[3, 4], [5, 6], [7]]
+
+
+def test_upsert_books_creates_new_and_updates_changed_books(
+        book_repository: BookRepository,
+        books: list[Book]) -> None:
+    for book in books:
+        book.format = "Hæftet"
+    for book in books[:3]:
+        book_repository.add(book)
+    book_repository._session.commit()
+
+    changed_book = Book(isbn=books[1].isbn, title="New title", author="Author", format="Hæftet", created=datetime.now())
+    unchanged_book = Book(
+        isbn=books[2].isbn, title=books[2].title, author="Author", format="Hæftet", created=datetime.now())
+    result = book_repository.upsert_books([changed_book, unchanged_book, *books[3:5]])
+    book_repository._session.commit()
+    book_repository._session.expunge_all()
+
+    assert result.updated_book_ids == [2]
+    assert sorted(result.created_book_ids) == [4, 5]
+    assert result.book_ids_by_isbn == {books[i].isbn: i + 1 for i in range(1, 5)}
+    assert book_repository.get(2).title == "New title"
+    assert len(book_repository.list_books_by_isbn()) == 5
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from bookprices.shared.db.tables import BookPrice, BookStoreLatestPrice
+from bookprices.shared.repository.bookprice import BookPriceRepository
+from bookprices.shared.repository.bookprice_archive import BookPriceArchive
+from bookprices.shared.repository.bookprice_interval import BookPriceIntervalRepository
+
+
+def test_archive_returns_prices_for_book_from_all_partitions(tmp_path) -> None:
+    archive = BookPriceArchive(str(tmp_path))
+    archive.write("p202401", [
+        (3, 2, 1, 20.0, datetime(2024, 1, 5)),
+        (1, 1, 1, 10.0, datetime(2024, 1, 3)),
+        (2, 1, 2, 12.0, datetime(2024, 1, 4)),
+    ])
+    archive.write("p202402", [(4, 1, 1, 9.0, datetime(2024, 2, 1))])
+
+    assert archive.list_partitions() == ["p202401", "p202402"]
+    assert [price[0] for price in archive.get_prices_for_book(1)] == [1, 2, 4]
+    assert archive.get_prices_for_book(1, bookstore_id=2) == [(2, 1, 2, 12.0, datetime(2024, 1, 4))]
+    assert archive.get_prices_for_book(3) == []
+
+
+def test_interval_refresh_keeps_history_from_archived_prices(data_session, tmp_path) -> None:
+    bookprice_repository = BookPriceRepository(data_session)
+    interval_repository = BookPriceIntervalRepository(data_session)
+    archived_prices = [(1, 1, 1, 10.0, datetime(2024, 1, 3)), (2, 1, 1, 9.0, datetime(2024, 1, 20))]
+    interval_repository.add_prices([
+        BookPrice(id=price_id, book_id=book_id, book_store_id=bookstore_id, price=price, created=created)
+        for price_id, book_id, bookstore_id, price, created in archived_prices])
+    bookprice_repository.add_prices([
+        BookPrice(book_id=1, book_store_id=1, price=9.0, created=datetime(2024, 2, 1)),
+        BookPrice(book_id=1, book_store_id=1, price=8.0, created=datetime(2024, 3, 1))])
+    data_session.commit()
+    archive = BookPriceArchive(str(tmp_path))
+    archive.write("p202401", archived_prices)
+
+    interval_repository.refresh_for_books([1])
+    data_session.commit()
+    refreshed_intervals = [(i.price, i.valid_from, i.valid_to) for i in interval_repository.list_for_book(1)]
+    interval_repository.refresh_for_books([1], archive)
+    data_session.commit()
+    recalculated_intervals = [(i.price, i.valid_from, i.valid_to) for i in interval_repository.list_for_book(1)]
+
+    assert refreshed_intervals == [
+        (10.0, datetime(2024, 1, 3), datetime(2024, 1, 20)),
+        (9.0, datetime(2024, 1, 20), datetime(2024, 2, 1)),
+        (9.0, datetime(2024, 2, 1), datetime(2024, 3, 1)),
+        (8.0, datetime(2024, 3, 1), None),
+    ]
+    assert recalculated_intervals == [
+        (10.0, datetime(2024, 1, 3), datetime(2024, 1, 20)),
+        (9.0, datetime(2024, 1, 20), datetime(2024, 3, 1)),
+        (8.0, datetime(2024, 3, 1), None),
+    ]
+
+
+def test_carry_forward_latest_prices_copies_only_prices_older_than_cutoff(data_session) -> None:
+    bookprice_repository = BookPriceRepository(data_session)
+    data_session.add_all([
+        BookStoreLatestPrice(book_id=1, book_store_id=1, book_price_id=1, price=10.0, created=datetime(2024, 1, 3)),
+        BookStoreLatestPrice(book_id=2, book_store_id=1, book_price_id=2, price=20.0, created=datetime(2024, 3, 3)),
+    ])
+    data_session.commit()
+
+    carried_book_ids = bookprice_repository.carry_forward_latest_prices(datetime(2024, 2, 1))
+    data_session.commit()
+
+    assert carried_book_ids == {1}
+    assert [(p.book_id, p.price, p.created) for p in bookprice_repository.get_list()] == [
+        (1, 10.0, datetime(2024, 2, 1))]
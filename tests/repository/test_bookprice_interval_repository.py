@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime, date
+
+from bookprices.shared.db.tables import BookPrice, BookStoreBook
+from bookprices.shared.repository.bookprice import BookPriceRepository
+from bookprices.shared.repository.bookprice_interval import BookPriceIntervalRepository
+
+
+@pytest.fixture
+def interval_repository(data_session) -> BookPriceIntervalRepository:
+    return BookPriceIntervalRepository(data_session)
+
+
+@pytest.fixture
+def bookprice_repository(data_session) -> BookPriceRepository:
+    return BookPriceRepository(data_session)
+
+
+@pytest.fixture
+def bookprices() -> list[BookPrice]:
+    return [
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=datetime(2025, 3, 1, 8)),
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=datetime(2025, 3, 2, 8)),
+        BookPrice(book_id=1, book_store_id=1, price=8.0, created=datetime(2025, 3, 4, 8)),
+        BookPrice(book_id=1, book_store_id=1, price=8.0, created=datetime(2025, 3, 5, 8)),
+        BookPrice(book_id=1, book_store_id=2, price=15.0, created=datetime(2025, 3, 2, 8)),
+    ]
+
+
+def test_refresh_for_books_creates_interval_per_price_change(
+        interval_repository: BookPriceIntervalRepository,
+        bookprice_repository: BookPriceRepository,
+        bookprices: list[BookPrice]) -> None:
+    bookprice_repository.add_prices(bookprices)
+    interval_repository.refresh_for_books([1])
+
+    intervals = interval_repository.list_for_book(1)
+    assert [(i.book_store_id, i.price, i.valid_from, i.valid_to) for i in intervals] == [
+        (1, 10.0, datetime(2025, 3, 1, 8), datetime(2025, 3, 4, 8)),
+        (1, 8.0, datetime(2025, 3, 4, 8), None),
+        (2, 15.0, datetime(2025, 3, 2, 8), None),
+    ]
+
+
+def test_add_prices_extends_intervals_like_refresh(
+        interval_repository: BookPriceIntervalRepository,
+        bookprices: list[BookPrice]) -> None:
+    interval_repository.add_prices(bookprices[:2])
+    interval_repository._session.commit()
+    interval_repository.add_prices(bookprices[2:])
+    interval_repository._session.commit()
+
+    intervals = interval_repository.list_for_book(1)
+    assert [(i.book_store_id, i.price, i.valid_from, i.valid_to) for i in intervals] == [
+        (1, 10.0, datetime(2025, 3, 1, 8), datetime(2025, 3, 4, 8)),
+        (1, 8.0, datetime(2025, 3, 4, 8), None),
+        (2, 15.0, datetime(2025, 3, 2, 8), None),
+    ]
+
+
+def test_get_daily_prices_for_book_uses_last_price_of_each_day(
+        interval_repository: BookPriceIntervalRepository) -> None:
+    interval_repository.add_prices([
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=datetime(2025, 3, 1, 8)),
+        BookPrice(book_id=1, book_store_id=1, price=9.0, created=datetime(2025, 3, 2, 8)),
+        BookPrice(book_id=1, book_store_id=1, price=7.0, created=datetime(2025, 3, 2, 18)),
+    ])
+    interval_repository._session.add(
+        BookStoreBook(book_id=1, book_store_id=1, url="/bog-1", last_checked=datetime(2025, 3, 6, 8)))
+    interval_repository._session.commit()
+
+    daily_prices = interval_repository.get_daily_prices_for_book(1, until=date(2025, 3, 4))
+
+    assert daily_prices == {1: [
+        (date(2025, 3, 1), 10.0),
+        (date(2025, 3, 2), 7.0),
+        (date(2025, 3, 3), 7.0),
+        (date(2025, 3, 4), 7.0),
+    ]}
+
+
+def test_get_daily_prices_for_book_ends_current_price_when_last_checked(
+        interval_repository: BookPriceIntervalRepository) -> None:
+    interval_repository.add_prices([
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=datetime(2025, 3, 1, 8)),
+        BookPrice(book_id=1, book_store_id=2, price=12.0, created=datetime(2025, 3, 1, 8)),
+    ])
+    interval_repository._session.add(
+        BookStoreBook(book_id=1, book_store_id=1, url="/bog-1", last_checked=datetime(2025, 3, 2, 8)))
+    interval_repository._session.commit()
+
+    daily_prices = interval_repository.get_daily_prices_for_book(1, until=date(2025, 3, 4))
+
+    assert daily_prices == {
+        1: [(date(2025, 3, 1), 10.0), (date(2025, 3, 2), 10.0)],
+        2: [(date(2025, 3, 1), 12.0)],
+    }
+
+
+def test_delete_older_than_removes_ended_intervals_and_cuts_off_spanning_ones(
+        interval_repository: BookPriceIntervalRepository,
+        bookprices: list[BookPrice]) -> None:
+    interval_repository.add_prices(bookprices)
+    interval_repository._session.commit()
+
+    interval_repository.delete_older_than(date(2025, 3, 5))
+    interval_repository._session.commit()
+
+    intervals = interval_repository.list_for_book(1)
+    assert [(i.book_store_id, i.price, i.valid_from, i.valid_to) for i in intervals] == [
+        (1, 8.0, datetime(2025, 3, 5), None),
+        (2, 15.0, datetime(2025, 3, 5), None),
+    ]
@@ -46,3 +46,25 @@ def test_delete_bookprice(
     bookprice_repository.delete(1)
     bookprice_repository._session.commit()
     assert not bookprice_repository.get_list()
+
+
+def test_get_duplicate_prices_returns_all_but_price_changes_in_book_id_range(
+        bookprice_repository: BookPriceRepository) -> None:
+    now = datetime.now()
+    bookprice_repository.add_prices([
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=now),
+        BookPrice(book_id=1, book_store_id=2, price=10.0, created=now),
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=now),
+        BookPrice(book_id=1, book_store_id=1, price=9.0, created=now),
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=now),
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=now),
+        BookPrice(book_id=2, book_store_id=1, price=5.0, created=now),
+        BookPrice(book_id=2, book_store_id=1, price=5.0, created=now),
+        BookPrice(book_id=3, book_store_id=1, price=5.0, created=now),
+        BookPrice(book_id=3, book_store_id=1, price=5.0, created=now),
+    ])
+    bookprice_repository._session.commit()
+
+    duplicate_prices = bookprice_repository.get_duplicate_prices(1, 2)
+
+    assert duplicate_prices == [(3, 1, 1), (6, 1, 1), (8, 2, 1)]
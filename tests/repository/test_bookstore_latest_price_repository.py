@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime, timedelta
+
+from bookprices.shared.db.tables import BookPrice
+from bookprices.shared.repository.bookprice import BookPriceRepository
+from bookprices.shared.repository.bookstore_latest_price import BookStoreLatestPriceRepository
+
+
+@pytest.fixture
+def latest_price_repository(data_session) -> BookStoreLatestPriceRepository:
+    return BookStoreLatestPriceRepository(data_session)
+
+
+@pytest.fixture
+def bookprice_repository(data_session) -> BookPriceRepository:
+    return BookPriceRepository(data_session)
+
+
+@pytest.fixture
+def bookprices() -> list[BookPrice]:
+    yesterday, now = datetime.now() - timedelta(days=1), datetime.now()
+    return [
+        BookPrice(book_id=1, book_store_id=1, price=10.0, created=yesterday),
+        BookPrice(book_id=1, book_store_id=1, price=9.0, created=now),
+        BookPrice(book_id=1, book_store_id=2, price=12.5, created=now),
+        BookPrice(book_id=2, book_store_id=1, price=20.0, created=now),
+    ]
+
+
+def test_rebuild_keeps_newest_price_per_book_and_store(
+        latest_price_repository: BookStoreLatestPriceRepository,
+        bookprice_repository: BookPriceRepository,
+        bookprices: list[BookPrice]) -> None:
+    bookprice_repository.add_prices(bookprices)
+
+    assert latest_price_repository.rebuild() == 3
+
+    latest_prices = latest_price_repository.list_for_book(1)
+    assert [(p.book_store_id, p.book_price_id, p.price) for p in latest_prices] == [(1, 2, 9.0), (2, 3, 12.5)]
+
+
+def test_refresh_for_books_falls_back_to_previous_price_after_delete(
+        latest_price_repository: BookStoreLatestPriceRepository,
+        bookprice_repository: BookPriceRepository,
+        bookprices: list[BookPrice]) -> None:
+    bookprice_repository.add_prices(bookprices)
+    latest_price_repository.rebuild()
+
+    bookprice_repository.delete_prices([2, 3])
+    latest_price_repository.refresh_for_books([1])
+
+    latest_prices = latest_price_repository.list_for_book(1)
+    assert [(p.book_store_id, p.book_price_id, p.price) for p in latest_prices] == [(1, 1, 10.0)]
+    assert [p.book_price_id for p in latest_price_repository.list_for_book(2)] == [4]
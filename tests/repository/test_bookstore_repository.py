@@ -1,6 +1,7 @@
 import pytest
+from datetime import datetime, timedelta
 
-from bookprices.shared.db.tables import BookStore
+from bookprices.shared.db.tables import BookStore, BookStoreBook
 from bookprices.shared.repository.bookstore import BookStoreRepository
 
 
@@ -72,3 +73,42 @@ def test_delete_bookstore(
     bookstore_repository.delete(1)
     bookstore_repository._session.commit()
     assert not bookstore_repository.get_list()
+
+
+def test_set_last_checked_updates_only_given_books_in_bookstore(
+        bookstore_repository: BookStoreRepository,
+        bookstore: BookStore) -> None:
+    bookstore_repository.add(bookstore)
+    bookstore_repository.add_books_to_bookstores([(1, 1, "/book-1"), (2, 1, "/book-2")])
+    bookstore_repository._session.commit()
+
+    last_checked = datetime.now().replace(microsecond=0)
+    bookstore_repository.set_last_checked([(1, 1)], last_checked)
+    bookstore_repository._session.commit()
+
+    last_checked_by_book_id = {
+        book_store_book.book_id: book_store_book.last_checked
+        for book_store_book in bookstore_repository._session.query(BookStoreBook).all()
+    }
+    assert last_checked_by_book_id == {1: last_checked, 2: None}
+
+    updated_percentage = bookstore_repository.get_bookstores_with_updated_prices_percentage(
+        last_checked - timedelta(days=1))
+    assert updated_percentage == [(1, bookstore.name, 2, 1, 50.0)]
+
+
+def test_add_books_to_bookstores_if_not_exist_skips_existing_entries(
+        bookstore_repository: BookStoreRepository,
+        bookstore: BookStore) -> None:
+    bookstore_repository.add(bookstore)
+    bookstore_repository.add_books_to_bookstores([(1, 1, "/book-1")])
+    bookstore_repository._session.commit()
+
+    bookstore_repository.add_books_to_bookstores_if_not_exist([(1, 1, "/other-url"), (2, 1, "/book-2")])
+    bookstore_repository._session.commit()
+
+    urls_by_book_id = {
+        book_store_book.book_id: book_store_book.url
+        for book_store_book in bookstore_repository._session.query(BookStoreBook).all()
+    }
+    assert urls_by_book_id == {1: "/book-1", 2: "/book-2"}
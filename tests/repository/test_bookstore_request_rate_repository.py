@@ -0,0 +1,45 @@
+import pytest
+from datetime import datetime
+
+from bookprices.shared.db.tables import BookStore, BookStoreRequestRate
+from bookprices.shared.repository.bookstore_request_rate import BookStoreRequestRateRepository
+
+
+@pytest.fixture
+def request_rate_repository(data_session) -> BookStoreRequestRateRepository:
+    return BookStoreRequestRateRepository(data_session)
+
+
+@pytest.fixture
+def bookstores() -> list[BookStore]:
+    return [
+        BookStore(name=name, url=f"https://bookstore{index}.dk", color_hex="000000", scraper_id=f"ScraperId{index}")
+        for index, name in enumerate(["Saxo", "Gucca"])
+    ]
+
+
+def _create_request_rate(
+        bookstore_id: int, requests_per_second: float, backoffs: int = 0) -> BookStoreRequestRate:
+    return BookStoreRequestRate(
+        book_store_id=bookstore_id,
+        requests_per_second=requests_per_second,
+        configured_requests_per_second=1.0,
+        backoffs=backoffs,
+        updated=datetime.now())
+
+
+def test_save_rates_adds_and_replaces_rates(
+        request_rate_repository: BookStoreRequestRateRepository,
+        bookstores: list[BookStore]) -> None:
+    request_rate_repository._session.add_all(bookstores)
+    request_rate_repository._session.commit()
+
+    request_rate_repository.save_rates([_create_request_rate(1, 1.5), _create_request_rate(2, 0.5)])
+    request_rate_repository._session.commit()
+    request_rate_repository.save_rates([_create_request_rate(1, 0.75, backoffs=2)])
+    request_rate_repository._session.commit()
+
+    assert request_rate_repository.get_rates_by_bookstore_id() == {1: 0.75, 2: 0.5}
+    rates = request_rate_repository.get_rates_with_bookstore_names()
+    assert [(name, requests_per_second, backoffs) for _, name, requests_per_second, _, backoffs, _ in rates] == [
+        ("Gucca", 0.5, 0), ("Saxo", 0.75, 2)]
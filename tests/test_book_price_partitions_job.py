@@ -0,0 +1,15 @@
+from datetime import date
+from unittest.mock import Mock
+
+from bookprices.job.job.book_price_partitions import ManageBookPricePartitionsJob
+from bookprices.shared.config.config import Config
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+def test_get_missing_months_fills_gap_until_months_ahead() -> None:
+    job = ManageBookPricePartitionsJob(Mock(Config, job_thread_count=None), Mock(UnitOfWork))
+
+    months = job.get_missing_months(date(2026, 11, 1), today=date(2026, 12, 15))
+
+    assert months == [date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1), date(2027, 2, 1), date(2027, 3, 1)]
+    assert job.get_missing_months(date(2027, 4, 1), today=date(2026, 12, 15)) == []
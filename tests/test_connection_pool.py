@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from bookprices.shared.db.bookprice import BookPriceDb
+from bookprices.shared.db.pool import ConnectionPool, PoolTimeoutError
+from bookprices.shared.model.book import Book
+
+
+@pytest.fixture
+def created_connections() -> list[MagicMock]:
+    return []
+
+
+@pytest.fixture
+def pool(created_connections) -> ConnectionPool:
+    def _create_connection() -> MagicMock:
+        new_connection = MagicMock()
+        new_connection.is_connected.return_value = True
+        created_connections.append(new_connection)
+        return new_connection
+
+    return ConnectionPool(_create_connection, pool_size=2, acquire_timeout_seconds=1)
+
+
+def test_get_connection_reuses_released_connection(pool, created_connections) -> None:
+    with pool.get_connection():
+        pass
+    with pool.get_connection():
+        pass
+
+    assert len(created_connections) == 1
+    created_connections[0].rollback.assert_called()
+    assert pool.get_statistics().acquisitions == 2
+
+
+def test_get_connection_raises_when_pool_is_exhausted(pool) -> None:
+    first, second = pool.get_connection(), pool.get_connection()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.get_connection()
+
+    first.close()
+    second.close()
+    assert pool.get_statistics().timeouts == 1
+
+
+def test_get_connection_replaces_connection_exceeding_max_lifetime(created_connections) -> None:
+    def _create_connection() -> MagicMock:
+        new_connection = MagicMock()
+        created_connections.append(new_connection)
+        return new_connection
+
+    pool = ConnectionPool(_create_connection, pool_size=1, max_lifetime_seconds=-1)
+    pool.get_connection().close()
+    pool.get_connection().close()
+
+    statistics = pool.get_statistics()
+    assert len(created_connections) == 2
+    assert statistics.connections_recycled == 1
+    assert statistics.open_connections == 1
+    created_connections[0].close.assert_called_once()
+
+
+def test_close_is_idempotent(pool) -> None:
+    pooled_connection = pool.get_connection()
+    pooled_connection.close()
+    pooled_connection.close()
+
+    assert pool.get_statistics().idle_connections == 1
+
+
+def test_get_all_book_prices_holds_one_connection_at_a_time() -> None:
+    interval_row = {"Id": 1, "BookStoreId": 2, "Price": 100.0, "ValidFrom": datetime.now() - timedelta(days=1),
+                    "ValidTo": None, "LastChecked": None}
+    bookstore_row = {"Id": 2, "Name": "Boghandel", "PriceFormat": None, "Url": "https://example.com",
+                     "SearchUrl": None, "SearchResultCssSelector": None, "PriceCssSelector": None,
+                     "ImageCssSelector": None, "IsbnCssSelector": None, "ColorHex": None, "ScraperId": None}
+    rows = iter([[interval_row], [bookstore_row]])
+
+    def _create_connection() -> MagicMock:
+        new_connection = MagicMock()
+        new_connection.cursor.return_value.__enter__.return_value.__iter__.side_effect = lambda: iter(next(rows))
+        return new_connection
+
+    pool = ConnectionPool(_create_connection, pool_size=1, acquire_timeout_seconds=0.1)
+    bookprice_db = BookPriceDb("localhost", "3306", "user", "password", "BookPrices", pool)
+
+    prices_by_bookstore = bookprice_db.get_all_book_prices(Book(1, "9788700000001", "Titel", "Forfatter", "Bog"))
+
+    assert [bookstore.name for bookstore in prices_by_bookstore] == ["Boghandel"]
+    assert pool.get_statistics().timeouts == 0
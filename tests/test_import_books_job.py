@@ -0,0 +1,93 @@
+from datetime import datetime
+from unittest.mock import Mock, MagicMock
+
+from bookprices.job.job.import_books import WilliamDamIncrementalBookImportJob, WilliamDamBookParser, NewBook
+from bookprices.shared.db.tables import Book
+from bookprices.shared.repository.book import BookUpsertResult
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.config.config import Config
+from bookprices.shared.event.base import EventManager
+from tests.shared import create_fake_response
+
+
+def _create_job(known_urls: set[str]) -> WilliamDamIncrementalBookImportJob:
+    unit_of_work = MagicMock()
+    unit_of_work.__enter__.return_value = unit_of_work
+    unit_of_work.bookstore_repository.list_book_urls.return_value = known_urls
+
+    return WilliamDamIncrementalBookImportJob(
+        Mock(Config, job_thread_count=None), unit_of_work, Mock(BookPriceKeyRemover), Mock(EventManager))
+
+
+def test_incremental_import_enqueues_only_new_books_and_stops_after_pages_without_new_books() -> None:
+    job = _create_job({"/known-1", "/known-2"})
+    pages = {
+        1: ["https://www.williamdam.dk/new-1", "https://www.williamdam.dk/known-1"],
+        2: ["https://www.williamdam.dk/known-2", "https://www.williamdam.dk/new-1"],
+        3: ["https://www.williamdam.dk/known-1"],
+        4: ["https://www.williamdam.dk/new-2", "https://www.williamdam.dk/known-2"],
+        5: ["https://www.williamdam.dk/known-2"],
+        6: ["https://www.williamdam.dk/known-1"],
+        7: ["https://www.williamdam.dk/known-2"],
+        8: ["https://www.williamdam.dk/new-3"],
+    }
+    requested_pages = []
+
+    def get_book_urls_from_list(book_list_url: str) -> list[str]:
+        page_number = int(book_list_url.rsplit("=", 1)[1])
+        requested_pages.append(page_number)
+        return pages[page_number]
+
+    job._get_book_urls_from_list = get_book_urls_from_list
+    job._enqueue_book_urls()
+
+    assert requested_pages == [1, 2, 3, 4, 5, 6, 7]
+    assert list(job._book_url_queue.queue) == ["https://www.williamdam.dk/new-1", "https://www.williamdam.dk/new-2"]
+
+
+def test_incremental_import_stops_at_empty_page() -> None:
+    job = _create_job(set())
+    job._get_book_urls_from_list = Mock(side_effect=[["https://www.williamdam.dk/new-1"], []])
+
+    job._enqueue_book_urls()
+
+    assert job._get_book_urls_from_list.call_count == 2
+    assert job._book_url_queue.qsize() == 1
+
+
+def test_incremental_import_stops_early_and_warns_if_there_are_no_new_books(caplog) -> None:
+    job = _create_job({"/known-1"})
+    job._get_book_urls_from_list = Mock(return_value=["https://www.williamdam.dk/known-1"])
+
+    job._enqueue_book_urls()
+
+    assert job._get_book_urls_from_list.call_count == WilliamDamIncrementalBookImportJob.max_pages_without_new_books
+    assert job._book_url_queue.empty()
+    assert "Stopped without finding any new books" in caplog.text
+
+
+def test_books_in_failed_chunk_are_saved_one_at_a_time() -> None:
+    job = _create_job(set())
+    books = [Book(isbn=f"978000000000{i}", title="Titel", author="Forfatter", format="Bog", created=datetime.now())
+             for i in range(3)]
+    job._found_books = [NewBook(book=book, url=f"/book-{book.isbn}") for book in books]
+
+    def upsert_books(chunk: list[Book]) -> BookUpsertResult:
+        if len(chunk) > 1 or chunk[0].isbn == books[1].isbn:
+            raise ValueError("Data too long for column 'Title'")
+        book_id = books.index(chunk[0]) + 1
+        return BookUpsertResult(book_ids_by_isbn={chunk[0].isbn: book_id}, created_book_ids=[book_id])
+
+    job._unit_of_work.book_repository.upsert_books.side_effect = upsert_books
+    job._create_or_update_books()
+
+    assert job._added_book_ids == [1, 3]
+
+
+def test_book_parser_reads_book_details() -> None:
+    book = WilliamDamBookParser().parse(create_fake_response("williamdam_book.html").text)
+
+    assert book.title == "Havet om natten"
+    assert book.author == "Anna Hansen"
+    assert book.isbn == "9788700000001"
+    assert book.format == "Hæftet"
@@ -0,0 +1,105 @@
+import threading
+from time import monotonic, sleep
+from unittest.mock import Mock
+
+from bookprices.job.service.price_fetch import PriceFetchEngine
+from bookprices.shared.db.tables import BookStoreBook, BookStore
+from bookprices.shared.webscraping.bookstore import BookStoreScraper
+from bookprices.shared.webscraping.http import RateLimiter
+from bookprices.shared.webscraping.price import PriceNotFoundException
+
+
+class FakeScraper(BookStoreScraper):
+    name = "FakeScraper"
+
+    def __init__(self, rate_limiter: RateLimiter | None = None, request_seconds: float = 0.0) -> None:
+        super().__init__(Mock())
+        self._rate_limiter = rate_limiter
+        self._request_seconds = request_seconds
+        self.request_times: list[float] = []
+
+    def find_book(self, book_id: int, isbn: str) -> None:
+        return None
+
+    def get_price(self, url: str) -> float:
+        if self._rate_limiter:
+            self._rate_limiter.wait_if_needed()
+        self.request_times.append(monotonic())
+        sleep(self._request_seconds)
+        if "missing" in url:
+            raise PriceNotFoundException
+        return 100.0
+
+    def get_price_rate_limiter(self) -> RateLimiter | None:
+        return self._rate_limiter
+
+    @classmethod
+    def get_name(cls) -> str:
+        return cls.name
+
+
+def _create_books_in_store(bookstore_id: int, count: int, url: str = "book") -> list[BookStoreBook]:
+    bookstore = BookStore(id=bookstore_id, url=f"https://store{bookstore_id}.dk/")
+    return [
+        BookStoreBook(book_id=book_id, book_store_id=bookstore_id, url=f"{url}/{book_id}", book_store=bookstore)
+        for book_id in range(1, count + 1)
+    ]
+
+
+def test_rate_limited_bookstore_does_not_hold_up_other_bookstores() -> None:
+    rate_limited_scraper = FakeScraper(RateLimiter(1, 1))
+    fast_scraper = FakeScraper(request_seconds=0.01)
+    engine = PriceFetchEngine(concurrency_per_bookstore=4)
+
+    started = monotonic()
+    results = engine.fetch_prices(
+        {1: _create_books_in_store(1, 2), 2: _create_books_in_store(2, 20)},
+        {1: rate_limited_scraper, 2: fast_scraper})
+
+    assert len(results) == 22
+    assert all(result.price == 100.0 for result in results)
+    assert max(fast_scraper.request_times) - started < 0.5
+    assert rate_limited_scraper.request_times[1] - rate_limited_scraper.request_times[0] >= 0.9
+
+
+def test_fetch_prices_returns_errors_per_book() -> None:
+    engine = PriceFetchEngine()
+
+    results = engine.fetch_prices(
+        {1: _create_books_in_store(1, 1) + _create_books_in_store(1, 1, url="missing")},
+        {1: FakeScraper()})
+
+    errors = [result.error for result in results if result.error]
+    assert len(results) == 2
+    assert len(errors) == 1
+    assert isinstance(errors[0], PriceNotFoundException)
+
+
+def test_budget_follows_rate_limit_of_bookstore() -> None:
+    engine = PriceFetchEngine(concurrency_per_bookstore=4)
+
+    budget = engine.get_budget(FakeScraper(RateLimiter(2, 1)))
+
+    assert budget.concurrency == 2
+    assert budget.max_requests == 2
+    assert budget.period_seconds == 1
+
+
+def test_fetch_prices_skips_bookstores_without_scraper() -> None:
+    engine = PriceFetchEngine()
+
+    assert engine.fetch_prices({1: _create_books_in_store(1, 3)}, {}) == []
+
+
+def test_results_are_handled_outside_the_event_loop_thread() -> None:
+    handler_threads = set()
+    engine = PriceFetchEngine(concurrency_per_bookstore=2)
+
+    def _on_result(_) -> None:
+        handler_threads.add(threading.current_thread())
+        sleep(0.01)
+
+    engine.stream_prices({1: _create_books_in_store(1, 5)}, {1: FakeScraper()}, _on_result)
+
+    assert len(handler_threads) == 1
+    assert threading.main_thread() not in handler_threads
@@ -0,0 +1,78 @@
+from datetime import datetime, date
+from unittest.mock import Mock
+
+import pytest
+
+from bookprices.job.service.price_retention_service import (
+    PriceRetentionPolicy, PriceRetentionService, PriceResolution, PriceRetentionTier)
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.db.tables import BookPrice
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+TODAY = date(2025, 6, 30)
+
+
+@pytest.fixture
+def retention_policy() -> PriceRetentionPolicy:
+    return PriceRetentionPolicy.parse("day:30,week:90,month")
+
+
+def test_parse_retention_tiers(retention_policy: PriceRetentionPolicy) -> None:
+    assert retention_policy.tiers == [
+        PriceRetentionTier(PriceResolution.DAY, 30),
+        PriceRetentionTier(PriceResolution.WEEK, 90),
+        PriceRetentionTier(PriceResolution.MONTH),
+    ]
+
+
+@pytest.mark.parametrize("tiers", ["", "year:30", "day:30,week:x", "day:90,week:30,month", "day,week:90"])
+def test_parse_invalid_retention_tiers_raises(tiers: str) -> None:
+    with pytest.raises(ValueError):
+        PriceRetentionPolicy.parse(tiers)
+
+
+def test_get_resolution_by_age(retention_policy: PriceRetentionPolicy) -> None:
+    assert retention_policy.get_resolution(datetime(2025, 6, 1), TODAY) == PriceResolution.DAY
+    assert retention_policy.get_resolution(datetime(2025, 5, 1), TODAY) == PriceResolution.WEEK
+    assert retention_policy.get_resolution(datetime(2024, 1, 1), TODAY) == PriceResolution.MONTH
+
+
+def test_get_prices_to_remove_keeps_last_price_per_period(retention_policy: PriceRetentionPolicy) -> None:
+    service = PriceRetentionService(Mock(UnitOfWork), Mock(BookPriceKeyRemover), retention_policy)
+    prices = [
+        (1, 1, 1, datetime(2024, 1, 3)),
+        (2, 1, 1, datetime(2024, 1, 20)),
+        (3, 1, 2, datetime(2024, 1, 21)),
+        (4, 1, 1, datetime(2025, 5, 5)),
+        (5, 1, 1, datetime(2025, 5, 7)),
+        (6, 1, 1, datetime(2025, 5, 12)),
+        (7, 1, 1, datetime(2025, 6, 20, 8)),
+        (8, 1, 1, datetime(2025, 6, 20, 18)),
+        (9, 1, 1, datetime(2025, 6, 21)),
+    ]
+
+    prices_to_remove = service.get_prices_to_remove(prices, TODAY)
+
+    assert [price[0] for price in prices_to_remove] == [1, 4, 7]
+
+
+def test_downsample_prices_keeps_price_history(session_factory, retention_policy) -> None:
+    unit_of_work = UnitOfWork(session_factory)
+    service = PriceRetentionService(unit_of_work, Mock(BookPriceKeyRemover), retention_policy)
+    with unit_of_work as uow:
+        uow.bookprice_repository.add_prices([
+            BookPrice(book_id=1, book_store_id=1, price=10.0, created=datetime(2024, 1, 3)),
+            BookPrice(book_id=1, book_store_id=1, price=9.0, created=datetime(2024, 1, 20)),
+            BookPrice(book_id=1, book_store_id=1, price=8.0, created=datetime(2025, 6, 29)),
+        ])
+        uow.bookprice_interval_repository.refresh_for_books([1])
+
+    assert service.downsample_prices([1], TODAY) == 1
+
+    with unit_of_work as uow:
+        intervals = uow.bookprice_interval_repository.list_for_book(1)
+    assert [(interval.price, interval.valid_from) for interval in intervals] == [
+        (10.0, datetime(2024, 1, 3)),
+        (9.0, datetime(2024, 1, 20)),
+        (8.0, datetime(2025, 6, 29)),
+    ]
@@ -0,0 +1,40 @@
+from unittest.mock import MagicMock, Mock
+
+from bookprices.job.service.price_update import PriceUpdateService
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.service.scraper_service import BookStoreScraperService
+from bookprices.shared.webscraping.bookstore import BookStoreScraper
+
+
+def _create_service() -> tuple[PriceUpdateService, Mock]:
+    unit_of_work = MagicMock()
+    unit_of_work.__enter__.return_value = unit_of_work
+    unit_of_work.bookstore_repository.get_list.return_value = [Mock(id=1)]
+    unit_of_work.bookstore_repository.get_bookstores_for_books.return_value = {}
+    scraper = Mock(BookStoreScraper)
+    scraper.get_price_source_statistics.return_value = None
+    scraper.get_request_rate.return_value = None
+    scraper_service = Mock(BookStoreScraperService)
+    scraper_service.get_scraper.return_value = scraper
+
+    return PriceUpdateService(Mock(BookPriceKeyRemover), unit_of_work, scraper_service, 1), scraper_service
+
+
+def test_run_keeps_scrapers_for_all_batches() -> None:
+    service, scraper_service = _create_service()
+
+    service.start_run()
+    service.update_prices_for_books([1])
+    service.update_prices_for_books([2])
+    service.finish_run()
+
+    scraper_service.get_scraper.assert_called_once_with(1)
+
+
+def test_update_outside_run_loads_scrapers_for_each_update() -> None:
+    service, scraper_service = _create_service()
+
+    service.update_prices_for_books([1])
+    service.update_prices_for_books([2])
+
+    assert scraper_service.get_scraper.call_count == 2
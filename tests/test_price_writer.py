@@ -0,0 +1,128 @@
+from datetime import datetime
+from time import sleep
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from bookprices.job.service.price_writer import PriceWriter, PriceWriterError, UnchangedPrice
+from bookprices.shared.cache.key_remover import BookPriceKeyRemover
+from bookprices.shared.db.tables import BookPrice, FailedPriceUpdate
+
+
+@pytest.fixture
+def unit_of_work() -> MagicMock:
+    unit_of_work = MagicMock()
+    unit_of_work.__enter__.return_value = unit_of_work
+    return unit_of_work
+
+
+def _create_price(book_id: int) -> BookPrice:
+    return BookPrice(book_id=book_id, book_store_id=1, price=100.0, created=datetime.now())
+
+
+def _get_saved_prices(unit_of_work: MagicMock) -> list[list[BookPrice]]:
+    return [call.args[0] for call in unit_of_work.bookprice_repository.add_prices.call_args_list]
+
+
+def test_writer_saves_prices_in_batches(unit_of_work) -> None:
+    with PriceWriter(unit_of_work, Mock(BookPriceKeyRemover), batch_size=2) as price_writer:
+        for book_id in range(1, 6):
+            price_writer.add_price(_create_price(book_id))
+
+    saved_prices = _get_saved_prices(unit_of_work)
+    assert [len(prices) for prices in saved_prices] == [2, 2, 1]
+    assert price_writer.statistics.prices_saved == 5
+    assert price_writer.statistics.flushes == 3
+
+
+def test_writer_flushes_after_interval(unit_of_work) -> None:
+    price_writer = PriceWriter(unit_of_work, Mock(BookPriceKeyRemover), batch_size=100, flush_interval_seconds=0.05)
+    price_writer.start()
+    price_writer.add_price(_create_price(1))
+    sleep(0.3)
+
+    saved_before_close = len(_get_saved_prices(unit_of_work))
+    price_writer.close()
+
+    assert saved_before_close == 1
+
+
+def test_writer_sets_last_checked_for_unchanged_prices_without_saving_them(unit_of_work) -> None:
+    cache_key_remover = Mock(BookPriceKeyRemover)
+    checked = datetime.now()
+    with PriceWriter(unit_of_work, cache_key_remover) as price_writer:
+        price_writer.add_price(_create_price(2))
+        price_writer.add_unchanged_price(UnchangedPrice(book_id=3, book_store_id=1, checked=checked))
+        price_writer.add_failed_update(
+            FailedPriceUpdate(book_id=5, book_store_id=1, reason="PageNotFound", created=datetime.now()))
+
+    saved_prices = _get_saved_prices(unit_of_work)
+    assert [price.book_id for price in saved_prices[0]] == [2]
+    checked_book_store_ids, last_checked = unit_of_work.bookstore_repository.set_last_checked.call_args.args
+    assert checked_book_store_ids == {(2, 1), (3, 1)}
+    assert last_checked >= checked
+    unit_of_work.failed_price_update_repository.add.assert_called_once()
+    cache_key_remover.remove_keys_for_books.assert_called_once_with({2})
+    cache_key_remover.remove_keys_for_books_and_bookstores.assert_called_once_with({(2, 1)})
+    assert price_writer.statistics.unchanged_prices == 1
+
+
+def test_writer_doesnt_save_prices_for_only_unchanged_prices(unit_of_work) -> None:
+    with PriceWriter(unit_of_work, Mock(BookPriceKeyRemover)) as price_writer:
+        price_writer.add_unchanged_price(UnchangedPrice(book_id=3, book_store_id=1, checked=datetime.now()))
+
+    unit_of_work.bookprice_repository.add_prices.assert_not_called()
+    unit_of_work.bookstore_latest_price_repository.refresh_for_books.assert_not_called()
+    unit_of_work.bookstore_repository.set_last_checked.assert_called_once()
+
+
+def test_writer_retries_failed_batch(unit_of_work, monkeypatch) -> None:
+    monkeypatch.setattr(PriceWriter, "flush_retry_delay_seconds", 0)
+    unit_of_work.bookprice_repository.add_prices.side_effect = [Exception("Deadlock"), None]
+    with PriceWriter(unit_of_work, Mock(BookPriceKeyRemover), batch_size=1) as price_writer:
+        price_writer.add_price(_create_price(1))
+
+    assert price_writer.statistics.failed_flushes == 0
+    assert price_writer.statistics.prices_saved == 1
+
+
+def test_writer_continues_after_failed_batch_and_fails_on_close(unit_of_work, monkeypatch) -> None:
+    monkeypatch.setattr(PriceWriter, "flush_retry_delay_seconds", 0)
+
+    def _add_prices(prices: list[BookPrice]) -> None:
+        if prices[0].book_id == 1:
+            raise Exception("Deadlock")
+
+    unit_of_work.bookprice_repository.add_prices.side_effect = _add_prices
+    price_writer = PriceWriter(unit_of_work, Mock(BookPriceKeyRemover), batch_size=1)
+    with pytest.raises(PriceWriterError):
+        with price_writer:
+            price_writer.add_price(_create_price(1))
+            price_writer.add_price(_create_price(2))
+
+    assert price_writer.statistics.failed_flushes == 1
+    assert price_writer.statistics.prices_saved == 1
+
+
+def test_writer_saves_prices_when_cache_removal_fails(unit_of_work) -> None:
+    cache_key_remover = Mock(BookPriceKeyRemover)
+    cache_key_remover.remove_keys_for_books.side_effect = ConnectionError("Redis is down")
+    with PriceWriter(unit_of_work, cache_key_remover, batch_size=1, queue_size=3) as price_writer:
+        for book_id in range(1, 11):
+            price_writer.add_price(_create_price(book_id))
+
+    assert price_writer.statistics.prices_saved == 10
+    assert price_writer.statistics.failed_cache_removals == 10
+
+
+def test_writer_fails_on_close_if_writer_thread_stopped(unit_of_work, monkeypatch) -> None:
+    monkeypatch.setattr(PriceWriter, "put_timeout_seconds", 0.05)
+    monkeypatch.setattr(PriceWriter, "_write_batches", Mock(side_effect=RuntimeError("Writer crashed")))
+    price_writer = PriceWriter(unit_of_work, Mock(BookPriceKeyRemover), batch_size=1, queue_size=1)
+    price_writer.start()
+
+    with pytest.raises(PriceWriterError):
+        for book_id in range(1, 4):
+            price_writer.add_price(_create_price(book_id))
+    with pytest.raises(PriceWriterError):
+        price_writer.close()
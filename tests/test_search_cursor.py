@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from bookprices.shared.db.book import BookSearchSortOption, SearchCursor
+from bookprices.shared.model.book import Book
+from bookprices.web.service.search_cursor import create_search_cursor, encode_search_cursor, decode_search_cursor
+
+
+def _create_book() -> Book:
+    return Book(42, "9780000000001", "Title", "Author", "Paperback", created=datetime(2024, 5, 1, 12, 30))
+
+
+def test_cursor_round_trip_for_each_sort_option() -> None:
+    book = _create_book()
+    for sort_option in BookSearchSortOption:
+        cursor = create_search_cursor(book, sort_option)
+        token = encode_search_cursor(cursor, sort_option, descending=True)
+
+        assert decode_search_cursor(token, sort_option, descending=True) == cursor
+
+
+def test_decode_cursor_for_created_returns_datetime() -> None:
+    token = encode_search_cursor(
+        create_search_cursor(_create_book(), BookSearchSortOption.Created), BookSearchSortOption.Created, False)
+
+    assert decode_search_cursor(token, BookSearchSortOption.Created, False) == SearchCursor(
+        book_id=42, sort_value=datetime(2024, 5, 1, 12, 30))
+
+
+def test_decode_cursor_returns_none_for_other_sort_order() -> None:
+    token = encode_search_cursor(
+        create_search_cursor(_create_book(), BookSearchSortOption.Title), BookSearchSortOption.Title, False)
+
+    assert decode_search_cursor(token, BookSearchSortOption.Author, False) is None
+    assert decode_search_cursor(token, BookSearchSortOption.Title, True) is None
+
+
+def test_decode_cursor_returns_none_for_malformed_token() -> None:
+    assert decode_search_cursor("not-a-cursor", BookSearchSortOption.Title, False) is None
+    assert decode_search_cursor("", BookSearchSortOption.Title, False) is None
@@ -0,0 +1,123 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from bookprices.shared.db.book import SearchQuery, BookSearchSortOption, SearchCursor
+from bookprices.shared.model.book import Book
+from bookprices.shared.search.inverted_index import BookSearchIndex, InvertedIndexSearchBackend
+
+
+@pytest.fixture
+def books() -> list[Book]:
+    return [
+        Book(1, "9788700000001", "Harry Potter og De Vises Sten", "J.K. Rowling", "Paperback",
+             created=datetime(2024, 1, 1)),
+        Book(2, "9788700000002", "Harry Potter og Hemmelighedernes Kammer", "J.K. Rowling", "Paperback",
+             created=datetime(2024, 1, 2)),
+        Book(3, "9788711111111", "Potteriets historie", "Anna Hansen", "Hardback", created=datetime(2024, 1, 3)),
+        Book(4, "9788722222222", "Kunsten at lave en potte", "Harry Jensen", "Paperback",
+             created=datetime(2024, 1, 4)),
+        Book(5, "9788733333333", "Krig og fred", "Leo Tolstoj", "Paperback", created=datetime(2024, 1, 5)),
+    ]
+
+
+@pytest.fixture
+def index(books) -> BookSearchIndex:
+    return BookSearchIndex(books)
+
+
+def _create_query(search_phrase: str,
+                  sort_option: BookSearchSortOption = BookSearchSortOption.Title,
+                  author: str | None = None,
+                  page: int = 1,
+                  page_size: int = 10,
+                  descending: bool = False,
+                  after: SearchCursor | None = None) -> SearchQuery:
+    return SearchQuery(search_phrase, author, page, page_size, sort_option, descending, after)
+
+
+def test_search_matches_words_anywhere_in_title(index) -> None:
+    books = index.search(_create_query("otter"))
+
+    assert [book.id for book in books] == [1, 2, 3]
+
+
+def test_search_requires_all_words_to_match(index) -> None:
+    books = index.search(_create_query("harry hemmelig"))
+
+    assert [book.id for book in books] == [2]
+
+
+def test_search_by_relevance_ranks_exact_title_matches_first(index) -> None:
+    books = index.search(_create_query("potter", BookSearchSortOption.Relevance, descending=True))
+
+    assert [book.id for book in books] == [1, 2, 3]
+
+
+def test_search_with_author_filter(index) -> None:
+    books = index.search(_create_query("harry", author="Harry Jensen"))
+
+    assert [book.id for book in books] == [4]
+
+
+def test_search_by_isbn_prefix(index) -> None:
+    books = index.search(_create_query("978-87000"))
+
+    assert [book.id for book in books] == [1, 2]
+
+
+def test_search_pages_with_cursor_in_descending_order(index, books) -> None:
+    first_page = index.search(_create_query("", BookSearchSortOption.Created, page_size=2, descending=True))
+    cursor = SearchCursor(book_id=first_page[-1].id, sort_value=first_page[-1].created)
+    second_page = index.search(
+        _create_query("", BookSearchSortOption.Created, page_size=2, descending=True, after=cursor))
+
+    assert [book.id for book in first_page] == [5, 4]
+    assert [book.id for book in second_page] == [3, 2]
+
+
+def test_search_pages_with_offset_for_matching_books(index) -> None:
+    books = index.search(_create_query("potte", BookSearchSortOption.Created, page=2, page_size=2))
+
+    assert [book.id for book in books] == [3, 4]
+
+
+def test_get_search_suggestions_returns_matching_titles_and_authors(index) -> None:
+    suggestions = index.get_search_suggestions("harry")
+
+    assert suggestions == ["Harry Jensen", "Harry Potter og De Vises Sten", "Harry Potter og Hemmelighedernes Kammer"]
+
+
+def test_get_search_suggestions_for_author(index) -> None:
+    suggestions = index.get_search_suggestions("potter", author="Anna Hansen")
+
+    assert suggestions == ["Potteriets historie"]
+
+
+def test_backend_uses_new_books_after_rebuild(books) -> None:
+    loaded_books = list(books)
+    backend = InvertedIndexSearchBackend(lambda: loaded_books)
+    assert not backend.search(_create_query("tolstoj anna"))
+
+    loaded_books.append(Book(6, "9788744444444", "Anna Karenina", "Leo Tolstoj", "Paperback"))
+    backend.rebuild()
+
+    assert [book.id for book in backend.search(_create_query("tolstoj anna"))] == [6]
+
+
+def test_backend_rebuilds_index_when_version_changes(books) -> None:
+    loaded_books = list(books)
+    version = [1]
+    backend = InvertedIndexSearchBackend(
+        lambda: list(loaded_books), get_version=lambda: version[0], version_check_interval_seconds=0)
+    assert not backend.search(_create_query("tolstoj anna"))
+
+    loaded_books.append(Book(6, "9788744444444", "Anna Karenina", "Leo Tolstoj", "Paperback"))
+    version[0] = 2
+    for _ in range(100):
+        if found_books := backend.search(_create_query("tolstoj anna")):
+            break
+        time.sleep(0.01)
+
+    assert [book.id for book in found_books] == [6]
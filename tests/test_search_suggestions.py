@@ -0,0 +1,70 @@
+import time
+
+from bookprices.shared.search.suggestions import SearchSuggestionIndex, SearchSuggestionService
+
+
+TITLES_AND_AUTHORS = [
+    ("Harry Potter og De Vises Sten", "J.K. Rowling"),
+    ("Harry Potter og Hemmelighedernes Kammer", "J.K. Rowling"),
+    ("Hamlet", "William Shakespeare"),
+    ("Hamlet", "William Shakespeare"),
+    ("Kunsten at lave en potte", "Harry Jensen"),
+]
+
+
+def test_get_search_suggestions_matches_titles_and_authors_by_prefix() -> None:
+    index = SearchSuggestionIndex(TITLES_AND_AUTHORS)
+
+    assert index.get_search_suggestions("harry") == [
+        "Harry Jensen", "Harry Potter og De Vises Sten", "Harry Potter og Hemmelighedernes Kammer"]
+    assert index.get_search_suggestions("HAM") == ["Hamlet"]
+    assert index.get_search_suggestions("potter") == []
+
+
+def test_get_search_suggestions_for_author_only_returns_titles_by_author() -> None:
+    index = SearchSuggestionIndex(TITLES_AND_AUTHORS)
+
+    assert index.get_search_suggestions("h", author="J.K. Rowling") == [
+        "Harry Potter og De Vises Sten", "Harry Potter og Hemmelighedernes Kammer"]
+    assert index.get_search_suggestions("h", author="Unknown") == []
+
+
+def test_get_search_suggestions_returns_at_most_max_suggestions() -> None:
+    index = SearchSuggestionIndex((f"Bog {number:03d}", "Forfatter") for number in range(150))
+
+    suggestions = index.get_search_suggestions("bog")
+
+    assert len(suggestions) == SearchSuggestionIndex.max_suggestions
+    assert suggestions[0] == "Bog 000"
+
+
+def test_service_rebuilds_index_when_version_changes() -> None:
+    titles_and_authors = list(TITLES_AND_AUTHORS)
+    version = [1]
+    service = SearchSuggestionService(
+        lambda: list(titles_and_authors), get_version=lambda: version[0], version_check_interval_seconds=0)
+    assert service.get_search_suggestions("krig") == []
+
+    titles_and_authors.append(("Krig og fred", "Leo Tolstoj"))
+    version[0] = 2
+    service.get_search_suggestions("krig")
+    for _ in range(100):
+        if suggestions := service.get_search_suggestions("krig"):
+            break
+        time.sleep(0.01)
+
+    assert suggestions == ["Krig og fred"]
+
+
+def test_service_keeps_index_when_version_is_unchanged() -> None:
+    load_count = [0]
+
+    def _load() -> list[tuple[str, str]]:
+        load_count[0] += 1
+        return TITLES_AND_AUTHORS
+
+    service = SearchSuggestionService(_load, get_version=lambda: 1, version_check_interval_seconds=0)
+    service.get_search_suggestions("harry")
+    service.get_search_suggestions("hamlet")
+
+    assert load_count[0] == 1
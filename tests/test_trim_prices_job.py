@@ -10,6 +10,8 @@ from bookprices.shared.db.bookprice import BookPriceDb
 from bookprices.shared.model.book import Book
 from bookprices.shared.model.bookprice import BookPrice
 from bookprices.shared.model.bookstore import BookStore
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+import bookprices.shared.db.tables as tables
 
 
 def _generate_prices(count: int) -> list[tuple[int, int, int, float, datetime]]:
@@ -82,3 +84,24 @@ def test_get_prices_to_remove_many_deleted_but_not_the_first_update(job: TrimPri
     price_ids_to_delete = {x[0] for x in prices_to_delete}
     assert prices[0][0] not in price_ids_to_delete
     assert prices[-1][0] not in price_ids_to_delete
+
+
+def test_trim_duplicate_prices_deletes_in_chunks_and_refreshes_latest_prices(session_factory) -> None:
+    unit_of_work = UnitOfWork(session_factory)
+    cache_key_remover = Mock(BookPriceKeyRemover)
+    service = TrimPricesService(unit_of_work, cache_key_remover)
+    service.delete_chunk_size = 2
+    with unit_of_work as uow:
+        uow.bookprice_repository.add_prices(
+            [tables.BookPrice(book_id=1, book_store_id=1, price=10.0, created=datetime.now()) for _ in range(6)])
+
+    result = service.trim_duplicate_prices([1, 2])
+
+    with unit_of_work as uow:
+        remaining_price_ids = [price.id for price in uow.bookprice_repository.get_list()]
+        latest_prices = uow.bookstore_latest_price_repository.list_for_book(1)
+    assert result.prices_deleted == 5
+    assert remaining_price_ids == [1]
+    assert [latest_price.book_price_id for latest_price in latest_prices] == [1]
+    cache_key_remover.remove_keys_for_books.assert_called_once_with({1})
+    cache_key_remover.remove_keys_for_books_and_bookstores.assert_called_once_with({(1, 1)})
@@ -0,0 +1,40 @@
+import pytest
+
+from bookprices.shared.repository.book import BookRepository
+from bookprices.shared.repository.unit_of_work import UnitOfWork
+
+
+def test_repositories_are_created_lazily_and_reused(session_factory) -> None:
+    uow = UnitOfWork(session_factory)
+    with uow:
+        assert uow._repositories == {}
+
+        book_repository = uow.book_repository
+
+        assert isinstance(book_repository, BookRepository)
+        assert uow.book_repository is book_repository
+        assert list(uow._repositories) == [BookRepository]
+
+
+def test_repositories_are_recreated_for_each_unit_of_work(session_factory) -> None:
+    uow = UnitOfWork(session_factory)
+    with uow:
+        first_repository = uow.book_repository
+    with uow:
+        second_repository = uow.book_repository
+
+    assert first_repository is not second_repository
+
+
+def test_repository_access_outside_context_raises(session_factory) -> None:
+    with pytest.raises(RuntimeError):
+        _ = UnitOfWork(session_factory).book_repository
+
+
+def test_repository_access_after_context_raises(session_factory) -> None:
+    unit_of_work = UnitOfWork(session_factory)
+    with unit_of_work as uow:
+        _ = uow.book_repository
+
+    with pytest.raises(RuntimeError):
+        _ = unit_of_work.book_repository
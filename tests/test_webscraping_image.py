@@ -10,13 +10,12 @@ from bookprices.shared.webscraping.image import ImageDownloader, ImageSource
 @pytest.mark.parametrize("css_selector,expected_url_found",
                          [("#img-folder-only", "https://example.com/static/images/books/1.jpg"),
                           ("#img-full-url", "https://example.com/static/images/books/1.jpg")])
-def test_image_downloader_finds_url_from_img_element(monkeypatch, css_selector, expected_url_found):
+def test_image_downloader_finds_url_from_img_element(monkeypatch, tmp_path, css_selector, expected_url_found):
     book_id = 1
     resp_headers = {'Content-Type': 'image/jpeg'}
     monkeypatch.setattr(requests, "get", lambda x, headers: shared.create_fake_response("image.html", headers=resp_headers))
 
-    image_dir = "."
-    book_image_file_service = BookImageFileService(image_dir)
+    book_image_file_service = BookImageFileService(str(tmp_path))
     image_downloader = ImageDownloader(book_image_file_service, MagicMock(), MagicMock())
 
     image_downloader._image_not_excluded = MagicMock(return_value=True)
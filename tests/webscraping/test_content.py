@@ -0,0 +1,68 @@
+import pytest
+
+from bookprices.shared.webscraping.content import HtmlContent, HtmlParserBackend
+from tests.shared import create_fake_response
+
+SELECTORS = [
+    ("price_format.html", "tbody tr:nth-child(2) td:nth-child(2)", "href"),
+    ("price_format.html", "table.table td a[href*='store']", "href"),
+    ("price_format.html", "div.col p", "class"),
+    ("price_format.html", "h3 small.text-muted", "class"),
+    ("price_format.html", "#does-not-exist", "href"),
+    ("image.html", "img#img-full-url", "src"),
+    ("image.html", "img.img-fluid", "alt"),
+    ("williamdam_book.html", "a.manufacturer-link", "href"),
+    ("williamdam_book.html", "ul.list li:nth-of-type(5) span.detail-value", "class"),
+    ("williamdam_book.html", "a.product-name", "href"),
+]
+
+
+def _get_results(html_content: HtmlContent, css_selector: str, attribute_name: str) -> list:
+    return [
+        html_content.find_elements_by_css_and_get_attribute_values(css_selector, attribute_name),
+        html_content.find_elements_by_css_and_get_texts(css_selector),
+        html_content.find_element_text_by_css(css_selector),
+        html_content.find_element_by_css(css_selector),
+        html_content.find_elements_by_css(css_selector),
+        html_content.find_element_and_get_attribute_value(css_selector, attribute_name),
+        html_content.find_element_text_without_child_by_css(css_selector, "span"),
+        html_content.find_elements_by_css_and_get_child_texts(css_selector, "span"),
+    ]
+
+
+@pytest.mark.parametrize("html_file,css_selector,attribute_name", SELECTORS)
+def test_lxml_backend_returns_same_results_as_html_parser(html_file, css_selector, attribute_name) -> None:
+    html = create_fake_response(html_file).text
+
+    html_parser_results = _get_results(HtmlContent(html, HtmlParserBackend.HTML_PARSER), css_selector, attribute_name)
+    lxml_results = _get_results(HtmlContent(html, HtmlParserBackend.LXML), css_selector, attribute_name)
+
+    assert lxml_results == html_parser_results
+
+
+def test_lxml_backend_returns_same_results_for_html_fragment() -> None:
+    fragment = '<li><span class="detail-label">Format</span> <span class="detail-value">Hæftet</span></li>'
+
+    html_parser_content = HtmlContent(fragment, HtmlParserBackend.HTML_PARSER)
+    lxml_content = HtmlContent(fragment, HtmlParserBackend.LXML)
+
+    assert (lxml_content.find_element_text_by_css("span.detail-value") ==
+            html_parser_content.find_element_text_by_css("span.detail-value") == "Hæftet")
+    assert lxml_content.contains_text("format") and html_parser_content.contains_text("format")
+
+
+def test_set_default_parser_backend_falls_back_to_html_parser_for_unknown_backend() -> None:
+    try:
+        assert HtmlContent.set_default_parser_backend("lxml") == HtmlParserBackend.LXML
+        assert HtmlContent.set_default_parser_backend("html5") == HtmlParserBackend.HTML_PARSER
+        assert HtmlContent.set_default_parser_backend(None) == HtmlParserBackend.HTML_PARSER
+    finally:
+        HtmlContent.default_parser_backend = HtmlParserBackend.HTML_PARSER
+
+
+def test_contains_closed_element_by_css_is_false_for_cut_off_element() -> None:
+    html = '<div><span class="price"><b>149</b>,95 kr.</span><p>Beskrivelse</p></div>'
+
+    assert HtmlContent(html).contains_closed_element_by_css("span.price")
+    assert not HtmlContent(html[:html.index(",95")]).contains_closed_element_by_css("span.price")
+    assert not HtmlContent(html).contains_closed_element_by_css("span.discount")
@@ -0,0 +1,237 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Iterator, ClassVar
+
+import pytest
+import requests
+
+from bookprices.shared.webscraping.http import (
+    HttpClient, HttpSessionPool, HttpHeaderName, HttpValidators, RequestFailedError, is_overload_error)
+from bookprices.shared.webscraping.price import (
+    StaticHtmlPriceScraper, PriceNotModifiedException, RateLimitedStaticHtmlPriceScraper, PriceNotFoundException)
+from bookprices.shared.webscraping.rate_limit import AdaptiveTokenBucketRateLimiter, MemoryTokenBucketStore
+from bookprices.shared.webscraping.validator_store import MemoryHttpValidatorStore
+
+
+class KeepAliveRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    etag: ClassVar[str] = '"price-v1"'
+    large_page_padding: ClassVar[str] = "<p>Beskrivelse</p>" * 50_000
+    medium_page_padding: ClassVar[str] = "<p>Beskrivelse</p>" * 5_000
+
+    def do_GET(self) -> None:
+        self.server.client_ports.add(self.client_address[1])
+        if self.path.startswith("/price"):
+            self._send_price_page()
+            return
+        if self.path.startswith("/large"):
+            self._send_large_page(self.large_page_padding)
+            return
+        if self.path.startswith("/medium"):
+            self._send_large_page(self.medium_page_padding)
+            return
+        if self.path.startswith("/busy"):
+            self.send_response(429)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = self.headers.get(HttpHeaderName.USER_AGENT, "").encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_price_page(self) -> None:
+        if self.headers.get(HttpHeaderName.IF_NONE_MATCH) == self.etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = '<html><body><span class="price">149,95 kr.</span></body></html>'.encode()
+        self.send_response(200)
+        self.send_header(HttpHeaderName.ETAG, self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_large_page(self, padding: str) -> None:
+        body = ('<html><body><span class="price">149,95 kr.</span>' + padding + "</body></html>").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class KeepAliveServer(ThreadingHTTPServer):
+    """ Records the client port of each request, so tests can count the connections used. """
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), KeepAliveRequestHandler)
+        self.client_ports: set[int] = set()
+
+
+@pytest.fixture
+def server() -> Iterator[KeepAliveServer]:
+    server = KeepAliveServer()
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def server_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_session_pool_returns_one_session_per_host() -> None:
+    session_pool = HttpSessionPool()
+
+    first_session = session_pool.get_session("https://www.saxo.com/dk/bog-1")
+    second_session = session_pool.get_session("https://www.saxo.com/dk/bog-2")
+    other_host_session = session_pool.get_session("https://www.williamdam.dk/bog-1")
+
+    assert first_session is second_session
+    assert first_session is not other_host_session
+
+
+def test_http_clients_reuse_connection_to_same_host(server_url) -> None:
+    session_pool = HttpSessionPool()
+
+    for page in range(3):
+        with HttpClient(http_session_pool=session_pool) as http_client:
+            http_client.get(f"{server_url}/book/{page}")
+
+    statistics = session_pool.get_statistics()
+    session_pool.close()
+    assert statistics.hosts == 1
+    assert statistics.requests_sent == 3
+    assert statistics.connections_opened == 1
+
+
+def test_http_clients_sharing_session_keep_their_own_headers(server_url) -> None:
+    session_pool = HttpSessionPool()
+
+    first_response = HttpClient({HttpHeaderName.USER_AGENT: "first"}, http_session_pool=session_pool).get(server_url)
+    second_response = HttpClient({HttpHeaderName.USER_AGENT: "second"}, http_session_pool=session_pool).get(server_url)
+
+    session_pool.close()
+    assert first_response.text == "first"
+    assert second_response.text == "second"
+
+
+def test_conditional_get_returns_not_modified_for_matching_etag(server_url) -> None:
+    http_client = HttpClient()
+
+    response = http_client.get(f"{server_url}/price")
+    conditional_response = http_client.get(f"{server_url}/price", response.validators)
+
+    assert response.validators == HttpValidators(etag=KeepAliveRequestHandler.etag)
+    assert not response.not_modified
+    assert conditional_response.not_modified
+
+
+def test_price_scraper_raises_not_modified_when_page_is_unchanged(server_url) -> None:
+    validator_store = MemoryHttpValidatorStore()
+    price_scraper = StaticHtmlPriceScraper("span.price", r"\d+,\d+", validator_store)
+
+    price = price_scraper.get_price(f"{server_url}/price")
+    with pytest.raises(PriceNotModifiedException):
+        price_scraper.get_price(f"{server_url}/price")
+
+    assert price == 149.95
+    assert validator_store.get(f"{server_url}/price") == HttpValidators(etag=KeepAliveRequestHandler.etag)
+
+
+def test_price_scraper_downloads_page_again_after_forgetting_validators(server_url) -> None:
+    validator_store = MemoryHttpValidatorStore()
+    price_scraper = StaticHtmlPriceScraper("span.price", r"\d+,\d+", validator_store)
+
+    price_scraper.get_price(f"{server_url}/price")
+    price_scraper.forget_validators(f"{server_url}/price")
+
+    assert validator_store.get(f"{server_url}/price") is None
+    assert price_scraper.get_price(f"{server_url}/price") == 149.95
+
+
+def test_streamed_get_stops_reading_when_stop_condition_is_met(server_url) -> None:
+    response = HttpClient().get(f"{server_url}/large", stop_when=lambda text: "149,95" in text)
+
+    assert not response.complete
+    assert response.text.startswith('<html><body><span class="price">149,95 kr.</span>')
+    assert len(response.text) < len(KeepAliveRequestHandler.large_page_padding)
+
+
+@pytest.mark.parametrize("path, connections_opened", [("/medium", 1), ("/large", 2)])
+def test_streamed_get_reuses_connection_after_stopping_unless_much_is_left(
+        server, server_url, path: str, connections_opened: int) -> None:
+    session_pool = HttpSessionPool()
+    http_client = HttpClient(http_session_pool=session_pool)
+
+    responses = [http_client.get(f"{server_url}{path}", stop_when=lambda text: "149,95" in text) for _ in range(2)]
+
+    session_pool.close()
+    assert not any(response.complete for response in responses)
+    assert len(server.client_ports) == connections_opened
+
+
+def test_streamed_get_reads_at_most_max_bytes(server_url) -> None:
+    response = HttpClient().get(f"{server_url}/large", stop_when=lambda text: False, max_bytes=64 * 1024)
+    full_response = HttpClient().get(f"{server_url}/large", stop_when=lambda text: False)
+
+    assert not response.complete
+    assert 64 * 1024 <= len(response.text) < 80 * 1024
+    assert full_response.complete
+    assert full_response.text.endswith("</body></html>")
+
+
+def test_price_scraper_gets_price_without_reading_whole_page(server_url) -> None:
+    price_scraper = StaticHtmlPriceScraper("span.price", r"\d+,\d+", max_page_bytes=128 * 1024)
+
+    assert price_scraper.get_price(f"{server_url}/large") == 149.95
+
+
+def _create_http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("error, overloaded", [
+    (_create_http_error(429), True),
+    (_create_http_error(503), True),
+    (_create_http_error(404), False),
+    (requests.ReadTimeout(), True),
+    (requests.ConnectionError(), True),
+    (ValueError(), False),
+])
+def test_is_overload_error_follows_cause_of_wrapped_error(error: Exception, overloaded: bool) -> None:
+    try:
+        try:
+            raise RequestFailedError from error
+        except RequestFailedError as request_failed_error:
+            raise PriceNotFoundException from request_failed_error
+    except PriceNotFoundException as price_not_found_error:
+        assert is_overload_error(price_not_found_error) == overloaded
+
+
+def test_price_scraper_lowers_adaptive_rate_when_server_is_busy(server_url) -> None:
+    rate_limiter = AdaptiveTokenBucketRateLimiter("bookstore_1", 10, 1, MemoryTokenBucketStore())
+    price_scraper = RateLimitedStaticHtmlPriceScraper("span.price", r"\d+,\d+", 10, 1, rate_limiter=rate_limiter)
+
+    price_scraper.get_price(f"{server_url}/price")
+    with pytest.raises(PriceNotFoundException):
+        price_scraper.get_price(f"{server_url}/busy")
+
+    assert rate_limiter.get_rate().requests_per_second == 5.0
+    assert rate_limiter.get_rate().backoffs == 1
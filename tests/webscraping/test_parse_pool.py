@@ -0,0 +1,35 @@
+from typing import Iterator
+
+import pytest
+
+from bookprices.job.job.import_books import WilliamDamBookParser
+from bookprices.shared.webscraping.parse_pool import HtmlParsePool
+from tests.shared import create_fake_response
+
+
+@pytest.fixture
+def started_parse_pool() -> Iterator[HtmlParsePool]:
+    parse_pool = HtmlParsePool()
+    parse_pool.start(2)
+    yield parse_pool
+    parse_pool.close()
+
+
+def test_parse_pool_returns_same_results_as_parsing_in_thread(started_parse_pool: HtmlParsePool) -> None:
+    html = create_fake_response("price_format.html").text
+    not_started_parse_pool = HtmlParsePool()
+
+    assert started_parse_pool.started
+    assert not not_started_parse_pool.started
+    for parse_pool in (started_parse_pool, not_started_parse_pool):
+        assert parse_pool.find_element_text_by_css(html, "tbody tr:nth-child(2) td:nth-child(2)") == "229.0 DKK"
+        assert parse_pool.find_element_and_get_attribute_value(html, "img.img-fluid", "src") == \
+            "/static/images/books/121.jpg"
+        assert parse_pool.contains_closed_element_by_css(html, "h3 small")
+        assert parse_pool.contains_text(html, "9788711553060")
+
+
+def test_parse_pool_runs_book_parser(started_parse_pool: HtmlParsePool) -> None:
+    book = started_parse_pool.run(WilliamDamBookParser().parse, create_fake_response("williamdam_book.html").text)
+
+    assert (book.title, book.author, book.isbn, book.format) == ("Havet om natten", "Anna Hansen", "9788700000001", "Hæftet")
@@ -0,0 +1,111 @@
+from time import monotonic
+from unittest.mock import Mock, MagicMock
+
+from redis import Redis, RedisError
+
+from bookprices.shared.webscraping.bookstore import BookStoreConfiguration, WilliamDamScraper
+from bookprices.shared.webscraping.rate_limit import (
+    MemoryTokenBucketStore, RedisTokenBucketStore, TokenBucketRateLimiter, AdaptiveRateController,
+    AdaptiveTokenBucketRateLimiter)
+
+
+def test_memory_token_bucket_allows_burst_and_returns_wait_time() -> None:
+    store = MemoryTokenBucketStore()
+
+    wait_times = [store.take_token("bookstore_1", capacity=2, tokens_per_second=1.0) for _ in range(3)]
+
+    assert wait_times[:2] == [0.0, 0.0]
+    assert 0.9 < wait_times[2] <= 1.0
+    assert store.take_token("bookstore_2", capacity=2, tokens_per_second=1.0) == 0.0
+
+
+def test_rate_limiters_with_same_key_share_bucket() -> None:
+    store = MemoryTokenBucketStore()
+    first_rate_limiter = TokenBucketRateLimiter("bookstore_1", 2, 1, store)
+    second_rate_limiter = TokenBucketRateLimiter("bookstore_1", 2, 1, store)
+
+    started = monotonic()
+    for _ in range(2):
+        first_rate_limiter.wait_if_needed()
+        second_rate_limiter.wait_if_needed()
+
+    assert monotonic() - started >= 0.9
+
+
+def test_redis_token_bucket_store_falls_back_to_memory_when_redis_fails() -> None:
+    redis = Mock(Redis)
+    redis.register_script.return_value = Mock(side_effect=[b"0.25", RedisError("Connection refused")])
+    store = RedisTokenBucketStore(redis, fallback_store=MemoryTokenBucketStore())
+
+    assert store.take_token("bookstore_1", capacity=1, tokens_per_second=0.5) == 0.25
+    assert store.take_token("bookstore_1", capacity=1, tokens_per_second=0.5) == 0.0
+    redis.register_script.return_value.assert_any_call(keys=["rate_limit_bookstore_1"], args=[1, 0.5])
+
+
+def _create_configuration(
+        store: MemoryTokenBucketStore, requests_per_second: float | None = None) -> BookStoreConfiguration:
+    return BookStoreConfiguration(
+        bookstore_id=2, bookstore_name="William Dam", bookstore_url="https://www.williamdam.dk",
+        bookstore_search_url="https://www.williamdam.dk/search?q={0}", bookstore_price_css_selector="span.price",
+        bookstore_price_format=None, bookstore_isbn_css_selector=None, search_result_css_selector=None,
+        bookstore_api_key=None, currency_converter=MagicMock(), token_bucket_store=store,
+        requests_per_second=requests_per_second)
+
+
+def test_price_and_search_scrapers_for_bookstore_share_rate_limiter() -> None:
+    store = MemoryTokenBucketStore()
+
+    scraper = WilliamDamScraper(_create_configuration(store))
+    scraper.get_price_rate_limiter().wait_if_needed()
+
+    assert scraper.get_price_rate_limiter() is scraper._book_scraper._rate_limiter
+    assert store.take_token("bookstore_2", capacity=1, tokens_per_second=0.5) > 0
+
+
+def test_adaptive_rate_increases_while_responses_are_healthy() -> None:
+    controller = AdaptiveRateController(configured_requests_per_second=1.0)
+
+    for _ in range(AdaptiveRateController.healthy_responses_per_increase):
+        controller.add_response(latency_seconds=0.2, overloaded=False)
+    increased_rate = controller.requests_per_second
+    for _ in range(AdaptiveRateController.healthy_responses_per_increase * 100):
+        controller.add_response(latency_seconds=0.2, overloaded=False)
+
+    assert increased_rate == 1.1
+    assert controller.requests_per_second == controller.max_requests_per_second == 2.0
+
+
+def test_adaptive_rate_doesnt_increase_for_slow_responses() -> None:
+    controller = AdaptiveRateController(configured_requests_per_second=1.0)
+
+    for _ in range(AdaptiveRateController.healthy_responses_per_increase):
+        controller.add_response(latency_seconds=AdaptiveRateController.slow_response_seconds, overloaded=False)
+
+    assert controller.requests_per_second == 1.0
+
+
+def test_adaptive_rate_is_halved_once_for_overload_errors_close_together() -> None:
+    controller = AdaptiveRateController(configured_requests_per_second=1.0, requests_per_second=1.6)
+
+    for _ in range(3):
+        controller.add_response(latency_seconds=0.1, overloaded=True)
+
+    rate = controller.get_rate()
+    assert rate.requests_per_second == 0.8
+    assert rate.configured_requests_per_second == 1.0
+    assert rate.backoffs == 1
+
+
+def test_adaptive_rate_stays_above_minimum() -> None:
+    controller = AdaptiveRateController(configured_requests_per_second=1.0, requests_per_second=0.01)
+
+    assert controller.requests_per_second == 1.0 * AdaptiveRateController.min_rate_factor
+
+
+def test_bookstore_scraper_starts_from_learned_request_rate() -> None:
+    scraper = WilliamDamScraper(_create_configuration(MemoryTokenBucketStore(), requests_per_second=0.8))
+    rate_limiter = scraper.get_price_rate_limiter()
+
+    assert isinstance(rate_limiter, AdaptiveTokenBucketRateLimiter)
+    assert scraper.get_request_rate().requests_per_second == 0.8
+    assert rate_limiter.max_request_count > rate_limiter.request_count
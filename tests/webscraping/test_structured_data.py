@@ -0,0 +1,83 @@
+from unittest.mock import Mock
+
+import pytest
+
+from bookprices.shared.webscraping.currency import CurrencyConverter
+from bookprices.shared.webscraping.price import (
+    StaticHtmlPriceScraper, GuccaStaticHtmlPriceScraper, PriceSource, PriceSelectorError)
+from bookprices.shared.webscraping.structured_data import OfferPrice, find_offer_price
+
+PRODUCT_JSON_LD = """
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Organization", "name": "Boghandel"}</script>
+<script data-shop="1" type="application/ld+json">
+{"@context": "https://schema.org", "@type": "Product", "name": "Havet om natten",
+ "offers": {"@type": "Offer", "price": "249.95", "priceCurrency": "DKK"}}
+</script>
+"""
+
+
+@pytest.mark.parametrize("html,expected_offer_price", [
+    (PRODUCT_JSON_LD, OfferPrice(249.95, "DKK")),
+    ('<script type="application/ld+json">{"@graph": [{"@type": "WebPage"}, {"@type": ["Product", "Book"], '
+     '"offers": [{"@type": "Offer", "price": 199, "priceCurrency": "DKK"}]}]}</script>',
+     OfferPrice(199.0, "DKK")),
+    ('<script type="application/ld+json">{"@type": "Product", '
+     '"offers": {"@type": "AggregateOffer", "lowPrice": 199, "priceCurrency": "DKK"}}</script>', None),
+    ('<script type="application/ld+json">[{"@type": "Product", "offers": {"@type": "Offer", '
+     '"priceSpecification": {"price": "149,95", "priceCurrency": "SEK"}}}]</script>',
+     OfferPrice(149.95, "SEK")),
+    ('<div itemscope itemtype="https://schema.org/Offer"><meta content="99.50" itemprop="price">'
+     '<meta itemprop="priceCurrency" content="DKK"></div>', OfferPrice(99.5, "DKK")),
+    ('<script type="application/ld+json">{"@type": "Product", "offers": {"@type": "Offer"}}</script>', None),
+    ('<script type="application/ld+json">{"@type": "Product", </script>', None),
+    ('<p>Use type="application/ld+json" for structured data</p>', None),
+])
+def test_find_offer_price(html: str, expected_offer_price: OfferPrice | None) -> None:
+    assert find_offer_price(html) == expected_offer_price
+
+
+def test_price_scraper_uses_structured_data_before_css_selector() -> None:
+    price_scraper = StaticHtmlPriceScraper("span.price", r"\d+,\d+", use_structured_data=True)
+
+    structured_data_price = price_scraper._parse_price(PRODUCT_JSON_LD + '<span class="price">1,00</span>')
+    css_selector_price = price_scraper._parse_price('<span class="price">149,95 kr.</span>')
+
+    assert structured_data_price == 249.95
+    assert css_selector_price == 149.95
+    assert price_scraper.price_source_statistics.get_counts() == {
+        PriceSource.STRUCTURED_DATA: 1, PriceSource.CSS_SELECTOR: 1}
+
+
+def test_price_scraper_ignores_structured_data_unless_enabled() -> None:
+    price_scraper = StaticHtmlPriceScraper("span.price", r"\d+,\d+")
+
+    price = price_scraper._parse_price(PRODUCT_JSON_LD + '<span class="price">1,00</span>')
+
+    assert price == 1.0
+
+
+def test_price_scraper_falls_back_to_css_selector_for_other_currencies() -> None:
+    price_scraper = StaticHtmlPriceScraper("span.price", r"\d+,\d+", use_structured_data=True)
+
+    with pytest.raises(PriceSelectorError):
+        price_scraper._parse_price(PRODUCT_JSON_LD.replace("DKK", "EUR"))
+
+
+def test_gucca_price_scraper_converts_structured_data_price_from_sek() -> None:
+    currency_converter = Mock(CurrencyConverter)
+    currency_converter.convert_to_dkk.return_value = 105.0
+    price_scraper = GuccaStaticHtmlPriceScraper(
+        "span.price", r"\d+,\d+", 1, 1, currency_converter, use_structured_data=True)
+
+    price = price_scraper._parse_price(PRODUCT_JSON_LD.replace("DKK", "SEK"))
+
+    assert price == 105.0
+    currency_converter.convert_to_dkk.assert_called_once_with(249.95, "SEK")
+
+
+def test_gucca_price_scraper_ignores_structured_data_price_without_currency() -> None:
+    price_scraper = GuccaStaticHtmlPriceScraper(
+        "span.price", r"\d+,\d+", 1, 1, Mock(CurrencyConverter), use_structured_data=True)
+
+    with pytest.raises(PriceSelectorError):
+        price_scraper._parse_price(PRODUCT_JSON_LD.replace(', "priceCurrency": "DKK"', ""))